@@ -0,0 +1,42 @@
+"""create post_stats table
+
+Per-category, per-day post and flagged counters, backfilled from posts.
+Afterwards they are maintained by the application (src/core/stats.py).
+
+Revision ID: a3d9e7c2f4b8
+Revises: f1a7c3e5b9d2
+Create Date: 2026-10-17 17:48:10.206113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9e7c2f4b8'
+down_revision: Union[str, None] = 'f1a7c3e5b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'post_stats',
+        sa.Column('category_id', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('posts', sa.Integer(), nullable=False),
+        sa.Column('flagged', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('category_id', 'day'),
+    )
+    op.execute("""
+        INSERT INTO post_stats (category_id, day, posts, flagged)
+        SELECT COALESCE(category_id, ''), created_at::date, count(*), count(*) FILTER (WHERE flagged)
+        FROM posts
+        GROUP BY COALESCE(category_id, ''), created_at::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('post_stats')
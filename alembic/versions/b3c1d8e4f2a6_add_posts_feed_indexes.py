@@ -0,0 +1,38 @@
+"""add posts feed indexes
+
+Revision ID: b3c1d8e4f2a6
+Revises: 7295cf7391ca
+Create Date: 2026-10-17 09:12:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c1d8e4f2a6'
+down_revision: Union[str, None] = '7295cf7391ca'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_posts_category_id_created_at_id',
+        'posts',
+        ['category_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_posts_created_at_id',
+        'posts',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_created_at_id', table_name='posts')
+    op.drop_index('ix_posts_category_id_created_at_id', table_name='posts')
@@ -0,0 +1,29 @@
+"""drop redundant posts id index
+
+ix_posts_id duplicates the leading column of the (id, created_at) primary
+key, which already serves lookups by id; every insert was maintaining both.
+
+Revision ID: c7e1f4a9d2b5
+Revises: a3d9e7c2f4b8
+Create Date: 2026-10-17 19:12:44.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1f4a9d2b5'
+down_revision: Union[str, None] = 'a3d9e7c2f4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Dropping it from the partitioned parent drops it from every partition
+    op.drop_index('ix_posts_id', table_name='posts')
+
+
+def downgrade() -> None:
+    op.create_index('ix_posts_id', 'posts', ['id'], unique=False)
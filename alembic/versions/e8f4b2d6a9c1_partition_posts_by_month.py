@@ -0,0 +1,109 @@
+"""partition posts by month
+
+Converts posts into a table range-partitioned by month on created_at, with a
+DEFAULT partition catching anything outside the pre-created months. Rows are
+copied across in one transaction, so run this in a maintenance window on
+large tables. Future months are created and old ones archived with
+`python -m src.core.partitions`.
+
+Revision ID: e8f4b2d6a9c1
+Revises: d5e2a9c7b1f3
+Create Date: 2026-10-17 14:05:52.913406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f4b2d6a9c1'
+down_revision: Union[str, None] = 'd5e2a9c7b1f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, content, category_id, created_at, flagged, flag_reason"
+
+COLUMN_DEFINITIONS = """
+    id UUID NOT NULL,
+    content VARCHAR NOT NULL,
+    category_id VARCHAR,
+    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    flagged BOOLEAN NOT NULL,
+    flag_reason VARCHAR,
+    search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+"""
+
+INDEXES = [
+    "CREATE INDEX ix_posts_id ON posts (id)",
+    "CREATE INDEX ix_posts_category_id_created_at_id ON posts (category_id, created_at DESC, id DESC)",
+    "CREATE INDEX ix_posts_created_at_id ON posts (created_at DESC, id DESC)",
+    "CREATE INDEX ix_posts_search_vector ON posts USING gin (search_vector)",
+]
+
+
+def drop_indexes(table: str) -> None:
+    for name in ('ix_posts_id', 'ix_posts_category_id_created_at_id', 'ix_posts_created_at_id', 'ix_posts_search_vector'):
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE posts RENAME TO posts_unpartitioned")
+    op.execute("ALTER TABLE posts_unpartitioned RENAME CONSTRAINT posts_pkey TO posts_unpartitioned_pkey")
+    drop_indexes('posts_unpartitioned')
+
+    # The partition key has to be part of the primary key
+    op.execute(f"""
+        CREATE TABLE posts (
+            {COLUMN_DEFINITIONS},
+            CONSTRAINT posts_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE posts_default PARTITION OF posts DEFAULT")
+
+    # One partition per month from the oldest existing post to three months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            partition_start DATE := date_trunc(
+                'month', COALESCE((SELECT min(created_at) FROM posts_unpartitioned), now())
+            )::date;
+            last_start DATE := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            WHILE partition_start <= last_start LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF posts FOR VALUES FROM (%L) TO (%L)',
+                    'posts_p' || to_char(partition_start, 'YYYY_MM'),
+                    partition_start,
+                    (partition_start + interval '1 month')::date
+                );
+                partition_start := (partition_start + interval '1 month')::date;
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"INSERT INTO posts ({COLUMNS}) SELECT {COLUMNS} FROM posts_unpartitioned")
+    op.execute("DROP TABLE posts_unpartitioned")
+
+    # Created on the parent after the copy; Postgres builds them on every partition
+    for statement in INDEXES:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE posts RENAME TO posts_partitioned")
+    op.execute("ALTER TABLE posts_partitioned RENAME CONSTRAINT posts_pkey TO posts_partitioned_pkey")
+    drop_indexes('posts_partitioned')
+
+    op.execute(f"""
+        CREATE TABLE posts (
+            {COLUMN_DEFINITIONS},
+            CONSTRAINT posts_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute(f"INSERT INTO posts ({COLUMNS}) SELECT {COLUMNS} FROM posts_partitioned")
+    # Drops every partition along with the parent
+    op.execute("DROP TABLE posts_partitioned")
+
+    for statement in INDEXES:
+        op.execute(statement)
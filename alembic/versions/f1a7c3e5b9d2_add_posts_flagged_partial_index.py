@@ -0,0 +1,35 @@
+"""add posts flagged partial index
+
+Revision ID: f1a7c3e5b9d2
+Revises: e8f4b2d6a9c1
+Create Date: 2026-10-17 16:05:27.914630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e5b9d2'
+down_revision: Union[str, None] = 'e8f4b2d6a9c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Created on the partitioned parent, so every monthly partition (current
+    # and future) gets its own small partial index. CONCURRENTLY is not
+    # supported for partitioned tables.
+    op.create_index(
+        'ix_posts_flagged_created_at_id',
+        'posts',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('flagged'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_posts_flagged_created_at_id', table_name='posts')
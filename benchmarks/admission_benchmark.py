@@ -0,0 +1,123 @@
+"""
+Latency under overload with and without admission control.
+
+First measures capacity: the request rate GET /posts sustains with enough
+concurrency to keep the connection pool busy. Then fires requests at
+--load times that rate for --duration seconds on a fixed schedule (an open
+loop, like real users who do not wait for each other), once with admission
+control disabled and once enabled. Without it, requests queue for pool
+connections and p99 grows with the run; with it, the excess is shed with
+fast 503s and admitted requests keep their latency. --low-share of the
+traffic is deep-offset pages, which are shed first. The feed cache is
+bypassed so every request queries the database in DATABASE_URL:
+
+    python -m benchmarks.admission_benchmark --seed 5000 --load 2 --duration 10
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+import httpx
+
+from src.core import config
+from src.core.admission import admission
+from src.core.cache import feed_cache
+
+from .run import CATEGORY_IDS, drive, percentile, seed_posts
+
+
+def make_params(rng: random.Random, low_share: float) -> dict:
+    if rng.random() < low_share:
+        return {"limit": 20, "offset": config.ADMISSION_DEEP_OFFSET + rng.randint(1, 500)}
+    return {"limit": 20, "category_id": rng.choice(CATEGORY_IDS), "offset": rng.randint(0, 200)}
+
+
+async def open_loop(client: httpx.AsyncClient, rate: float, duration: float, low_share: float, seed: int) -> Dict:
+    """Start requests at `rate` per second regardless of how fast they finish."""
+    rng = random.Random(seed)
+    outcomes: List[tuple] = []
+
+    async def fire(params: dict):
+        started = time.perf_counter()
+        try:
+            status = (await client.get("/posts", params=params)).status_code
+        except httpx.HTTPError:
+            status = 0
+        outcomes.append((status, (time.perf_counter() - started) * 1000))
+
+    tasks = []
+    started = time.perf_counter()
+    for index in range(int(rate * duration)):
+        delay = started + index / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(make_params(rng, low_share))))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    served = sorted(latency for status, latency in outcomes if status == 200)
+    shed = sorted(latency for status, latency in outcomes if status == 503)
+    return {
+        "sent": len(outcomes),
+        "served": len(served),
+        "shed": len(shed),
+        "failed": len(outcomes) - len(served) - len(shed),
+        "goodput_rps": len(served) / elapsed,
+        "p50_ms": percentile(served, 50),
+        "p99_ms": percentile(served, 99),
+        "max_ms": served[-1] if served else 0.0,
+        "shed_p99_ms": percentile(shed, 99),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    from main import app
+
+    feed_cache.enabled = False
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            if args.seed:
+                await seed_posts(client, args.seed)
+
+            rng = random.Random(args.rng_seed)
+            admission.enabled = False
+            pool = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+            capacity = await drive(
+                client,
+                lambda client: client.get("/posts", params=make_params(rng, args.low_share)),
+                args.calibrate_requests,
+                concurrency=2 * pool,
+            )
+            rate = capacity["rps"] * args.load
+            print(
+                f"capacity: {capacity['rps']:.0f} req/s (p50 {capacity['p50_ms']:.1f} ms, p99 {capacity['p99_ms']:.1f} ms) "
+                f"with {2 * pool} concurrent; offering {rate:.0f} req/s for {args.duration:.0f}s"
+            )
+
+            for enabled in (False, True):
+                admission.enabled = enabled
+                result = await open_loop(client, rate, args.duration, args.low_share, args.rng_seed)
+                print(
+                    f"admission {'on ' if enabled else 'off'}: served {result['served']}/{result['sent']} "
+                    f"({result['goodput_rps']:.0f}/s), shed {result['shed']} (p99 {result['shed_p99_ms']:.1f} ms), "
+                    f"failed {result['failed']}; served p50 {result['p50_ms']:.0f} ms, "
+                    f"p99 {result['p99_ms']:.0f} ms, max {result['max_ms']:.0f} ms"
+                )
+                print(f"    shed by priority so far: {admission.shed}")
+                # Let the backlog drain before the next run
+                await asyncio.sleep(2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Posts to create first (0 to use existing data)")
+    parser.add_argument("--load", type=float, default=2.0, help="Offered rate as a multiple of measured capacity")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of overload per run")
+    parser.add_argument("--calibrate-requests", type=int, default=2000)
+    parser.add_argument("--low-share", type=float, default=0.2, help="Share of deep-offset (low-priority) pages")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--rng-seed", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,54 @@
+"""
+Compare post ingestion throughput of POST /posts/bulk against the same
+number of sequential POST /posts calls.
+
+Drives main.app in-process through httpx's ASGI transport, so it needs a
+migrated database at DATABASE_URL but no running server:
+
+    python -m benchmarks.bulk_insert_benchmark --posts 2000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from main import app
+from src.database import init_engines
+
+
+def make_posts(count: int) -> list[dict]:
+    categories = ["1", "2", "5", None]
+    return [
+        {"content": f"Bulk benchmark post {i}", "category_id": categories[i % len(categories)]}
+        for i in range(count)
+    ]
+
+
+async def main(args: argparse.Namespace) -> None:
+    posts = make_posts(args.posts)
+    init_engines()  # ASGITransport does not run the app lifespan
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        for post in posts:
+            response = await client.post("/posts", json=post)
+            response.raise_for_status()
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for start in range(0, len(posts), args.batch_size):
+            response = await client.post("/posts/bulk", json=posts[start:start + args.batch_size])
+            response.raise_for_status()
+        bulk = time.perf_counter() - started
+
+    print(f"sequential: {args.posts} posts in {sequential:.2f}s ({args.posts / sequential:,.0f} posts/s)")
+    print(f"      bulk: {args.posts} posts in {bulk:.2f}s ({args.posts / bulk:,.0f} posts/s)")
+    print(f"   speedup: {sequential / bulk:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
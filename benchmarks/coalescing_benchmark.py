@@ -0,0 +1,61 @@
+"""
+Fire identical GET /posts requests at once and count the SQL they cause.
+
+The feed cache for the page is invalidated first, so every request misses
+it; with single-flight coalescing the whole burst should run exactly one
+SELECT (tests/test_cache.py asserts this). Runs the app in-process against
+the database in DATABASE_URL and reports the statements and latency:
+
+    python -m benchmarks.coalescing_benchmark --requests 500 --category-id 1
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import event
+
+from src.core.cache import feed_cache
+from src.database import dispose_engines, init_engines, replicas
+
+
+async def main(args: argparse.Namespace) -> None:
+    from main import app
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = [init_engines()] + replicas.engines
+    for target in engines:
+        event.listen(target.sync_engine, "before_cursor_execute", count)
+
+    params = {"limit": args.limit}
+    if args.category_id:
+        params["category_id"] = args.category_id
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await feed_cache.invalidate(args.category_id)
+        before = dict(feed_cache.stats)
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get("/posts", params=params) for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    for target in engines:
+        event.remove(target.sync_engine, "before_cursor_execute", count)
+    await dispose_engines()
+
+    errors = sum(response.status_code != 200 for response in responses)
+    outcomes = {key: value - before[key] for key, value in feed_cache.stats.items()}
+    print(f"{args.requests} concurrent requests in {elapsed * 1000:.1f} ms, errors={errors}")
+    print(f"SQL statements: {len(statements)}  hit={outcomes['hit']} miss={outcomes['miss']} "
+          f"coalesced={outcomes['coalesced']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--category-id", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,40 @@
+"""
+Diff two result files written by benchmarks.run:
+
+    python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+from pathlib import Path
+
+import orjson
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms")
+
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main(args: argparse.Namespace) -> None:
+    baseline = orjson.loads(Path(args.baseline).read_bytes())
+    candidate = orjson.loads(Path(args.candidate).read_bytes())
+    print(f"baseline: {baseline.get('commit')}  candidate: {candidate.get('commit')}")
+    for name, after in candidate["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<26} (new scenario)")
+            continue
+        cells = "  ".join(
+            f"{metric}={before[metric]:,.2f}->{after[metric]:,.2f} ({change(before[metric], after[metric])})"
+            for metric in METRICS
+        )
+        print(f"{name:<26} {cells}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    main(parser.parse_args())
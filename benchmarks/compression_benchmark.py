@@ -0,0 +1,77 @@
+"""
+CPU cost versus bytes saved for each response compression algorithm and level.
+
+Compresses two realistic payloads - a GET /posts page and an export chunk of
+NDJSON rows - with every available encoding at several levels and reports
+the compressed size, ratio, and compression time. No database is needed:
+
+    python -m benchmarks.compression_benchmark --page-rows 50 --export-rows 1000
+"""
+import argparse
+import random
+import timeit
+
+import orjson
+
+from src.utils.compression import CODECS, compress
+from src.utils.custom_utils import api_response
+from src.utils.serializers import serialize_post
+
+from .serialization_benchmark import make_posts
+
+LEVELS = {
+    "gzip": [1, 6, 9],
+    "br": [1, 4, 6, 11],
+    "zstd": [1, 3, 9, 19],
+}
+
+WORDS = (
+    "library exam lecture party hostel cafeteria professor deadline campus club football wifi "
+    "parking semester project lab internship concert rumor roommate scholarship graduation fees"
+).split()
+
+
+def realistic_posts(count: int):
+    # Varied content, so the payload does not compress unrealistically well
+    rng = random.Random(7)
+    posts = make_posts(count)
+    for post in posts:
+        post.content = " ".join(rng.choices(WORDS, k=rng.randint(5, 60))).capitalize() + "."
+        post.category_id = rng.choice(["1", "2", "5"])
+    return posts
+
+
+def payloads(page_rows: int, export_rows: int) -> dict:
+    page = api_response(
+        status_code=200,
+        response_message="Posts retrieved successfully.",
+        customer_message="Successfully loaded posts.",
+        body=[serialize_post(post) for post in realistic_posts(page_rows)],
+        pagination={"limit": page_rows, "nextCursor": "WyIyMDI2LTEwLTE3VDA5OjEyOjQxIiwiYjNjMWQ4ZTQiXQ"},
+    ).body
+    export = b"".join(
+        orjson.dumps(serialize_post(post), option=orjson.OPT_APPEND_NEWLINE)
+        for post in realistic_posts(export_rows)
+    )
+    return {f"feed page ({page_rows} posts)": page, f"export chunk ({export_rows} rows)": export}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-rows", type=int, default=50)
+    parser.add_argument("--export-rows", type=int, default=1000)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, data in payloads(args.page_rows, args.export_rows).items():
+        print(f"\n{name}: {len(data):,} bytes")
+        print(f"{'encoding':>8} {'level':>5} {'bytes':>10} {'ratio':>6} {'us/op':>10} {'MB/s':>8}")
+        for encoding in CODECS:
+            for level in LEVELS[encoding]:
+                compressed = compress(data, encoding, level)
+                seconds = min(timeit.repeat(lambda: compress(data, encoding, level), number=args.number, repeat=3))
+                per_op = seconds / args.number
+                print(
+                    f"{encoding:>8} {level:>5} {len(compressed):>10,} {len(data) / len(compressed):>6.2f} "
+                    f"{per_op * 1e6:>10,.1f} {len(data) / per_op / 1e6:>8,.1f}"
+                )
@@ -0,0 +1,96 @@
+"""
+Near-duplicate index cost at scale: lookup latency and memory with --size
+fingerprints indexed, plus how often near-duplicates are found.
+
+Fills a SimHashIndex with random fingerprints, then times lookups that miss
+and lookups of indexed fingerprints with a few bits flipped (reporting the
+share found per distance). Finally fingerprints generated posts and their
+one-word edits to show what distance real edits produce. No database is
+needed:
+
+    python -m benchmarks.dedup_benchmark --size 1000000 --lookups 20000
+"""
+import argparse
+import random
+import resource
+import statistics
+import time
+
+from src.core import config
+from src.utils.simhash import SimHashIndex, distance, simhash
+
+from .compression_benchmark import WORDS
+
+
+def percentile(timings: list, share: float) -> float:
+    return sorted(timings)[int(len(timings) * share)]
+
+
+def flip(fingerprint: int, bits: int, rng: random.Random) -> int:
+    for bit in rng.sample(range(64), bits):
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def time_lookups(index: SimHashIndex, queries: list, now: float) -> tuple:
+    timings = []
+    found = 0
+    for query in queries:
+        started = time.perf_counter()
+        found += index.match(query, now) is not None
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings, found
+
+
+def main(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    index = SimHashIndex(args.max_distance, args.tables, window=float("inf"), max_entries=args.size)
+    fingerprints = [rng.getrandbits(64) for _ in range(args.size)]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    for fingerprint in fingerprints:
+        index.add(fingerprint, 0.0)
+    elapsed = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"indexed {len(index):,} fingerprints ({args.tables} tables, max distance {args.max_distance}) "
+        f"in {elapsed:.1f}s, {elapsed / args.size * 1e6:.1f} us/add, ~{(rss_after - rss_before) / 1024:.0f} MB"
+    )
+
+    misses, false_hits = time_lookups(index, [rng.getrandbits(64) for _ in range(args.lookups)], 0.0)
+    print(
+        f"miss lookup: median {statistics.median(misses):.1f} us, p99 {percentile(misses, 0.99):.1f} us, "
+        f"{false_hits} false matches in {args.lookups:,}"
+    )
+    for bits in range(0, args.max_distance + 1):
+        queries = [flip(rng.choice(fingerprints), bits, rng) for _ in range(args.lookups // 10)]
+        timings, found = time_lookups(index, queries, 0.0)
+        print(f"{bits}-bit near-duplicate: found {found / len(queries):6.1%}, median {statistics.median(timings):.1f} us")
+
+    # What real edits do to the fingerprint
+    posts = [" ".join(rng.choices(WORDS, k=rng.randint(10, 60))) for _ in range(args.posts)]
+    started = time.perf_counter()
+    prints = [simhash(post) for post in posts]
+    per_post = (time.perf_counter() - started) / len(posts) * 1e6
+    distances = []
+    for post, fingerprint in zip(posts, prints):
+        words = post.split()
+        words[rng.randrange(len(words))] = str(rng.randint(1, 99))
+        distances.append(distance(fingerprint, simhash(" ".join(words).upper() + "!!")))
+    within = sum(value <= args.max_distance for value in distances) / len(distances)
+    print(
+        f"simhash: {per_post:.0f} us/post; one-word edits: median distance {statistics.median(distances):.0f} bits, "
+        f"{within:.0%} within {args.max_distance}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000000, help="Fingerprints indexed")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--max-distance", type=int, default=config.DEDUP_MAX_DISTANCE)
+    parser.add_argument("--tables", type=int, default=config.DEDUP_TABLES)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
@@ -0,0 +1,49 @@
+"""
+Stream GET /posts/export end to end and report throughput and peak RSS.
+
+Peak RSS should stay roughly constant as --rows grows, since the export
+reads through a server-side cursor instead of loading the table:
+
+    python -m benchmarks.export_benchmark --rows 1000000 --format ndjson
+"""
+import argparse
+import asyncio
+import resource
+import time
+
+import httpx
+
+from benchmarks.pagination_benchmark import seed
+from main import app
+from src.database import init_engines
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with init_engines().begin() as conn:
+        await seed(conn, args.rows, ["1", "2", "5"])
+    baseline = peak_rss_mb()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        received = 0
+        async with client.stream("GET", "/posts/export", params={"format": args.format}) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+        elapsed = time.perf_counter() - started
+
+    print(f"exported {received / 1e6:,.1f} MB in {elapsed:.2f}s ({received / 1e6 / elapsed:,.1f} MB/s)")
+    print(f"peak RSS: {peak_rss_mb():,.1f} MB (before export: {baseline:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    asyncio.run(main(parser.parse_args()))
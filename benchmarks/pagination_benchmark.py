@@ -0,0 +1,96 @@
+"""
+Compare OFFSET and keyset (cursor) pagination latency for deep feed pages.
+
+Seeds the posts table up to --rows posts, then times fetching --page with
+both strategies. Run from the project root against a migrated database:
+
+    python -m benchmarks.pagination_benchmark --rows 200000 --page 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import config
+from src.models import Post
+
+
+async def seed(conn, rows: int, category_ids: list[str]) -> None:
+    existing = (await conn.execute(select(func.count()).select_from(Post))).scalar_one()
+    start = datetime.utcnow()
+    batch = []
+    for i in range(existing, rows):
+        batch.append({
+            "id": uuid.uuid4(),
+            "content": f"Benchmark post {i}",
+            "category_id": category_ids[i % len(category_ids)],
+            "created_at": start - timedelta(seconds=i),
+            "flagged": False,
+        })
+        if len(batch) == 5000:
+            await conn.execute(insert(Post), batch)
+            batch.clear()
+    if batch:
+        await conn.execute(insert(Post), batch)
+
+
+def feed_query(limit: int, category_id: str | None):
+    query = select(Post).order_by(Post.created_at.desc(), Post.id.desc()).limit(limit)
+    if category_id:
+        query = query.where(Post.category_id == category_id)
+    return query
+
+
+async def time_query(conn, query, repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await conn.execute(query)).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(config.DATABASE_URL)
+    async with engine.begin() as conn:
+        await seed(conn, args.rows, ["1", "2", "5"])
+
+    async with engine.connect() as conn:
+        offset_query = feed_query(args.limit, args.category_id).offset(args.page * args.limit)
+        offset_ms = await time_query(conn, offset_query, args.repeat)
+
+        # Locate the boundary row the client would hold a cursor for
+        boundary = (
+            await conn.execute(
+                feed_query(1, args.category_id).offset(args.page * args.limit - 1)
+            )
+        ).scalars().first()
+        if boundary is None:
+            raise SystemExit("Not enough rows seeded for the requested page.")
+
+        cursor_query = feed_query(args.limit, args.category_id).where(
+            tuple_(Post.created_at, Post.id) < tuple_(boundary.created_at, boundary.id)
+        )
+        cursor_ms = await time_query(conn, cursor_query, args.repeat)
+    await engine.dispose()
+
+    for name, timings in (("offset", offset_ms), ("cursor", cursor_ms)):
+        print(
+            f"{name:>6}: page={args.page} median={statistics.median(timings):.2f}ms "
+            f"min={min(timings):.2f}ms max={max(timings):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--category-id", default=None)
+    asyncio.run(main(parser.parse_args()))
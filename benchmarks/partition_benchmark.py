@@ -0,0 +1,117 @@
+"""
+Compare feed latency on a partitioned vs. an unpartitioned posts table.
+
+Builds two scratch tables with identical data, generated server-side with
+generate_series (--rows spread over --months months), then times the feed
+query for recent and windowed pages on each. The real posts table is not
+touched. 50M rows needs a few GB of disk and a while to build:
+
+    python -m benchmarks.partition_benchmark --rows 50000000 --months 24
+    python -m benchmarks.partition_benchmark --drop   # remove scratch tables
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import config
+
+PLAIN = "bench_posts_plain"
+PARTITIONED = "bench_posts_partitioned"
+
+COLUMNS = """
+    id UUID NOT NULL,
+    content VARCHAR NOT NULL,
+    category_id VARCHAR,
+    created_at TIMESTAMP NOT NULL,
+    flagged BOOLEAN NOT NULL,
+    flag_reason VARCHAR
+"""
+
+FEED = """
+    SELECT * FROM {table}
+    WHERE category_id = :category_id {window}
+    ORDER BY created_at DESC, id DESC
+    LIMIT 10
+"""
+
+
+async def build(conn, rows: int, months: int) -> None:
+    await conn.execute(text(f"CREATE TABLE {PLAIN} ({COLUMNS}, PRIMARY KEY (id))"))
+    await conn.execute(text(
+        f"CREATE TABLE {PARTITIONED} ({COLUMNS}, PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+    ))
+    await conn.execute(text(f"""
+        DO $$
+        DECLARE start DATE := (date_trunc('month', now()) - interval '{months} months')::date;
+        BEGIN
+            FOR i IN 0..{months} LOOP
+                EXECUTE format('CREATE TABLE %I PARTITION OF {PARTITIONED} FOR VALUES FROM (%L) TO (%L)',
+                    '{PARTITIONED}_' || i, start + make_interval(months => i), start + make_interval(months => i + 1));
+            END LOOP;
+        END $$
+    """))
+    await conn.execute(text(f"""
+        INSERT INTO {PLAIN}
+        SELECT gen_random_uuid(), 'Benchmark post ' || n, ((n % 3) + 1)::text,
+               now() - (n * (interval '{months} months' / {rows})), false, NULL
+        FROM generate_series(1, {rows}) AS n
+    """))
+    await conn.execute(text(f"INSERT INTO {PARTITIONED} SELECT * FROM {PLAIN}"))
+    for table in (PLAIN, PARTITIONED):
+        await conn.execute(text(
+            f"CREATE INDEX ON {table} (category_id, created_at DESC, id DESC)"
+        ))
+        await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def time_query(conn, sql: str, params: dict, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        (await conn.execute(text(sql), params)).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(config.DATABASE_URL)
+    async with engine.begin() as conn:
+        if args.drop or args.rebuild:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {PLAIN}, {PARTITIONED}"))
+        if args.drop:
+            await engine.dispose()
+            return
+        exists = (await conn.execute(text("SELECT to_regclass(:name)"), {"name": PLAIN})).scalar()
+        if exists is None:
+            print(f"Building {args.rows:,} rows over {args.months} months...")
+            await build(conn, args.rows, args.months)
+
+    windows = {
+        "latest page": "",
+        "last 7 days": "AND created_at >= now() - interval '7 days'",
+        "one month, a year ago": (
+            "AND created_at >= now() - interval '12 months' AND created_at < now() - interval '11 months'"
+        ),
+    }
+    async with engine.connect() as conn:
+        for label, window in windows.items():
+            results = []
+            for table in (PLAIN, PARTITIONED):
+                sql = FEED.format(table=table, window=window)
+                results.append(await time_query(conn, sql, {"category_id": "1"}, args.repeat))
+            print(f"{label:>22}: unpartitioned={results[0]:.2f}ms  partitioned={results[1]:.2f}ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--rebuild", action="store_true", help="Drop and rebuild the scratch tables")
+    parser.add_argument("--drop", action="store_true", help="Drop the scratch tables and exit")
+    asyncio.run(main(parser.parse_args()))
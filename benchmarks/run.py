@@ -0,0 +1,192 @@
+"""
+Load-test every API endpoint and record latency percentiles and throughput.
+
+By default main.app is driven in-process through httpx's ASGI transport
+against DATABASE_URL (no server needed); pass --base-url to hit a running
+server instead. Results are written as JSON, tagged with the current git
+commit, so runs can be compared with `python -m benchmarks.compare`:
+
+    python -m benchmarks.run --seed 10000 --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import orjson
+
+CATEGORY_IDS = ["1", "2", "5"]
+RESULTS_DIR = Path(__file__).parent / "results"
+
+Request = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(pct / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def drive(client: httpx.AsyncClient, make_request: Request, total: int, concurrency: int) -> Dict:
+    """Fire `total` requests from `concurrency` workers and summarize latency."""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await make_request(client)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+
+
+async def seed_posts(client: httpx.AsyncClient, count: int) -> List[str]:
+    """Create `count` posts through the bulk endpoint and return their ids."""
+    ids = []
+    for start in range(0, count, 1000):
+        batch = [
+            {"content": f"Load test post {i}", "category_id": CATEGORY_IDS[i % len(CATEGORY_IDS)]}
+            for i in range(start, min(start + 1000, count))
+        ]
+        response = await client.post("/posts/bulk", json=batch)
+        response.raise_for_status()
+        ids.extend(item["id"] for item in response.json()["body"]["results"] if item["status"] == "created")
+    return ids
+
+
+async def deep_cursor(client: httpx.AsyncClient, pages: int) -> Optional[str]:
+    """Walk the feed to find the cursor for page `pages`."""
+    cursor = None
+    for _ in range(pages):
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/posts", params=params)
+        cursor = response.json().get("pagination", {}).get("nextCursor")
+        if not cursor:
+            break
+    return cursor
+
+
+def scenarios(post_ids: List[str], deep: Optional[str], deep_offset: int) -> Dict[str, Request]:
+    rng = random.Random(7)
+    flag_targets = iter(post_ids)
+
+    async def flag(client):
+        post_id = next(flag_targets, None) or rng.choice(post_ids)
+        return await client.post(f"/posts/{post_id}/flag", json={"reason": "load test"})
+
+    return {
+        "GET /categories": lambda client: client.get("/categories"),
+        "GET /posts": lambda client: client.get("/posts"),
+        "GET /posts?category_id": lambda client: client.get(
+            "/posts", params={"category_id": rng.choice(CATEGORY_IDS)}
+        ),
+        "GET /posts?offset=deep": lambda client: client.get("/posts", params={"offset": deep_offset}),
+        "GET /posts?cursor=deep": lambda client: client.get(
+            "/posts", params={"cursor": deep} if deep else {}
+        ),
+        "POST /posts": lambda client: client.post(
+            "/posts", json={"content": "Load test write", "category_id": rng.choice(CATEGORY_IDS)}
+        ),
+        "POST /posts/{id}/flag": flag,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_client(base_url: Optional[str]) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30)
+    from main import app  # Imported lazily so --base-url runs need no database settings
+    from src.database import init_engines
+
+    init_engines()  # ASGITransport does not run the app lifespan
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30)
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with make_client(args.base_url) as client:
+        post_ids = await seed_posts(client, args.seed)
+        deep = await deep_cursor(client, args.deep_page)
+        selected = scenarios(post_ids, deep, deep_offset=args.deep_page * 10)
+        if args.only:
+            selected = {name: request for name, request in selected.items() if name in args.only}
+
+        results = {}
+        for name, make_request in selected.items():
+            await drive(client, make_request, total=min(args.warmup, args.requests), concurrency=args.concurrency)
+            results[name] = await drive(client, make_request, args.requests, args.concurrency)
+            summary = results[name]
+            print(
+                f"{name:<26} {summary['rps']:>9,.1f} req/s  p50={summary['p50_ms']:>8.2f}ms  "
+                f"p95={summary['p95_ms']:>8.2f}ms  p99={summary['p99_ms']:>8.2f}ms  errors={summary['errors']}"
+            )
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "target": args.base_url or "in-process",
+        "settings": {key: value for key, value in vars(args).items() if key != "output"},
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['commit'] or 'run'}-{int(time.time())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=None, help="Benchmark a running server instead of main.app in-process")
+    parser.add_argument("--seed", type=int, default=5000, help="Posts to create before measuring")
+    parser.add_argument("--requests", type=int, default=1000, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--deep-page", type=int, default=100, help="Page used for the deep offset/cursor scenarios")
+    parser.add_argument("--only", nargs="*", help="Scenario names to run (default: all)")
+    parser.add_argument("--output", default=None, help="JSON results path (default: benchmarks/results/)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""
+Measure how requests/sec scales with the number of server workers.
+
+For each worker count, starts `python -m src.server` on a local port, waits
+until it answers, then drives --path from several load-generator processes
+(one Python process alone cannot saturate more than a core or two) and
+reports the combined throughput. Needs the same environment as the server
+itself (DATABASE_URL etc.):
+
+    python -m benchmarks.scaling_benchmark --workers 1 2 4 8 --requests 5000 --clients 4
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from .run import drive
+
+
+def load(base_url: str, path: str, requests: int, concurrency: int) -> dict:
+    async def go():
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            return await drive(client, lambda client: client.get(path), requests, concurrency)
+
+    return asyncio.run(go())
+
+
+def wait_until_ready(base_url: str, path: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(base_url + path, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+def measure(workers: int, args: argparse.Namespace) -> dict:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(args.port)],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(base_url, args.path)
+        per_client = args.requests // args.clients
+        with ProcessPoolExecutor(args.clients) as pool:
+            # Warm every worker's pool and caches before measuring
+            list(pool.map(load, [base_url] * args.clients, [args.path] * args.clients,
+                          [min(200, per_client)] * args.clients, [args.concurrency] * args.clients))
+            started = time.perf_counter()
+            results = list(pool.map(load, [base_url] * args.clients, [args.path] * args.clients,
+                                    [per_client] * args.clients, [args.concurrency] * args.clients))
+            elapsed = time.perf_counter() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+    return {
+        "workers": workers,
+        "rps": round(per_client * args.clients / elapsed, 1),
+        "p50_ms": max(result["p50_ms"] for result in results),
+        "p99_ms": max(result["p99_ms"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--path", default="/posts?limit=10")
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests per worker count")
+    parser.add_argument("--clients", type=int, default=4, help="Load-generator processes")
+    parser.add_argument("--concurrency", type=int, default=25, help="Connections per load-generator process")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    baseline = None
+    for workers in sorted(set(args.workers)):
+        result = measure(workers, args)
+        baseline = baseline or result["rps"]
+        print(
+            f"{workers:>3} workers: {result['rps']:>9,.1f} req/s ({result['rps'] / baseline:.2f}x)  "
+            f"p50={result['p50_ms']:.2f}ms  p99={result['p99_ms']:.2f}ms  errors={result['errors']}"
+        )
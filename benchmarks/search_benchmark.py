@@ -0,0 +1,76 @@
+"""
+Time ranked full-text search over a synthetic corpus.
+
+Seeds --rows posts built from a fixed vocabulary (so term frequencies are
+realistic-ish and repeatable), then runs each query --repeat times through
+the same search path as GET /posts/search:
+
+    python -m benchmarks.search_benchmark --rows 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, insert, select
+
+from src.database import SessionFactory, dispose_engines, init_engines
+from src.models import Post
+from src.utils.search import search_posts
+
+VOCABULARY = (
+    "library exam lecture party hostel cafeteria professor deadline campus club "
+    "football library wifi parking semester project lab internship concert rumor "
+    "dating roommate scholarship strike graduation fees assignment midterm canteen bus"
+).split()
+QUERIES = ["library", "exam deadline", "party hostel", "wifi parking", "graduation fees strike"]
+
+
+async def seed(rows: int) -> None:
+    rng = random.Random(42)
+    async with init_engines().begin() as conn:
+        existing = (await conn.execute(select(func.count()).select_from(Post))).scalar_one()
+        start = datetime.utcnow()
+        batch = []
+        for i in range(existing, rows):
+            words = rng.choices(VOCABULARY, k=rng.randint(8, 40))
+            batch.append({
+                "id": uuid.uuid4(),
+                "content": " ".join(words),
+                "category_id": rng.choice(["1", "2", "5"]),
+                "created_at": start - timedelta(seconds=i),
+                "flagged": False,
+            })
+            if len(batch) == 5000:
+                await conn.execute(insert(Post), batch)
+                batch.clear()
+        if batch:
+            await conn.execute(insert(Post), batch)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_engines()
+    await seed(args.rows)
+    async with SessionFactory() as db:
+        for q in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                await search_posts(db, q, category_id=None, limit=args.limit, cursor=None)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(
+                f"{q!r:>26}: median={statistics.median(timings):.2f}ms "
+                f"p95={statistics.quantiles(timings, n=20)[-1]:.2f}ms"
+            )
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,86 @@
+"""
+Microbenchmark of rendering a 100-row GET /posts response.
+
+"before" reproduces the original path: per-row dicts with str()/isoformat(),
+a uuid4-based envelope, an eagerly formatted debug log, FastAPI's
+jsonable_encoder and ORJSONResponse. "after" is serialize_post + api_response.
+No database is needed:
+
+    python -m benchmarks.serialization_benchmark --rows 100
+"""
+import argparse
+import logging
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
+
+from src.utils.custom_utils import api_response
+from src.utils.serializers import serialize_post
+
+logger = logging.getLogger("benchmark")
+
+
+def make_posts(count: int) -> list[SimpleNamespace]:
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            content=f"Post number {i} with a realistic amount of campus gossip text in it.",
+            category_id="1",
+            created_at=now - timedelta(seconds=i),
+            flagged=i % 7 == 0,
+            flag_reason="Spam" if i % 7 == 0 else None,
+        )
+        for i in range(count)
+    ]
+
+
+def before(posts) -> bytes:
+    body = [
+        {
+            "id": str(post.id),
+            "content": post.content,
+            "category_id": post.category_id,
+            "created_at": post.created_at.isoformat(),
+            "flagged": post.flagged,
+            "flag_reason": post.flag_reason,
+        }
+        for post in posts
+    ]
+    logger.debug(f"Generating response: body={body}")
+    content = {
+        "header": {
+            "requestRefId": str(uuid.uuid4().int)[:10],
+            "responseCode": 200,
+            "responseMessage": "Posts retrieved successfully.",
+            "customerMessage": "Successfully loaded posts.",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "body": body,
+    }
+    return ORJSONResponse(jsonable_encoder(content)).body
+
+
+def after(posts) -> bytes:
+    return api_response(
+        status_code=200,
+        response_message="Posts retrieved successfully.",
+        customer_message="Successfully loaded posts.",
+        body=[serialize_post(post) for post in posts],
+    ).body
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    posts = make_posts(args.rows)
+    for name, render in (("before", before), ("after", after)):
+        seconds = min(timeit.repeat(lambda: render(posts), number=args.number, repeat=5))
+        print(f"{name:>6}: {seconds / args.number * 1e6:,.1f} us per {args.rows}-row response")
@@ -0,0 +1,105 @@
+"""
+Measure cold start: how long `import main` takes, which modules it spends
+that time in, and how long a fresh server takes to answer its first request
+and to report ready.
+
+Import time comes from `python -X importtime -c "import main"` in a fresh
+interpreter (median of --runs). Time-to-first-request starts one
+`python -m src.server --workers 1` per run and polls --path until it answers
+200, then /health/ready until the connection pool is warmed. Needs the same
+environment as the server itself (DATABASE_URL etc.):
+
+    python -m benchmarks.startup_benchmark --runs 5 --top 15
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+
+def import_times() -> dict:
+    """Cumulative import time in microseconds per module, for one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self_us |  cumulative_us |   module" (indented by nesting depth)
+        self_us, cumulative_us, module = line.split(":", 1)[1].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def poll(url: str, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return time.monotonic()
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer 200 in time")
+
+
+def time_to_first_request(args: argparse.Namespace) -> tuple:
+    base_url = f"http://127.0.0.1:{args.port}"
+    started = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--workers", "1", "--host", "127.0.0.1", "--port", str(args.port)],
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + args.timeout
+        first = poll(base_url + args.path, deadline) - started
+        ready = poll(base_url + "/health/ready", deadline) - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return first, ready
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level packages to list")
+    parser.add_argument("--path", default="/categories", help="First request to wait for")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--skip-server", action="store_true", help="Only measure import time")
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    total_ms = statistics.median(run["main"][1] for run in runs) / 1000
+    print(f"import main: {total_ms:.1f} ms median over {args.runs} runs")
+
+    # Self time summed per top-level package, so e.g. every sqlalchemy.* module counts once
+    packages = defaultdict(list)
+    for run in runs:
+        totals = defaultdict(int)
+        for module, (self_us, _) in run.items():
+            totals[module.split(".")[0]] += self_us
+        for package, self_us in totals.items():
+            packages[package].append(self_us)
+    slowest = sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]
+    for package, self_us in slowest:
+        median_ms = statistics.median(self_us) / 1000
+        print(f"  {package:<28} {median_ms:>8.1f} ms {median_ms / total_ms:>6.1%}")
+
+    if not args.skip_server:
+        results = [time_to_first_request(args) for _ in range(args.runs)]
+        print(f"first {args.path} response: {statistics.median(first for first, _ in results) * 1000:.0f} ms median")
+        print(f"/health/ready: {statistics.median(ready for _, ready in results) * 1000:.0f} ms median")
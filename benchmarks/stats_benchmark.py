@@ -0,0 +1,110 @@
+"""
+Check that post_stats stays exact under concurrent writes, and compare
+GET /categories/stats with the COUNT(*) query it replaces.
+
+Fires --writers concurrent clients that create posts, bulk-create posts,
+and flag/unflag random posts (racing each other on the same posts) through
+the app in-process, then compares every rollup row with a fresh GROUP BY
+over posts. Exits non-zero on any mismatch. Needs a migrated database at
+DATABASE_URL:
+
+    python -m benchmarks.stats_benchmark --writers 50 --operations 20
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+import httpx
+from sqlalchemy import case, func, select
+
+from src import models
+from src.core.stats import UNCATEGORIZED, category_totals
+from src.database import SessionFactory, dispose_engines, init_engines
+
+CATEGORIES = ["1", "2", "5", None]
+
+
+async def writer(client: httpx.AsyncClient, rng: random.Random, post_ids: list, operations: int):
+    for _ in range(operations):
+        action = rng.random()
+        if action < 0.4 or not post_ids:
+            response = await client.post("/posts", json={"content": "stats check", "category_id": rng.choice(CATEGORIES)})
+            if response.status_code in (200, 202):
+                post_ids.append(response.json()["body"]["id"])
+        elif action < 0.5:
+            posts = [{"content": "stats bulk", "category_id": rng.choice(CATEGORIES)} for _ in range(rng.randint(2, 20))]
+            response = await client.post("/posts/bulk", json=posts)
+            post_ids.extend(item["id"] for item in response.json()["body"]["results"] if item["status"] == "created")
+        elif action < 0.8:
+            await client.post(f"/posts/{rng.choice(post_ids)}/flag", json={"reason": "stats check"})
+        else:
+            items = [{"id": post_id} for post_id in rng.sample(post_ids, min(5, len(post_ids)))]
+            await client.post("/posts/flag/bulk", json={"action": "unflag", "items": items})
+        # Every client sticks to the primary after a write; keep the cookie jar empty
+        client.cookies.clear()
+
+
+async def expected_totals(db):
+    category = func.coalesce(models.Post.category_id, UNCATEGORIZED)
+    query = select(
+        category.label("category_id"),
+        func.count().label("posts"),
+        func.sum(case((models.Post.flagged, 1), else_=0)).label("flagged"),
+    ).group_by(category)
+    return {
+        row.category_id or None: (row.posts, int(row.flagged or 0))
+        for row in await db.execute(query)
+    }
+
+
+async def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main(args: argparse.Namespace) -> int:
+    from main import app
+
+    init_engines()
+    rng = random.Random(args.seed)
+    post_ids: list = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            writer(client, random.Random(rng.random()), post_ids, args.operations)
+            for _ in range(args.writers)
+        ))
+        print(f"{args.writers * args.operations} concurrent writes in {time.perf_counter() - started:.2f}s")
+
+        async with SessionFactory() as db:
+            rollup = {row["category_id"]: (row["posts"], row["flagged"]) for row in await category_totals(db)}
+            expected = await expected_totals(db)
+            count_ms = await timed(lambda: expected_totals(db), args.repeat)
+        stats_ms = await timed(lambda: client.get("/categories/stats"), args.repeat)
+
+    await dispose_engines()
+    mismatches = {
+        category_id: (rollup.get(category_id), expected.get(category_id))
+        for category_id in set(rollup) | set(expected)
+        if rollup.get(category_id, (0, 0)) != expected.get(category_id, (0, 0))
+    }
+    print(f"GET /categories/stats: {stats_ms:.2f} ms median, COUNT(*) GROUP BY: {count_ms:.2f} ms median")
+    print("post_stats matches posts" if not mismatches else f"MISMATCH (rollup, actual): {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=50)
+    parser.add_argument("--operations", type=int, default=20, help="Writes per concurrent client")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    sys.exit(asyncio.run(main(parser.parse_args())))
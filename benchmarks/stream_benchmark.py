@@ -0,0 +1,107 @@
+"""
+Fan-out of /posts/stream events to many simulated subscribers.
+
+Each subscriber is a task draining its own hub queue, like an SSE or
+WebSocket connection does. The script reports the memory held per
+subscriber and, per published event, the time until the last subscriber
+received it. It then adds subscribers that never read to check that slow
+consumers are dropped instead of buffered. No database is needed:
+
+    python -m benchmarks.stream_benchmark --subscribers 5000 --events 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from src.core.events import POST_CREATED, FeedEvent, FeedHub, PostEvents
+
+from .run import percentile
+
+
+def make_post(category_id: str) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "content": "A realistic amount of campus gossip text for a streamed post.",
+        "category_id": category_id,
+        "created_at": datetime.utcnow(),
+        "flagged": False,
+        "flag_reason": None,
+    }
+
+
+async def consume(subscriber, received: dict, stalled: asyncio.Event):
+    while True:
+        if subscriber.category_id == "stalled":
+            await stalled.wait()
+        event = await subscriber.queue.get()
+        if event is None:
+            return
+        received[event.text] = time.perf_counter()
+
+
+async def main(args: argparse.Namespace) -> None:
+    hub = FeedHub(queue_size=args.queue_size, heartbeat_seconds=3600)
+    events = PostEvents(hub, backend="local")
+    stalled = asyncio.Event()
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    subscribers = []
+    for i in range(args.subscribers):
+        # One in ten listens to a single category, the rest to everything
+        subscribers.append(hub.subscribe("1" if i % 10 == 0 else None))
+    received = [{} for _ in subscribers]
+    tasks = [
+        asyncio.create_task(consume(subscriber, received[i], stalled))
+        for i, subscriber in enumerate(subscribers)
+    ]
+    await asyncio.sleep(0)
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{args.subscribers} subscribers: {(held - baseline) / 1024 / 1024:.1f} MiB "
+          f"({(held - baseline) / args.subscribers:,.0f} bytes each, idle)")
+
+    latencies = []
+    for i in range(args.events):
+        post = make_post("1" if i % 2 else "2")
+        published = time.perf_counter()
+        await events.publish(POST_CREATED, post)
+        # Let every consumer drain its queue; the last delivery marks the fan-out time
+        while any(subscriber.queue.qsize() for subscriber in subscribers):
+            await asyncio.sleep(0)
+        delivered = [r.popitem()[1] for r in received if r]
+        latencies.append((max(delivered) - published) * 1000 if delivered else 0.0)
+
+    latencies.sort()
+    print(f"fan-out of {args.events} events: p50 {percentile(latencies, 50):.2f} ms, "
+          f"p99 {percentile(latencies, 99):.2f} ms, mean {statistics.mean(latencies):.2f} ms")
+
+    # Add stalled subscribers (a tenth as many) and publish past their queue size
+    for subscriber in subscribers[::10]:
+        hub.unsubscribe(subscriber)
+    slow = [hub.subscribe("stalled") for _ in range(args.subscribers // 10)]
+    tasks += [asyncio.create_task(consume(subscriber, {}, stalled)) for subscriber in slow]
+    await asyncio.sleep(0)
+    for _ in range(args.queue_size + 1):
+        hub.publish(FeedEvent(POST_CREATED, "stalled", b'{"type":"post.created"}'))
+        await asyncio.sleep(0)  # Healthy subscribers keep draining
+    dropped = sum(subscriber.dropped for subscriber in slow)
+    print(f"stalled subscribers dropped: {dropped}/{len(slow)}, "
+          f"still connected: {hub.subscriber_count}")
+
+    stalled.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--queue-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
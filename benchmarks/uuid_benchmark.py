@@ -0,0 +1,105 @@
+"""
+Insert throughput and primary key index size with random (v4) versus
+time-ordered (v7) UUID keys.
+
+Inserts --rows rows into two scratch tables that differ only in how the app
+generates their UUID primary key (uuid.uuid4 or src.utils.uuid7), in
+batches of --batch-size rows. Throughput is reported per tenth of the run,
+since random keys slow down once the index outgrows shared_buffers. Index size and, with the pgstattuple extension, leaf page
+density show the page splits random keys cause. The real posts table is not
+touched; needs a Postgres DATABASE_URL:
+
+    python -m benchmarks.uuid_benchmark --rows 10000000
+    python -m benchmarks.uuid_benchmark --drop   # remove scratch tables
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core import config
+from src.utils.uuid7 import uuid7
+
+TABLES = {"v4": ("bench_ids_v4", uuid.uuid4), "v7": ("bench_ids_v7", uuid7)}
+
+
+async def fill(engine, table: str, make_id, rows: int, batch_size: int) -> list:
+    """Insert `rows` rows, returning rows/s for each tenth of the run."""
+    rates = []
+    segment = max(rows // 10, batch_size)
+    inserted = marked = 0
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        raw = (await conn.get_raw_connection()).driver_connection
+        while inserted < rows:
+            count = min(batch_size, rows - inserted)
+            await raw.executemany(
+                f"INSERT INTO {table} (id, created_at, content) VALUES ($1, now(), $2)",
+                [(make_id(), "Benchmark post") for _ in range(count)],
+            )
+            inserted += count
+            if inserted - marked >= segment or inserted == rows:
+                now = time.perf_counter()
+                rates.append((inserted - marked) / (now - started))
+                marked, started = inserted, now
+    return rates
+
+
+async def index_stats(conn, table: str) -> dict:
+    index = f"{table}_pkey"
+    stats = {
+        "index_mb": (await conn.execute(text("SELECT pg_relation_size(:index)"), {"index": index})).scalar() / 2**20,
+        "table_mb": (await conn.execute(text("SELECT pg_relation_size(:table)"), {"table": table})).scalar() / 2**20,
+    }
+    has_pgstattuple = (await conn.execute(
+        text("SELECT count(*) FROM pg_extension WHERE extname = 'pgstattuple'")
+    )).scalar()
+    if has_pgstattuple:
+        row = (await conn.execute(
+            text("SELECT avg_leaf_density, leaf_fragmentation FROM pgstatindex(:index)"), {"index": index}
+        )).one()
+        stats["leaf_density"] = row.avg_leaf_density
+        stats["fragmentation"] = row.leaf_fragmentation
+    return stats
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(config.DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("This benchmark needs a Postgres DATABASE_URL")
+    async with engine.begin() as conn:
+        for table, _ in TABLES.values():
+            await conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+            if not args.drop:
+                await conn.execute(text(
+                    f"CREATE TABLE {table} (id UUID PRIMARY KEY, created_at TIMESTAMP NOT NULL, content VARCHAR NOT NULL)"
+                ))
+    if args.drop:
+        await engine.dispose()
+        return
+
+    for version, (table, make_id) in TABLES.items():
+        started = time.perf_counter()
+        rates = await fill(engine, table, make_id, args.rows, args.batch_size)
+        elapsed = time.perf_counter() - started
+        async with engine.connect() as conn:
+            stats = await index_stats(conn, table)
+        print(
+            f"{version}: {args.rows / elapsed:>9,.0f} rows/s overall, last tenth {rates[-1]:>9,.0f} rows/s  "
+            f"pkey {stats['index_mb']:,.0f} MB, table {stats['table_mb']:,.0f} MB"
+            + (f", leaf density {stats['leaf_density']:.0f}%, fragmentation {stats['fragmentation']:.0f}%"
+               if "leaf_density" in stats else "")
+        )
+        print("    rows/s per tenth: " + " ".join(f"{rate:,.0f}" for rate in rates))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--drop", action="store_true", help="Drop the scratch tables and exit")
+    asyncio.run(main(parser.parse_args()))
@@ -5,11 +5,19 @@ from fastapi.responses import ORJSONResponse  # Fast JSON response handler
 from fastapi.middleware.cors import CORSMiddleware  # Cross-Origin Resource Sharing
 from contextlib import asynccontextmanager  # For async context management
 from pydantic import ValidationError  # For Pydantic validation errors
-import httpx  # HTTP client for Python
 from sqlalchemy.exc import SQLAlchemyError  # Database-related errors
 
-# Import application routes and custom error handlers
-from src.routers import app_routes
+# Import application configuration and background workers
+from src.core import config
+from src.core.categories import categories
+from src.core.events import post_events
+from src.core.moderation import moderator
+from src.core.write_behind import write_behind
+from src.database import dispose_engines, init_engines, pool_warmup
+
+# Import application routes, middleware and custom error handlers
+from src.middleware import AdmissionMiddleware, CompressionMiddleware, TimingMiddleware
+from src.routers import app_routes, monitoring_routes
 from src.utils.exception_handlers import (
     http_exception_handler,
     pydantic_validation_error_handler,
@@ -17,8 +25,34 @@ from src.utils.exception_handlers import (
     validation_exception_handler
 )
 
+
+# Application lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create this worker's database engines, load the category catalog and
+    banned terms, and start background workers on startup; drain the workers and close the
+    connection pools on shutdown. Nothing here runs at import, so importing
+    `main` stays cheap.
+    """
+    init_engines()  # Per worker, so forked processes never share pooled sockets
+    pool_warmup.start(config.DB_POOL_WARMUP_CONNECTIONS)  # /health/ready turns green when done
+    categories.load()
+    moderator.load()  # Builds the banned-term automaton
+    if config.WRITE_BEHIND_ENABLED:
+        write_behind.start()  # Batch-inserts posts queued by create_post
+    await post_events.start()  # Feeds /posts/stream subscribers
+    yield
+    await write_behind.stop()  # Writes out every post still queued
+    await post_events.stop()
+    moderator.close()
+    await pool_warmup.stop()
+    await dispose_engines()
+
+
 # Initialize FastAPI application
 app = FastAPI(
+    lifespan=lifespan,  # Startup/shutdown hooks for background workers
     title="Campus Pulse",  # API title for documentation
     description="Let's learn FastAPI",  # API description for documentation
     version="0.1.0",  # API version number
@@ -38,6 +72,16 @@ app.add_middleware(
     allow_headers=["*"],        # Allow all HTTP headers
 )
 
+# Compress responses above COMPRESSION_MIN_BYTES with zstd, brotli or gzip
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Shed load with 503 when overloaded and rate limit clients (RATE_LIMIT_ENABLED)
+app.add_middleware(AdmissionMiddleware)
+
+# Record request timing and SQL usage (Server-Timing header and /metrics)
+app.add_middleware(TimingMiddleware)
+
 # Register custom exception handlers
 # These ensure consistent error responses across the API
 app.add_exception_handler(
@@ -62,4 +106,8 @@ app.add_exception_handler(
 app.include_router(
     app_routes.router,
     tags=["API Endpoints"]
-)
\ No newline at end of file
+)
+app.include_router(
+    monitoring_routes.router,
+    tags=["Monitoring"]
+)
@@ -0,0 +1,224 @@
+"""
+Admission control and per-client rate limiting.
+
+Under overload, requests pile up waiting for a pool connection in `get_db`
+and every request slows down together until they all time out. Instead,
+AdmissionMiddleware (src/middleware.py) asks the controller here whether a
+request may start, based on how many are already in flight on this worker
+and how long connection checkouts have recently waited:
+
+- low-priority requests (export, search, offsets past ADMISSION_DEEP_OFFSET)
+  are shed first, once ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT requests are
+  running or checkouts wait longer than ADMISSION_LOW_PRIORITY_MAX_WAIT_MS
+- everything else is shed past ADMISSION_MAX_IN_FLIGHT or
+  ADMISSION_MAX_WAIT_MS
+- health checks, metrics, docs and the live stream are never shed
+
+Shed requests get an immediate 503 with Retry-After, so the ones admitted
+keep a bounded latency. With RATE_LIMIT_ENABLED each client also gets a
+token bucket; with RATE_LIMIT_BACKEND=redis the buckets are shared by every
+worker.
+"""
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+from urllib.parse import parse_qs
+
+from starlette.types import Scope
+
+from src.database import recent_pool_wait
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+EXEMPT = "exempt"
+LOW = "low"
+NORMAL = "normal"
+
+EXEMPT_PREFIXES = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json", "/posts/stream")
+LOW_PRIORITY_PATHS = ("/posts/export", "/posts/search")
+
+
+class AdmissionController:
+    """Decides whether a request may start; a no-op unless `enabled`."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        max_in_flight: int,
+        low_priority_max_in_flight: int,
+        low_priority_max_wait: float,
+        max_wait: float,
+        deep_offset: int,
+        retry_after: int,
+    ):
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.low_priority_max_in_flight = low_priority_max_in_flight
+        self.low_priority_max_wait = low_priority_max_wait
+        self.max_wait = max_wait
+        self.deep_offset = deep_offset
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {LOW: 0, NORMAL: 0}
+
+    def priority(self, scope: Scope) -> str:
+        path = scope["path"]
+        if path.startswith(EXEMPT_PREFIXES):
+            return EXEMPT
+        if path in LOW_PRIORITY_PATHS:
+            return LOW
+        if path == "/posts" and b"offset" in scope["query_string"]:
+            offset = parse_qs(scope["query_string"].decode("latin-1")).get("offset", ["0"])[-1]
+            if offset.isdigit() and int(offset) > self.deep_offset:
+                return LOW
+        return NORMAL
+
+    def try_admit(self, priority: str) -> bool:
+        """Count the request as in flight and return True, or return False to shed it."""
+        if self.enabled:
+            if priority == LOW:
+                max_in_flight, max_wait = self.low_priority_max_in_flight, self.low_priority_max_wait
+            else:
+                max_in_flight, max_wait = self.max_in_flight, self.max_wait
+            if self.in_flight >= max_in_flight or recent_pool_wait() > max_wait:
+                self.shed[priority] += 1
+                return False
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "low_priority_max_in_flight": self.low_priority_max_in_flight,
+            "pool_wait_ms_recent": round(recent_pool_wait() * 1000, 3),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+        }
+
+
+class LocalRateLimiter:
+    """
+    In-process token buckets, used when RATE_LIMIT_BACKEND is local or Redis
+    fails. The least recently seen clients are forgotten past `max_clients`,
+    which only ever hands them a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def acquire(self, client: str) -> float:
+        """Take a token for `client`; return 0, or the seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[client] = (tokens, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def status(self) -> dict:
+        return {"backend": "local", "clients": len(self._buckets)}
+
+
+# Refill and take a token in one round trip; Redis' own clock keeps workers on
+# different hosts consistent. Returns the wait as a string (Lua numbers would
+# be truncated to integers).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """
+    Token buckets shared by every worker, one hash per client, refilled and
+    drawn from atomically by a Lua script. Redis errors fall back to the
+    in-process buckets.
+    """
+
+    def __init__(self, url: str, fallback: LocalRateLimiter):
+        # Optional dependency, only needed for this backend
+        import redis.asyncio as redis
+        from redis.exceptions import RedisError
+
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._errors = (RedisError, OSError)
+        self.fallback = fallback
+
+    async def acquire(self, client: str) -> float:
+        try:
+            wait = await self._script(keys=[f"ratelimit:{client}"], args=[self.fallback.rate, self.fallback.burst])
+            return float(wait)
+        except self._errors as ex:
+            logger.warning("Redis rate limit failed, using in-process buckets: %r", ex)
+            return await self.fallback.acquire(client)
+
+    def status(self) -> dict:
+        return {"backend": "redis", "fallback_clients": self.fallback.status()["clients"]}
+
+
+def retry_after(seconds: float) -> int:
+    """Whole seconds for a Retry-After header, at least 1."""
+    return max(1, math.ceil(seconds))
+
+
+def create_rate_limiter():
+    if not config.RATE_LIMIT_ENABLED:
+        return None
+    local = LocalRateLimiter(
+        config.RATE_LIMIT_PER_SECOND,
+        burst=config.RATE_LIMIT_BURST,
+        max_clients=config.RATE_LIMIT_MAX_CLIENTS,
+    )
+    if config.RATE_LIMIT_BACKEND == "redis" and config.REDIS_URL:
+        return RedisRateLimiter(config.REDIS_URL, fallback=local)
+    return local
+
+
+admission = AdmissionController(
+    config.ADMISSION_ENABLED,
+    max_in_flight=config.ADMISSION_MAX_IN_FLIGHT,
+    low_priority_max_in_flight=config.ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT,
+    low_priority_max_wait=config.ADMISSION_LOW_PRIORITY_MAX_WAIT_MS / 1000,
+    max_wait=config.ADMISSION_MAX_WAIT_MS / 1000,
+    deep_offset=config.ADMISSION_DEEP_OFFSET,
+    retry_after=config.ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+# None unless RATE_LIMIT_ENABLED
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+from . import config
+from .metrics import FEED_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Generation key covering feeds that are not filtered by category
+ALL_CATEGORIES = "*"
+
+
+class LRUCacheBackend:
+    """
+    In-process cache backend used when Redis is not configured or unreachable.
+
+    Entries are evicted least-recently-used once `max_entries` is reached and
+    expire after their TTL. Generation counters are kept separately so they are
+    never evicted along with the entries they protect.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend:
+    """
+    Redis cache backend shared by every worker.
+
+    Any Redis error degrades to the in-process `fallback` backend so a Redis
+    outage slows the feed down instead of failing it. Entries written during an
+    outage are bounded by their TTL.
+    """
+
+    def __init__(self, url: str, fallback: LRUCacheBackend):
+        # Optional dependency, only needed when REDIS_URL is set
+        import redis.asyncio as redis
+        from redis.exceptions import RedisError
+
+        self._client = redis.from_url(url)
+        self._errors = (RedisError, OSError)
+        self.fallback = fallback
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._client.get(key)
+        except self._errors as ex:
+            logger.warning("Redis get failed, using in-process cache: %r", ex)
+            return await self.fallback.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        try:
+            await self._client.set(key, value, ex=ttl)
+        except self._errors as ex:
+            logger.warning("Redis set failed, using in-process cache: %r", ex)
+            await self.fallback.set(key, value, ttl)
+
+    async def get_counter(self, key: str) -> int:
+        try:
+            value = await self._client.get(key)
+            return int(value) if value is not None else 0
+        except self._errors as ex:
+            logger.warning("Redis get failed, using in-process cache: %r", ex)
+            return await self.fallback.get_counter(key)
+
+    async def incr(self, key: str) -> int:
+        # Always bump the local counter too, so the fallback never serves
+        # entries cached before this write if Redis goes away later
+        await self.fallback.incr(key)
+        try:
+            return await self._client.incr(key)
+        except self._errors as ex:
+            logger.warning("Redis incr failed, using in-process cache: %r", ex)
+            return await self.fallback.get_counter(key)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key runs `fn`; callers arriving while it is in
+    flight await the same result (or exception) instead of running it again.
+    If the running caller is cancelled (e.g. its client disconnected), one of
+    the waiting callers takes over.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return `(result, shared)`, where `shared` is True if another caller ran `fn`."""
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # This caller was cancelled, not the one running fn
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as ex:
+            future.set_exception(ex)
+            future.exception()  # Retrieved, even if nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
+
+
+class FeedCache:
+    """
+    Read-through cache for serialized `GET /posts` pages.
+
+    Keys embed a per-category generation counter. Writing to a category bumps
+    its counter (and the unfiltered feed's), so every cached page for it is
+    orphaned at once and ages out via TTL/LRU instead of being deleted one by one.
+    """
+
+    def __init__(self, backend, ttl: int, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.flights = SingleFlight()
+        self.stats = {"hit": 0, "miss": 0, "coalesced": 0}
+
+    @staticmethod
+    def _generation_key(category_id: Optional[str]) -> str:
+        return f"posts:gen:{category_id or ALL_CATEGORIES}"
+
+    async def feed_key(self, category_id: Optional[str], *params: Any) -> str:
+        """
+        Build the cache key for one feed page.
+
+        Resolve the key before querying the database and reuse it for `set`, so
+        a write that lands mid-query bumps the generation and the (possibly
+        stale) result is stored under an already-orphaned key.
+        """
+        generation = await self.backend.get_counter(self._generation_key(category_id))
+        suffix = ":".join("" if param is None else str(param) for param in params)
+        return f"posts:feed:{category_id or ALL_CATEGORIES}:{generation}:{suffix}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        value = await self.backend.get(key)
+        return orjson.loads(value) if value is not None else None
+
+    async def set(self, key: str, payload: Dict[str, Any]) -> None:
+        if self.enabled:
+            await self.backend.set(key, orjson.dumps(payload), self.ttl)
+
+    async def load(self, key: str, loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return the page cached under `key`, calling `loader` and caching its
+        result on a miss. Concurrent loads of the same key share a single
+        cache lookup and at most one `loader` call.
+        """
+        hit = False
+
+        async def read_through() -> Dict[str, Any]:
+            nonlocal hit
+            page = await self.get(key)
+            if page is not None:
+                hit = True
+                return page
+            page = await loader()
+            await self.set(key, page)
+            return page
+
+        page, shared = await self.flights.do(key, read_through)
+        result = "coalesced" if shared else "hit" if hit else "miss"
+        self.stats[result] += 1
+        FEED_REQUESTS.labels(result).inc()
+        return page
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "in_flight": self.flights.in_flight(),
+            **self.stats,
+        }
+
+    async def invalidate(self, category_id: Optional[str]) -> None:
+        """Orphan every cached page that could contain a post from `category_id`."""
+        if category_id:
+            await self.backend.incr(self._generation_key(category_id))
+        await self.backend.incr(self._generation_key(ALL_CATEGORIES))
+
+
+def build_feed_cache() -> FeedCache:
+    local = LRUCacheBackend(max_entries=config.FEED_CACHE_MAX_ENTRIES)
+    backend = RedisCacheBackend(config.REDIS_URL, fallback=local) if config.REDIS_URL else local
+    return FeedCache(backend, ttl=config.FEED_CACHE_TTL_SECONDS, enabled=config.FEED_CACHE_ENABLED)
+
+
+feed_cache = build_feed_cache()
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from src.utils import compression
+from src.utils.custom_utils import generate_response
+from src.utils.serializers import ORJSON_OPTIONS
+
+from . import config
+
+CATEGORIES_RETRIEVED = "Categories retrieved successfully."
+
+logger = logging.getLogger(__name__)
+
+
+class CategorySnapshot:
+    """
+    An immutable view of the category catalog at one point in time.
+
+    Everything `/categories` and post validation need is computed once here:
+    a dict for O(1) lookups by id and the complete response body with its
+    strong ETag. The body is built from one envelope per snapshot, so it is
+    byte-identical across requests and can be compressed once per encoding.
+
+    That makes its header frozen too, unlike the one `generate_response`
+    builds per request: `timestamp` is when the catalog file was last
+    modified, and `requestRefId` is derived from the catalog's content. The
+    ETag is a hash of that content alone, so every worker and every restart
+    serving the same catalog hands out the same tag.
+    """
+
+    __slots__ = ("categories", "by_id", "body", "etag", "mtime", "_encoded")
+
+    def __init__(self, categories: List[Dict[str, Any]], mtime: float):
+        self.categories = categories
+        self.by_id = {category["id"]: category for category in categories}
+        digest = hashlib.sha256(orjson.dumps(categories, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        envelope = generate_response(
+            status_code=200,
+            response_message=CATEGORIES_RETRIEVED,
+            customer_message="Successfully loaded categories.",
+            body=categories,
+        )
+        # Frozen with the body: the header describes the catalog, not the request
+        envelope["header"]["requestRefId"] = str(10**9 + int(digest[:15], 16) % (9 * 10**9))
+        envelope["header"]["timestamp"] = datetime.fromtimestamp(mtime, timezone.utc)
+        self.body = orjson.dumps(envelope, option=ORJSON_OPTIONS)
+        self.etag = f'"{digest[:32]}"'
+        self.mtime = mtime
+        self._encoded: Dict[str, Tuple[bytes, str]] = {}
+
+    def encoded(self, encoding: Optional[str]) -> Tuple[Optional[str], bytes, str]:
+        """
+        Return `(content_encoding, body, etag)` for a negotiated encoding,
+        compressing at the codec's highest level on first use. Bodies under
+        COMPRESSION_MIN_BYTES are always sent as is.
+        """
+        if encoding is None or len(self.body) < config.COMPRESSION_MIN_BYTES:
+            return None, self.body, self.etag
+        if encoding not in self._encoded:
+            # Each encoding is a different representation, so it gets its own ETag
+            self._encoded[encoding] = (
+                compression.compress(self.body, encoding, compression.MAX_LEVELS[encoding]),
+                f'{self.etag[:-1]}-{encoding}"',
+            )
+        body, etag = self._encoded[encoding]
+        return encoding, body, etag
+
+
+class CategoryRegistry:
+    """
+    Hot-reloadable category catalog backed by a JSON file.
+
+    The file is read by `load` from the app lifespan, or on first access,
+    never at import. Reads are lock-free: the current snapshot is swapped atomically when the
+    file changes. The file's mtime is checked at most once every
+    `reload_interval` seconds, so every worker picks up edits without a
+    restart or a background task. A file that fails to parse is logged and
+    the previous snapshot is kept.
+    """
+
+    def __init__(self, path: str, reload_interval: float):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._checked_at = 0.0
+
+    def load(self) -> CategorySnapshot:
+        """Read the catalog now (a no-op once loaded)."""
+        if self._snapshot is None:
+            self._snapshot = self._load()
+            self._checked_at = time.monotonic()
+        return self._snapshot
+
+    def _load(self) -> CategorySnapshot:
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, "rb") as file:
+            return CategorySnapshot(orjson.loads(file.read()), mtime)
+
+    @property
+    def snapshot(self) -> CategorySnapshot:
+        if self._snapshot is None:
+            return self.load()
+        now = time.monotonic()
+        if self.reload_interval >= 0 and now - self._checked_at >= self.reload_interval:
+            self._checked_at = now
+            self._reload_if_changed()
+        return self._snapshot
+
+    def _reload_if_changed(self):
+        try:
+            if os.stat(self.path).st_mtime == self._snapshot.mtime:
+                return
+            self._snapshot = self._load()
+            logger.info("Reloaded %s categories from %s", len(self._snapshot.categories), self.path)
+        except (OSError, ValueError, TypeError, KeyError) as ex:
+            logger.error("Keeping previous categories, failed to reload %s: %r", self.path, ex)
+
+    def get(self, category_id: str) -> Optional[Dict[str, Any]]:
+        return self.snapshot.by_id.get(category_id)
+
+
+categories = CategoryRegistry(
+    config.CATEGORIES_PATH,
+    reload_interval=config.CATEGORIES_RELOAD_SECONDS,
+)
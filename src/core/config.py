@@ -1,7 +1,130 @@
 import os
-from decouple import config
+from decouple import Csv, config
 
-ENVIRONMENT = config("ENVIRONMENT")
+ENVIRONMENT = config("ENVIRONMENT", default="development")
 
-DATABASE_URL = config("DATABASE_URL")
-REDIS_URL = config("REDIS_URL")
\ No newline at end of file
+# Checked when the engine is created (app startup), not at import
+DATABASE_URL = config("DATABASE_URL", default="")
+REDIS_URL = config("REDIS_URL", default="")
+
+# Posts feed cache (falls back to an in-process LRU when REDIS_URL is empty)
+FEED_CACHE_ENABLED = config("FEED_CACHE_ENABLED", default=True, cast=bool)
+FEED_CACHE_TTL_SECONDS = config("FEED_CACHE_TTL_SECONDS", default=30, cast=int)
+FEED_CACHE_MAX_ENTRIES = config("FEED_CACHE_MAX_ENTRIES", default=1024, cast=int)
+
+# Largest `limit` a paginated endpoint accepts
+PAGE_MAX_LIMIT = config("PAGE_MAX_LIMIT", default=100, cast=int)
+
+# Database engine and connection pool
+DB_ECHO = config("DB_ECHO", default=False, cast=bool)
+DB_POOL_SIZE = config("DB_POOL_SIZE", default=5, cast=int)
+DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", default=10, cast=int)
+DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", default=30, cast=float)
+DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", default=1800, cast=int)
+DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", default=True, cast=bool)
+DB_STATEMENT_CACHE_SIZE = config("DB_STATEMENT_CACHE_SIZE", default=100, cast=int)
+# Connections opened per engine at startup; /health/ready reports ready once they are pooled
+DB_POOL_WARMUP_CONNECTIONS = config("DB_POOL_WARMUP_CONNECTIONS", default=DB_POOL_SIZE, cast=int)
+
+# Bulk post ingestion
+BULK_MAX_POSTS = config("BULK_MAX_POSTS", default=5000, cast=int)
+BULK_INSERT_CHUNK_SIZE = config("BULK_INSERT_CHUNK_SIZE", default=500, cast=int)
+
+# Automatic moderation: posts containing a term listed in MODERATION_TERMS_PATH
+# are flagged on creation (empty path disables it). Batches larger than
+# MODERATION_INLINE_MAX_CHARS are scanned in a thread or process pool.
+MODERATION_TERMS_PATH = config("MODERATION_TERMS_PATH", default="")
+MODERATION_EXECUTOR = config("MODERATION_EXECUTOR", default="thread")  # or process
+MODERATION_WORKERS = config("MODERATION_WORKERS", default=min(4, os.cpu_count() or 1), cast=int)
+MODERATION_INLINE_MAX_CHARS = config("MODERATION_INLINE_MAX_CHARS", default=20000, cast=int)
+MODERATION_CHUNK_SIZE = config("MODERATION_CHUNK_SIZE", default=500, cast=int)
+
+# Near-duplicate detection: posts whose SimHash is within DEDUP_MAX_DISTANCE
+# bits of one seen in the last DEDUP_WINDOW_SECONDS are flagged or rejected
+DEDUP_ENABLED = config("DEDUP_ENABLED", default=False, cast=bool)
+DEDUP_ACTION = config("DEDUP_ACTION", default="flag")  # or reject
+DEDUP_BACKEND = config("DEDUP_BACKEND", default="local")  # or redis (shared by all workers)
+DEDUP_WINDOW_SECONDS = config("DEDUP_WINDOW_SECONDS", default=900, cast=float)
+DEDUP_MAX_DISTANCE = config("DEDUP_MAX_DISTANCE", default=6, cast=int)
+DEDUP_TABLES = config("DEDUP_TABLES", default=8, cast=int)
+DEDUP_MAX_ENTRIES = config("DEDUP_MAX_ENTRIES", default=200000, cast=int)
+DEDUP_MIN_WORDS = config("DEDUP_MIN_WORDS", default=5, cast=int)
+# Batches with more characters than this are fingerprinted in a thread
+DEDUP_INLINE_MAX_CHARS = config("DEDUP_INLINE_MAX_CHARS", default=20000, cast=int)
+
+# Admission control: under overload, low-priority requests (export, search,
+# offsets past ADMISSION_DEEP_OFFSET) are shed with 503 first, then everything
+# else; health and metrics endpoints are never shed. Limits are per worker.
+ADMISSION_ENABLED = config("ADMISSION_ENABLED", default=True, cast=bool)
+ADMISSION_MAX_IN_FLIGHT = config("ADMISSION_MAX_IN_FLIGHT", default=4 * (DB_POOL_SIZE + DB_MAX_OVERFLOW), cast=int)
+ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT = config(
+    "ADMISSION_LOW_PRIORITY_MAX_IN_FLIGHT", default=DB_POOL_SIZE + DB_MAX_OVERFLOW, cast=int
+)
+# Recent pool checkout wait above which low-priority / all requests are shed
+ADMISSION_LOW_PRIORITY_MAX_WAIT_MS = config("ADMISSION_LOW_PRIORITY_MAX_WAIT_MS", default=50, cast=float)
+ADMISSION_MAX_WAIT_MS = config("ADMISSION_MAX_WAIT_MS", default=500, cast=float)
+ADMISSION_DEEP_OFFSET = config("ADMISSION_DEEP_OFFSET", default=1000, cast=int)
+ADMISSION_RETRY_AFTER_SECONDS = config("ADMISSION_RETRY_AFTER_SECONDS", default=1, cast=int)
+
+# Per-client token bucket: RATE_LIMIT_PER_SECOND sustained, RATE_LIMIT_BURST at once.
+# Buckets live in Redis with RATE_LIMIT_BACKEND=redis (shared by all workers)
+RATE_LIMIT_ENABLED = config("RATE_LIMIT_ENABLED", default=False, cast=bool)
+RATE_LIMIT_BACKEND = config("RATE_LIMIT_BACKEND", default="local")  # or redis
+RATE_LIMIT_PER_SECOND = config("RATE_LIMIT_PER_SECOND", default=20, cast=float)
+RATE_LIMIT_BURST = config("RATE_LIMIT_BURST", default=40, cast=int)
+# Clients tracked by the in-process limiter before the least recent is forgotten
+RATE_LIMIT_MAX_CLIENTS = config("RATE_LIMIT_MAX_CLIENTS", default=100000, cast=int)
+
+# Streaming export: rows fetched per server-side cursor round trip
+EXPORT_YIELD_PER = config("EXPORT_YIELD_PER", default=1000, cast=int)
+
+# Per-request profiling: send `X-Profile: 1` to write a cProfile report to PROFILE_DIR
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+PROFILE_DIR = config("PROFILE_DIR", default="profiles")
+
+# Read replicas for read-only endpoints (comma-separated URLs, empty to disable)
+DATABASE_REPLICA_URLS = config("DATABASE_REPLICA_URLS", default="", cast=Csv())
+REPLICA_STRATEGY = config("REPLICA_STRATEGY", default="round_robin")  # or least_connections
+REPLICA_RETRY_SECONDS = config("REPLICA_RETRY_SECONDS", default=30, cast=float)
+# After a write, the client's reads stay on the primary for this long
+READ_YOUR_WRITES_SECONDS = config("READ_YOUR_WRITES_SECONDS", default=5, cast=int)
+
+# Category catalog: checked for changes at most every CATEGORIES_RELOAD_SECONDS (-1 disables reloads)
+CATEGORIES_PATH = config(
+    "CATEGORIES_PATH",
+    default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "routers", "categories.json"),
+)
+CATEGORIES_RELOAD_SECONDS = config("CATEGORIES_RELOAD_SECONDS", default=5, cast=float)
+
+# Write-behind post creation: POST /posts returns 202 and rows are batch-inserted
+WRITE_BEHIND_ENABLED = config("WRITE_BEHIND_ENABLED", default=False, cast=bool)
+WRITE_BEHIND_FLUSH_MS = config("WRITE_BEHIND_FLUSH_MS", default=50, cast=int)
+WRITE_BEHIND_BATCH_SIZE = config("WRITE_BEHIND_BATCH_SIZE", default=500, cast=int)
+WRITE_BEHIND_MAX_QUEUE = config("WRITE_BEHIND_MAX_QUEUE", default=10000, cast=int)
+
+# Real-time feed (/posts/stream): how post events reach every worker's hub
+FEED_EVENTS_BACKEND = config("FEED_EVENTS_BACKEND", default="local")  # local, postgres or redis
+# Events a stream client may fall behind before it is disconnected
+STREAM_QUEUE_SIZE = config("STREAM_QUEUE_SIZE", default=100, cast=int)
+STREAM_HEARTBEAT_SECONDS = config("STREAM_HEARTBEAT_SECONDS", default=15, cast=float)
+
+# Production server (python -m src.server); every worker has its own DB pool,
+# so the database sees up to WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=os.cpu_count() or 1, cast=int)
+SERVER_HOST = config("SERVER_HOST", default="0.0.0.0")
+SERVER_PORT = config("SERVER_PORT", default=8000, cast=int)
+SERVER_BACKLOG = config("SERVER_BACKLOG", default=2048, cast=int)
+SERVER_KEEP_ALIVE_SECONDS = config("SERVER_KEEP_ALIVE_SECONDS", default=5, cast=int)
+SERVER_GRACEFUL_TIMEOUT_SECONDS = config("SERVER_GRACEFUL_TIMEOUT_SECONDS", default=30, cast=int)
+# Proxies whose X-Forwarded-For / X-Forwarded-Proto headers are trusted (comma-separated
+# IPs or networks, "*" for any). Client addresses key the per-client rate limit.
+SERVER_FORWARDED_ALLOW_IPS = config("SERVER_FORWARDED_ALLOW_IPS", default="127.0.0.1")
+
+# Response compression, negotiated from Accept-Encoding in this order of preference
+COMPRESSION_ENABLED = config("COMPRESSION_ENABLED", default=True, cast=bool)
+COMPRESSION_ALGORITHMS = config("COMPRESSION_ALGORITHMS", default="zstd,br,gzip", cast=Csv())
+# Bodies smaller than this are sent uncompressed
+COMPRESSION_MIN_BYTES = config("COMPRESSION_MIN_BYTES", default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config("COMPRESSION_GZIP_LEVEL", default=6, cast=int)
+COMPRESSION_BROTLI_LEVEL = config("COMPRESSION_BROTLI_LEVEL", default=4, cast=int)
+COMPRESSION_ZSTD_LEVEL = config("COMPRESSION_ZSTD_LEVEL", default=3, cast=int)
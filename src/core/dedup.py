@@ -0,0 +1,211 @@
+"""
+Near-duplicate post detection.
+
+Every new post's content gets a SimHash fingerprint (src/utils/simhash.py)
+that is looked up in an index of the posts written in the last
+DEDUP_WINDOW_SECONDS. A post within DEDUP_MAX_DISTANCE bits of a recent one
+is a near-duplicate: it is flagged, or rejected with DEDUP_ACTION=reject.
+With DEDUP_BACKEND=redis the index is shared by every worker; otherwise
+each worker keeps its own in memory.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from src.utils.simhash import SimHashIndex, distance, simhash, table_keys
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_REASON = "Automatically flagged: near-duplicate of a recent post."
+
+def fingerprints(texts: Sequence[str], min_words: int) -> List[Optional[int]]:
+    """SimHash per text, or None for texts too short to fingerprint reliably."""
+    return [simhash(text) if len(text.split()) >= min_words else None for text in texts]
+
+
+def within_batch(max_distance: int, tables: int, prints: Sequence[Optional[int]]) -> List[bool]:
+    """Per fingerprint, whether it nearly duplicates an earlier one of the same batch."""
+    batch = SimHashIndex(max_distance, tables, window=float("inf"), max_entries=max(len(prints), 1))
+    duplicates = []
+    for fingerprint in prints:
+        if fingerprint is None:
+            duplicates.append(False)
+            continue
+        duplicates.append(batch.match(fingerprint, 0.0) is not None)
+        batch.add(fingerprint, 0.0)
+    return duplicates
+
+
+class LocalDuplicateIndex:
+    """In-process index, used when DEDUP_BACKEND is local or Redis fails."""
+
+    def __init__(self, max_distance: int, tables: int, window: float, max_entries: int):
+        self.index = SimHashIndex(max_distance, tables, window, max_entries)
+
+    async def check(self, fingerprints: Sequence[Optional[int]], now: float) -> List[bool]:
+        earlier = within_batch(self.index.max_distance, self.index.tables, fingerprints)
+        return [
+            fingerprint is not None and (duplicate or self.index.match(fingerprint, now) is not None)
+            for fingerprint, duplicate in zip(fingerprints, earlier)
+        ]
+
+    async def add(self, fingerprints: Sequence[Optional[int]], now: float) -> None:
+        for fingerprint in fingerprints:
+            if fingerprint is not None:
+                self.index.add(fingerprint, now)
+
+    def status(self) -> dict:
+        return {"backend": "local", "indexed": len(self.index)}
+
+
+class RedisDuplicateIndex:
+    """
+    Index shared by every worker: one sorted set per table key, holding
+    fingerprints scored by the time they were seen.
+
+    A check is one pipelined read of every bucket the batch's keys point
+    to; adding is one pipeline that adds the fingerprints, trims entries
+    older than the window and sets the buckets to expire with it. Two
+    workers checking the same text at the same moment may both let it
+    through. Redis errors fall back to the in-process index.
+    """
+
+    def __init__(self, url: str, fallback: LocalDuplicateIndex):
+        # Optional dependency, only needed for this backend
+        import redis.asyncio as redis
+        from redis.exceptions import RedisError
+
+        self._client = redis.from_url(url)
+        self._errors = (RedisError, OSError)
+        self.fallback = fallback
+        self.max_distance = fallback.index.max_distance
+        self.tables = fallback.index.tables
+        self.window = fallback.index.window
+
+    async def check(self, fingerprints: Sequence[Optional[int]], now: float) -> List[bool]:
+        keyed = [(fingerprint, table_keys(fingerprint, self.tables)) for fingerprint in fingerprints if fingerprint is not None]
+        if not keyed:
+            return [False] * len(fingerprints)
+        bucket_keys = sorted({key for _, keys in keyed for key in keys})
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in bucket_keys:
+                    pipe.zrangebyscore(f"dedup:{key}", now - self.window, "+inf")
+                buckets = dict(zip(bucket_keys, await pipe.execute()))
+        except self._errors as ex:
+            logger.warning("Redis duplicate check failed, using in-process index: %r", ex)
+            return await self.fallback.check(fingerprints, now)
+
+        earlier = within_batch(self.max_distance, self.tables, fingerprints)
+        duplicates = []
+        for fingerprint, duplicate in zip(fingerprints, earlier):
+            if fingerprint is None:
+                duplicates.append(False)
+                continue
+            candidates = {int(member) for key in table_keys(fingerprint, self.tables) for member in buckets[key]}
+            duplicates.append(
+                duplicate or any(distance(candidate, fingerprint) <= self.max_distance for candidate in candidates)
+            )
+        return duplicates
+
+    async def add(self, fingerprints: Sequence[Optional[int]], now: float) -> None:
+        keyed = [(fingerprint, table_keys(fingerprint, self.tables)) for fingerprint in fingerprints if fingerprint is not None]
+        if not keyed:
+            return
+        bucket_keys = sorted({key for _, keys in keyed for key in keys})
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for fingerprint, keys in keyed:
+                    for key in keys:
+                        pipe.zadd(f"dedup:{key}", {str(fingerprint): now})
+                for key in bucket_keys:
+                    pipe.zremrangebyscore(f"dedup:{key}", "-inf", now - self.window)
+                    pipe.expire(f"dedup:{key}", int(self.window) + 1)
+                await pipe.execute()
+        except self._errors as ex:
+            logger.warning("Redis duplicate index update failed, using in-process index: %r", ex)
+            await self.fallback.add(fingerprints, now)
+
+    def status(self) -> dict:
+        return {"backend": "redis", "fallback_indexed": len(self.fallback.index)}
+
+
+class DuplicateDetector:
+    """
+    Finds near-duplicates among new posts; a no-op unless DEDUP_ENABLED.
+
+    Checking and indexing are separate steps: callers `check` posts before
+    writing them and `remember` only those that were actually written, so a
+    failed write never makes the client's retry look like a duplicate of
+    its own lost post. Concurrent identical posts may therefore both pass.
+    Batches with more than `inline_max_chars` characters in total are
+    fingerprinted in a thread instead of on the event loop.
+    """
+
+    def __init__(self, enabled: bool, action: str, min_words: int, inline_max_chars: int, index):
+        self.enabled = enabled
+        self.action = action
+        self.min_words = min_words
+        self.inline_max_chars = inline_max_chars
+        self.index = index
+        self.checked = 0
+        self.duplicates = 0
+
+    @property
+    def rejects(self) -> bool:
+        return self.action == "reject"
+
+    async def check(self, texts: Sequence[str]) -> Tuple[List[bool], List[Optional[int]]]:
+        """
+        Return, per text, whether it nearly duplicates a recent post or an
+        earlier text of the same batch, along with the texts' fingerprints
+        to pass to `remember` once the posts are written.
+        """
+        if not self.enabled or not texts:
+            return [False] * len(texts), [None] * len(texts)
+        if sum(len(text) for text in texts) > self.inline_max_chars:
+            prints = await asyncio.to_thread(fingerprints, texts, self.min_words)
+        else:
+            prints = fingerprints(texts, self.min_words)
+        duplicates = await self.index.check(prints, time.time())
+        self.checked += len(texts)
+        self.duplicates += sum(duplicates)
+        return duplicates, prints
+
+    async def remember(self, prints: Sequence[Optional[int]]) -> None:
+        """Index the fingerprints of posts that were written, for the next DEDUP_WINDOW_SECONDS."""
+        if self.enabled and prints:
+            await self.index.add(prints, time.time())
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "action": self.action,
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            **self.index.status(),
+        }
+
+
+def create_index():
+    local = LocalDuplicateIndex(
+        config.DEDUP_MAX_DISTANCE,
+        tables=config.DEDUP_TABLES,
+        window=config.DEDUP_WINDOW_SECONDS,
+        max_entries=config.DEDUP_MAX_ENTRIES,
+    )
+    if config.DEDUP_BACKEND == "redis" and config.REDIS_URL:
+        return RedisDuplicateIndex(config.REDIS_URL, fallback=local)
+    return local
+
+
+duplicates = DuplicateDetector(
+    config.DEDUP_ENABLED,
+    action=config.DEDUP_ACTION,
+    min_words=config.DEDUP_MIN_WORDS,
+    inline_max_chars=config.DEDUP_INLINE_MAX_CHARS,
+    index=create_index(),
+)
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set
+
+import orjson
+from sqlalchemy import text
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+POST_CREATED = "post.created"
+POST_FLAGGED = "post.flagged"
+POST_UNFLAGGED = "post.unflagged"
+
+# Channel used for Postgres NOTIFY and Redis pub/sub
+CHANNEL = "posts_events"
+
+NOTIFY_BATCH = text("SELECT pg_notify(:channel, message) FROM unnest(CAST(:messages AS text[])) AS message")
+
+
+class FeedEvent:
+    """
+    One post event, encoded once and shared by every subscriber.
+    """
+
+    __slots__ = ("type", "category_id", "text", "sse")
+
+    def __init__(self, type: str, category_id: Optional[str], json: bytes):
+        self.type = type
+        self.category_id = category_id
+        self.text = json.decode()  # WebSocket text frame
+        self.sse = b"event: " + type.encode() + b"\ndata: " + json + b"\n\n"
+
+    @classmethod
+    def from_message(cls, message: bytes) -> "FeedEvent":
+        data = orjson.loads(message)
+        return cls(data["type"], data["post"].get("category_id"), message)
+
+
+# Sent to every subscriber periodically so dead connections are noticed
+HEARTBEAT = FeedEvent("ping", None, b'{"type":"ping"}')
+HEARTBEAT.sse = b": ping\n\n"
+
+
+class Subscriber:
+    """
+    A bounded queue of events for one SSE/WebSocket client.
+
+    A subscriber that falls `queue_size` events behind is dropped: its
+    backlog is discarded and it receives `None`, which ends its stream.
+    """
+
+    def __init__(self, category_id: Optional[str], queue_size: int):
+        self.category_id = category_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def offer(self, event: FeedEvent) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class FeedHub:
+    """
+    In-process fan-out of post events to stream subscribers.
+
+    Each worker runs one hub fed by a single listener (Postgres LISTEN or
+    Redis pub/sub, or direct calls with the "local" backend), so one
+    notification reaches every subscriber without per-subscriber queries.
+    Subscribers are indexed by category; `None` receives everything.
+    """
+
+    def __init__(self, queue_size: int, heartbeat_seconds: float):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._subscribers: Dict[Optional[str], Set[Subscriber]] = defaultdict(set)
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, category_id: Optional[str] = None) -> Subscriber:
+        subscriber = Subscriber(category_id, self.queue_size)
+        self._subscribers[category_id].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        subscribers = self._subscribers.get(subscriber.category_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.category_id]
+
+    def publish(self, event: FeedEvent):
+        self.published += 1
+        targets = list(self._subscribers.get(None, ()))
+        if event.category_id is not None:
+            targets.extend(self._subscribers.get(event.category_id, ()))
+        for subscriber in targets:
+            if not subscriber.offer(event):
+                self.dropped += 1
+                self.unsubscribe(subscriber)
+
+    def broadcast_heartbeat(self):
+        for subscribers in list(self._subscribers.values()):
+            for subscriber in list(subscribers):
+                if not subscriber.offer(HEARTBEAT):
+                    self.dropped += 1
+                    self.unsubscribe(subscriber)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "backend": config.FEED_EVENTS_BACKEND,
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped_subscribers": self.dropped,
+        }
+
+
+class PostEvents:
+    """
+    Publishes post events to every worker's hub through the configured backend
+    and runs the per-worker listener that feeds the local hub.
+    """
+
+    def __init__(self, hub: FeedHub, backend: str):
+        self.hub = hub
+        self.backend = backend
+        self._tasks: list = []
+        self._redis = None
+
+    async def publish(self, type: str, *posts: Dict[str, Any]):
+        """
+        Announce `posts` to every stream subscriber. Streaming is best effort,
+        so failures are logged and never fail the write that triggered them.
+        """
+        if not posts:
+            return
+        messages = [orjson.dumps({"type": type, "post": post}) for post in posts]
+        try:
+            if self.backend == "postgres":
+                await self._notify_postgres(messages)
+            elif self.backend == "redis":
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for message in messages:
+                        pipe.publish(CHANNEL, message)
+                    await pipe.execute()
+            else:
+                for post, message in zip(posts, messages):
+                    self.hub.publish(FeedEvent(type, post.get("category_id"), message))
+        except Exception as ex:
+            logger.warning("Failed to publish %s %s events: %r", len(posts), type, ex)
+
+    async def _notify_postgres(self, messages: List[bytes]):
+        from src.database import engine
+
+        # One statement for the whole batch, so a bulk write costs a single
+        # round trip; notifications are delivered to listeners on commit
+        async with engine.begin() as conn:
+            await conn.execute(
+                NOTIFY_BATCH, {"channel": CHANNEL, "messages": [message.decode() for message in messages]}
+            )
+
+    async def start(self):
+        if self.backend == "redis":
+            import redis.asyncio as redis  # Optional dependency, only needed for this backend
+
+            self._redis = redis.from_url(config.REDIS_URL)
+            self._tasks.append(asyncio.create_task(self._listen_redis()))
+        elif self.backend == "postgres":
+            self._tasks.append(asyncio.create_task(self._listen_postgres()))
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _receive(self, message: bytes):
+        try:
+            self.hub.publish(FeedEvent.from_message(message))
+        except (ValueError, KeyError, TypeError) as ex:
+            logger.warning("Ignoring malformed post event: %r", ex)
+
+    async def _listen_redis(self):
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._receive(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning("Redis event listener failed, reconnecting: %r", ex)
+                await asyncio.sleep(1)
+
+    async def _listen_postgres(self):
+        import asyncpg  # The listener holds one dedicated connection outside the pool
+
+        dsn = config.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, lambda *args: self._receive(args[3].encode()))
+                await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.warning("Postgres event listener failed, reconnecting: %r", ex)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(1)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.hub.heartbeat_seconds)
+            self.hub.broadcast_heartbeat()
+
+
+feed_hub = FeedHub(
+    queue_size=config.STREAM_QUEUE_SIZE,
+    heartbeat_seconds=config.STREAM_HEARTBEAT_SECONDS,
+)
+post_events = PostEvents(feed_hub, backend=config.FEED_EVENTS_BACKEND)
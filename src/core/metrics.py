@@ -0,0 +1,102 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Exposed by the /metrics endpoint
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Total time spent handling a request.",
+    ["method", "route", "status"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements issued per request.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Total time spent executing SQL per request.",
+    ["method", "route"],
+)
+
+
+class RequestStats:
+    """
+    Per-request counters filled in by the SQLAlchemy event hooks below.
+    """
+
+    __slots__ = ("started", "queries", "db_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+# Set by the timing middleware for the duration of a request. SQLAlchemy's
+# async greenlets inherit the caller's context, so the hooks can see it.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Count and time every SQL statement executed through `engine`.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def observe_request(method: str, route: str, status: int, stats: RequestStats) -> None:
+    REQUEST_DURATION.labels(method, route, str(status)).observe(stats.elapsed)
+    REQUEST_DB_QUERIES.labels(method, route).observe(stats.queries)
+    REQUEST_DB_DURATION.labels(method, route).observe(stats.db_seconds)
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
+
+
+FEED_REQUESTS = Counter(
+    "feed_requests_total",
+    "GET /posts pages by outcome: hit (cache), miss (queried) or coalesced.",
+    ["result"],
+)
+WRITE_BEHIND_DEPTH = Gauge(
+    "write_behind_queue_depth",
+    "Posts accepted but not yet written to the database.",
+)
+WRITE_BEHIND_FLUSH_DURATION = Histogram(
+    "write_behind_flush_duration_seconds",
+    "Time taken to insert one batch of buffered posts.",
+)
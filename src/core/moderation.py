@@ -0,0 +1,273 @@
+"""
+Automatic moderation: flag posts containing a banned term.
+
+Banned terms are read from MODERATION_TERMS_PATH (one per line, `#` starts a
+comment) into an Aho-Corasick automaton (src/utils/moderation.py). A single
+post is scanned inline, which takes microseconds; larger batches are split
+into chunks and scanned in a thread or process pool (MODERATION_EXECUTOR),
+so a bulk upload never stalls the event loop.
+
+`rescan` runs the existing posts through the matcher, e.g. after adding
+terms:
+
+    python -m src.core.moderation rescan
+    python -m src.core.moderation rescan --since 2026-10-01 --workers 8 --dry-run
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import String, Uuid, case, column, select, tuple_, update, values
+
+from src import models
+from src.utils.moderation import TermMatcher
+
+from . import config, stats
+
+logger = logging.getLogger(__name__)
+
+# Terms named in a flag reason; the rest are summarized
+REASON_MAX_TERMS = 3
+
+# The matcher used by `_scan_chunk`: set by `Moderator.load` in this process,
+# and by `_init_worker` in each pool process
+_matcher: Optional[TermMatcher] = None
+
+
+def read_terms(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as file:
+        return [line.split("#", 1)[0].strip() for line in file if line.split("#", 1)[0].strip()]
+
+
+def flag_reason(terms: List[str]) -> Optional[str]:
+    if not terms:
+        return None
+    named = ", ".join(terms[:REASON_MAX_TERMS])
+    more = f" and {len(terms) - REASON_MAX_TERMS} more" if len(terms) > REASON_MAX_TERMS else ""
+    return f"Automatically flagged: contains banned term(s) {named}{more}."
+
+
+def _init_worker(terms: List[str]):
+    global _matcher
+    _matcher = TermMatcher(terms)
+
+
+def _scan_chunk(texts: Sequence[str]) -> List[Optional[str]]:
+    return [flag_reason(_matcher.find(text)) for text in texts]
+
+
+class Moderator:
+    """
+    Scans post content for banned terms, returning a flag reason per post
+    (None when it is clean).
+
+    The term list and the pool are set up on first use. Batches with at
+    most `inline_max_chars` characters in total are scanned on the event
+    loop, since handing them to the pool would cost more than the scan.
+    """
+
+    def __init__(self, path: str, executor: str, workers: int, inline_max_chars: int, chunk_size: int):
+        self.path = path
+        self.executor = executor
+        self.workers = workers
+        self.inline_max_chars = inline_max_chars
+        self.chunk_size = chunk_size
+        self.terms: Optional[List[str]] = None
+        self._pool: Optional[Executor] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def load(self):
+        """Read the term list and build the matcher (a no-op once loaded)."""
+        global _matcher
+        if self.terms is None and self.enabled:
+            started = time.perf_counter()
+            _matcher = TermMatcher(read_terms(self.path))
+            self.terms = _matcher.terms
+            logger.info(
+                "Loaded %s banned terms from %s in %.3fs", len(self.terms), self.path, time.perf_counter() - started
+            )
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.executor == "process":
+                # spawn: never fork a process that is running an event loop
+                self._pool = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.terms,),
+                )
+            else:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="moderation")
+        return self._pool
+
+    async def scan(self, texts: Sequence[str]) -> List[Optional[str]]:
+        if not self.enabled or not texts:
+            return [None] * len(texts)
+        self.load()
+        if sum(len(text) for text in texts) <= self.inline_max_chars:
+            return _scan_chunk(texts)
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(pool, _scan_chunk, texts[start:start + self.chunk_size])
+            for start in range(0, len(texts), self.chunk_size)
+        ))
+        return [reason for chunk in chunks for reason in chunk]
+
+    async def flag_reason(self, text: str) -> Optional[str]:
+        return (await self.scan([text]))[0]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+
+moderator = Moderator(
+    config.MODERATION_TERMS_PATH,
+    executor=config.MODERATION_EXECUTOR,
+    workers=config.MODERATION_WORKERS,
+    inline_max_chars=config.MODERATION_INLINE_MAX_CHARS,
+    chunk_size=config.MODERATION_CHUNK_SIZE,
+)
+
+
+async def _apply(db, posts, reasons, dry_run: bool) -> int:
+    """
+    Flag the posts of one scanned chunk that matched; returns how many were flagged.
+
+    Matches are written with one set-based UPDATE per BULK_INSERT_CHUNK_SIZE
+    posts, as in POST /posts/flag/bulk.
+    """
+    matched = [(post, reason) for post, reason in zip(posts, reasons) if reason]
+    if dry_run or not matched:
+        return len(matched)
+    flagged = []
+    for start in range(0, len(matched), config.BULK_INSERT_CHUNK_SIZE):
+        chunk = matched[start:start + config.BULK_INSERT_CHUNK_SIZE]
+        if db.bind.dialect.name == "postgresql":
+            # created_at lets Postgres prune the partitions it has to look in
+            targets = values(
+                column("id", Uuid), column("created_at", models.Post.created_at.type), column("reason", String),
+                name="targets",
+            ).data([(post.id, post.created_at, reason) for post, reason in chunk])
+            statement = (
+                update(models.Post)
+                .where(
+                    models.Post.id == targets.c.id,
+                    models.Post.created_at == targets.c.created_at,
+                    models.Post.flagged.is_(False),
+                )
+                .values(flagged=True, flag_reason=targets.c.reason)
+            )
+        else:
+            # SQLite cannot name the columns of a VALUES list; map ids to reasons with CASE
+            chunk_reasons = {post.id: reason for post, reason in chunk}
+            statement = (
+                update(models.Post)
+                .where(models.Post.id.in_(chunk_reasons), models.Post.flagged.is_(False))
+                .values(flagged=True, flag_reason=case(chunk_reasons, value=models.Post.id))
+            )
+        # Skips posts flagged by someone else since they were read
+        result = await db.execute(
+            statement.returning(models.Post.category_id, models.Post.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        flagged.extend(result.all())
+    if flagged:
+        await stats.record_flagged(db, [(post.category_id, post.created_at) for post in flagged], flagged=True)
+    await db.commit()
+    return len(flagged)
+
+
+async def rescan(moderator: Moderator, since: Optional[date], batch_size: int, dry_run: bool) -> dict:
+    """
+    Run every unflagged post (created on or after `since`) through the matcher.
+
+    Posts are read in keyset-paginated batches on the primary; each batch is
+    scanned in the pool while the next one is being read, and matches are
+    flagged and counted in post_stats batch by batch.
+    """
+    from src.database import SessionFactory
+
+    moderator.load()
+    query = (
+        select(models.Post.id, models.Post.created_at, models.Post.content)
+        .where(models.Post.flagged.is_(False))
+        .order_by(models.Post.created_at, models.Post.id)
+        .limit(batch_size)
+    )
+    if since:
+        query = query.where(models.Post.created_at >= datetime.combine(since, datetime.min.time()))
+
+    scanned = flagged = 0
+    pending: Optional[asyncio.Task] = None
+    async with SessionFactory() as reader, SessionFactory() as writer:
+        cursor = None
+        while True:
+            page = query if cursor is None else query.where(
+                tuple_(models.Post.created_at, models.Post.id) > cursor
+            )
+            posts = (await reader.execute(page)).all()
+            await reader.commit()  # Do not hold a snapshot open for the whole table
+            if pending is not None:
+                flagged += await _apply(writer, *await pending, dry_run)
+                pending = None
+            if not posts:
+                break
+            scanned += len(posts)
+            cursor = (posts[-1].created_at, posts[-1].id)
+            pending = asyncio.ensure_future(_scan_batch(moderator, posts))
+    return {"scanned": scanned, "flagged": flagged}
+
+
+async def _scan_batch(moderator: Moderator, posts):
+    return posts, await moderator.scan([post.content for post in posts])
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.database import dispose_engines, init_engines
+
+    if not config.MODERATION_TERMS_PATH:
+        raise SystemExit("MODERATION_TERMS_PATH is not set")
+    init_engines()
+    scanner = Moderator(
+        config.MODERATION_TERMS_PATH,
+        executor="process",
+        workers=args.workers,
+        inline_max_chars=0,
+        chunk_size=max(args.batch_size // args.workers, 1),
+    )
+    started = time.perf_counter()
+    try:
+        result = await rescan(scanner, args.since, args.batch_size, args.dry_run)
+    finally:
+        scanner.close()
+        await dispose_engines()
+    elapsed = time.perf_counter() - started
+    print(
+        f"Scanned {result['scanned']} posts in {elapsed:.1f}s ({result['scanned'] / max(elapsed, 1e-9):,.0f}/s), "
+        f"{'would flag' if args.dry_run else 'flagged'} {result['flagged']}"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("rescan", help="Flag existing posts that contain banned terms")
+    run.add_argument("--since", type=date.fromisoformat, default=None, help="First day to scan (YYYY-MM-DD)")
+    run.add_argument("--batch-size", type=int, default=5000, help="Posts read and scanned per batch")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scanner processes")
+    run.add_argument("--dry-run", action="store_true", help="Only count the posts that would be flagged")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,152 @@
+"""
+Manage the monthly partitions of the posts table.
+
+    python -m src.core.partitions list
+    python -m src.core.partitions create --months-ahead 3
+    python -m src.core.partitions archive --older-than-months 12 --archive-dir archives
+
+`create` pre-creates partitions so new posts never land in posts_default.
+`archive` detaches partitions older than the cutoff, writes each one to a
+gzip-compressed CSV file, and drops it (pass --keep to leave the detached
+table in place instead).
+"""
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "posts"
+PARTITION_PATTERN = re.compile(r"^posts_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def this_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"posts_p{month:%Y_%m}"
+
+
+async def list_partitions(conn: AsyncConnection) -> List[Tuple[str, date]]:
+    """Return (name, first day of month) for every monthly partition, oldest first."""
+    result = await conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for (name,) in result:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def create_partitions(conn: AsyncConnection, months_ahead: int) -> List[str]:
+    """Create any missing partitions from the current month to `months_ahead` months out."""
+    existing = {name for name, _ in await list_partitions(conn)}
+    current = this_month()
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Fails if posts_default already holds rows for this month; those must
+        # be moved out before the partition can be attached
+        await conn.execute(
+            text(
+                f'CREATE TABLE "{name}" PARTITION OF {PARENT_TABLE} '
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def archive_partitions(
+    conn: AsyncConnection,
+    older_than_months: int,
+    archive_dir: str,
+    keep: bool = False,
+) -> List[str]:
+    """
+    Detach every partition that ends before the cutoff, export it to
+    `<archive_dir>/<partition>.csv.gz`, then drop it unless `keep` is set.
+    """
+    cutoff = add_months(this_month(), -older_than_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection  # asyncpg connection, for COPY
+
+    archived = []
+    for name, month in await list_partitions(conn):
+        if add_months(month, 1) > cutoff:
+            continue
+        await conn.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        with gzip.open(path, "wb") as archive:
+            async def write(chunk: bytes):
+                archive.write(chunk)
+
+            await driver.copy_from_table(
+                name,
+                columns=["id", "content", "category_id", "created_at", "flagged", "flag_reason"],
+                output=write,
+                format="csv",
+                header=True,
+            )
+        if not keep:
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+        logger.info("Archived %s to %s", name, path)
+        archived.append(name)
+    return archived
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.database import dispose_engines, init_engines
+
+    engine = init_engines()
+    async with engine.begin() as conn:
+        if args.command == "list":
+            for name, month in await list_partitions(conn):
+                print(f"{name}  {month} .. {add_months(month, 1)}")
+        elif args.command == "create":
+            created = await create_partitions(conn, args.months_ahead)
+            print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+        elif args.command == "archive":
+            archived = await archive_partitions(conn, args.older_than_months, args.archive_dir, args.keep)
+            print(f"Archived {len(archived)} partitions: {', '.join(archived) or '-'}")
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List monthly partitions")
+    create = commands.add_parser("create", help="Pre-create upcoming partitions")
+    create.add_argument("--months-ahead", type=int, default=3)
+    archive = commands.add_parser("archive", help="Detach and archive old partitions")
+    archive.add_argument("--older-than-months", type=int, default=12)
+    archive.add_argument("--archive-dir", default="archives")
+    archive.add_argument("--keep", action="store_true", help="Keep detached tables instead of dropping them")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,170 @@
+"""
+Per-category, per-day post counters in the `post_stats` rollup table.
+
+Every code path that creates, flags or unflags posts calls `record_created`
+or `record_flagged` inside its own transaction, so the counters commit (or
+roll back) together with the posts. Increments are atomic upserts
+(`INSERT ... ON CONFLICT DO UPDATE SET posts = posts + excluded.posts`), so
+concurrent writers never lose an update.
+
+`reconcile` recomputes the counters from the posts table:
+
+    python -m src.core.stats reconcile
+    python -m src.core.stats reconcile --since 2026-10-01
+
+Counters of days whose partitions were archived are kept by default; a
+reconcile without --since drops them, since those posts are gone.
+"""
+import argparse
+import asyncio
+import logging
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, case, cast, delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models
+
+logger = logging.getLogger(__name__)
+
+# post_stats stores posts without a category under this key
+UNCATEGORIZED = ""
+
+StatKey = Tuple[str, date]
+
+
+def stat_key(category_id: Optional[str], created_at: datetime) -> StatKey:
+    return (category_id or UNCATEGORIZED, created_at.date())
+
+
+async def _increment(db: AsyncSession, posts: Counter, flagged: Counter) -> None:
+    rows = []
+    # Sorted, so concurrent writers lock the rollup rows in the same order
+    for key in sorted(set(posts) | set(flagged)):
+        if posts[key] or flagged[key]:
+            category_id, day = key
+            rows.append({"category_id": category_id, "day": day, "posts": posts[key], "flagged": flagged[key]})
+    if not rows:
+        return
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(models.PostStat).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[models.PostStat.category_id, models.PostStat.day],
+        set_={
+            "posts": models.PostStat.posts + statement.excluded.posts,
+            "flagged": models.PostStat.flagged + statement.excluded.flagged,
+        },
+    )
+    await db.execute(statement)
+
+
+async def record_created(db: AsyncSession, posts: Iterable[Tuple[Optional[str], datetime, bool]]) -> None:
+    """Count new posts, given as (category_id, created_at, flagged) tuples."""
+    created: Counter = Counter()
+    flagged: Counter = Counter()
+    for category_id, created_at, is_flagged in posts:
+        key = stat_key(category_id, created_at)
+        created[key] += 1
+        flagged[key] += is_flagged
+    await _increment(db, created, flagged)
+
+
+async def record_flagged(
+    db: AsyncSession, posts: Iterable[Tuple[Optional[str], datetime]], flagged: bool
+) -> None:
+    """Count posts, given as (category_id, created_at), that were just flagged or unflagged."""
+    delta = 1 if flagged else -1
+    changes: Counter = Counter()
+    for category_id, created_at in posts:
+        changes[stat_key(category_id, created_at)] += delta
+    await _increment(db, Counter(), changes)
+
+
+async def category_totals(
+    db: AsyncSession, since: Optional[date] = None, until: Optional[date] = None, per_day: bool = False
+) -> List[Dict[str, Any]]:
+    """Sum the counters per category (and per day if asked) over [since, until)."""
+    columns = [models.PostStat.category_id]
+    if per_day:
+        columns.append(models.PostStat.day)
+    query = (
+        select(
+            *columns,
+            func.sum(models.PostStat.posts).label("posts"),
+            func.sum(models.PostStat.flagged).label("flagged"),
+        )
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+    if since:
+        query = query.where(models.PostStat.day >= since)
+    if until:
+        query = query.where(models.PostStat.day < until)
+    return [
+        {
+            "category_id": row.category_id or None,
+            **({"day": row.day} if per_day else {}),
+            "posts": int(row.posts),
+            "flagged": int(row.flagged),
+        }
+        for row in await db.execute(query)
+    ]
+
+
+async def reconcile(db: AsyncSession, since: Optional[date] = None) -> int:
+    """
+    Rebuild the counters from the posts table (only days >= `since` if given)
+    in one transaction, returning the number of rollup rows written.
+    """
+    if db.bind.dialect.name == "postgresql":
+        # Blocks concurrent increments until the rebuild commits. Writers that
+        # already incremented must commit first (the lock waits for them), so
+        # their posts are in the snapshot; later ones add on top of the rebuild.
+        await db.execute(text("LOCK TABLE post_stats IN EXCLUSIVE MODE"))
+
+    clear = delete(models.PostStat)
+    if db.bind.dialect.name == "postgresql":
+        day = cast(models.Post.created_at, Date)
+    else:
+        day = func.date(models.Post.created_at)  # SQLite has no DATE type to cast to
+    source = (
+        select(
+            func.coalesce(models.Post.category_id, UNCATEGORIZED).label("category_id"),
+            day.label("day"),
+            func.count().label("posts"),
+            func.sum(case((models.Post.flagged, 1), else_=0)).label("flagged"),
+        )
+        .group_by(func.coalesce(models.Post.category_id, UNCATEGORIZED), day)
+    )
+    if since:
+        clear = clear.where(models.PostStat.day >= since)
+        source = source.where(models.Post.created_at >= datetime.combine(since, datetime.min.time()))
+
+    await db.execute(clear)
+    result = await db.execute(
+        insert(models.PostStat).from_select(["category_id", "day", "posts", "flagged"], source)
+    )
+    return result.rowcount
+
+
+async def main(args: argparse.Namespace) -> None:
+    from src.database import SessionFactory, dispose_engines, init_engines
+
+    init_engines()
+    async with SessionFactory() as db:
+        rows = await reconcile(db, args.since)
+        await db.commit()
+    print(f"Rebuilt {rows} post_stats rows" + (f" from {args.since}" if args.since else ""))
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild = commands.add_parser("reconcile", help="Recompute post_stats from posts")
+    rebuild.add_argument("--since", type=date.fromisoformat, default=None, help="First day to rebuild (YYYY-MM-DD)")
+    asyncio.run(main(parser.parse_args()))
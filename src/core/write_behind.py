@@ -0,0 +1,212 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from src import models
+from src.database import SessionFactory
+from src.exceptions import ServiceUnavailableException
+
+from . import config, stats
+from .cache import feed_cache
+from .events import POST_CREATED, post_events
+from .metrics import WRITE_BEHIND_DEPTH, WRITE_BEHIND_FLUSH_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Attempts per batch before it is split up to find the rows that fail
+MAX_FLUSH_ATTEMPTS = 3
+
+# Marks the end of the queue during shutdown
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    Buffer post inserts in memory and write them in batches.
+
+    `submit` only appends to an asyncio queue, so a request never holds a
+    pooled connection. A background flusher inserts whatever has arrived
+    every `flush_interval` seconds or as soon as `batch_size` rows are waiting.
+    Once `max_depth` rows are pending, `submit` raises a 503 instead of
+    buffering without bound. `stop` drains the queue before returning.
+
+    A batch that keeps failing is split in halves down to single rows, so
+    one bad row (e.g. with no partition for its `created_at`) is dropped
+    without taking the rest of its batch with it. If the flusher dies it
+    is restarted; `submit` refuses posts while it is not running.
+    """
+
+    def __init__(self, max_depth: int, batch_size: int, flush_interval: float):
+        self.max_depth = max_depth
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch_full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stop_seen = False
+        self.flushed = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, row: Dict[str, Any]):
+        if self._task is None or self._task.done() or self._closing:
+            raise ServiceUnavailableException(detail="Post queue is not accepting writes. Try again shortly.")
+        if self._queue.qsize() >= self.max_depth:
+            self.rejected += 1
+            raise ServiceUnavailableException(detail="Too many pending posts. Try again shortly.")
+        self._queue.put_nowait(row)
+        WRITE_BEHIND_DEPTH.set(self._queue.qsize())
+        if self._queue.qsize() >= self.batch_size:
+            self._batch_full.set()
+
+    def start(self):
+        if self._task is None:
+            self._closing = self._stop_seen = False
+            self._spawn()
+
+    def _spawn(self):
+        self._task = asyncio.create_task(self._run())
+        self._task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: asyncio.Task):
+        if task is not self._task or task.cancelled() or task.exception() is None:
+            return
+        # Rows still queued would otherwise never be written
+        self.restarts += 1
+        logger.error("Write-behind flusher died, restarting it: %r", task.exception())
+        if self._stop_seen:
+            # The dead flusher had already taken the stop marker
+            self._stop_seen = False
+            self._queue.put_nowait(_STOP)
+        self._spawn()
+
+    async def stop(self):
+        """Stop accepting posts and wait until everything already queued is written."""
+        if self._task is None:
+            return
+        self._closing = True
+        # Queued behind every accepted row, so the flusher drains them all first
+        self._queue.put_nowait(_STOP)
+        self._batch_full.set()
+        while True:
+            task = self._task
+            try:
+                await task
+            except Exception:
+                pass  # Logged by _on_done, which has started a new flusher
+            if self._task is task:
+                break
+        self._task = None
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        rows = []
+        while len(rows) < limit and not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is _STOP:
+                self._stop_seen = True
+                break
+            rows.append(row)
+        return rows
+
+    async def _run(self):
+        while not self._stop_seen:
+            # Sleep until there is something to write, then give the batch
+            # flush_interval to fill up unless it is already full or stopping
+            row = await self._queue.get()
+            if row is _STOP:
+                break
+            self._batch_full.clear()
+            if self._queue.qsize() + 1 < self.batch_size and not self._closing:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush([row] + self._take(self.batch_size - 1))
+
+    async def _flush(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        WRITE_BEHIND_DEPTH.set(self._queue.qsize())
+        for attempt in range(1, MAX_FLUSH_ATTEMPTS + 1):
+            try:
+                elapsed = await self._write(rows)
+                break
+            except Exception as ex:
+                if attempt == MAX_FLUSH_ATTEMPTS:
+                    logger.warning(
+                        "Write-behind flush of %s posts failed %s times, splitting the batch: %r",
+                        len(rows), attempt, ex,
+                    )
+                    await self._split(rows, ex)
+                    return
+                logger.warning("Write-behind flush failed (attempt %s), retrying: %r", attempt, ex)
+                await asyncio.sleep(attempt)
+        await self._written(rows, elapsed)
+
+    async def _split(self, rows: List[Dict[str, Any]], error: Exception):
+        """Write the halves of a failed batch separately, dropping only rows that fail on their own."""
+        if len(rows) == 1:
+            self.dropped += 1
+            logger.error("Dropping buffered post %s: %r", rows[0]["id"], error)
+            return
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            try:
+                elapsed = await self._write(half)
+            except Exception as ex:
+                await self._split(half, ex)
+                continue
+            await self._written(half, elapsed)
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> float:
+        started = time.perf_counter()
+        async with SessionFactory() as db:
+            await db.execute(insert(models.Post), rows)
+            await stats.record_created(
+                db, [(row["category_id"], row["created_at"], row["flagged"]) for row in rows]
+            )
+            await db.commit()
+        return time.perf_counter() - started
+
+    async def _written(self, rows: List[Dict[str, Any]], elapsed: float):
+        WRITE_BEHIND_FLUSH_DURATION.observe(elapsed)
+        self.flushed += len(rows)
+        self.last_flush_ms = elapsed * 1000
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+        for category_id in {row["category_id"] for row in rows}:
+            await feed_cache.invalidate(category_id)
+        await post_events.publish(POST_CREATED, *rows)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": config.WRITE_BEHIND_ENABLED,
+            "running": self._task is not None and not self._task.done(),
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+        }
+
+
+write_behind = WriteBehindQueue(
+    max_depth=config.WRITE_BEHIND_MAX_QUEUE,
+    batch_size=config.WRITE_BEHIND_BATCH_SIZE,
+    flush_interval=config.WRITE_BEHIND_FLUSH_MS / 1000,
+)
@@ -1,6 +1,12 @@
+from fastapi import Request, Response
+
 # Import the SessionFactory we created in database.py
 # The dot (.) means "from the current package"
-from .database import SessionFactory
+from .core import config
+from .database import SessionFactory, open_read_session
+
+# Cookie that pins a client's reads to the primary right after it writes
+READ_PRIMARY_COOKIE = "read_primary"
 
 # This is a dependency function that FastAPI will use to inject database sessions
 # into your route handlers. It's an async generator function.
@@ -31,4 +37,35 @@ async def get_db():
         # After the route is done, make sure to close the session
         # This happens even if there's an error in the route
         # The 'finally' block ensures we don't leak database connections
-        await db.close()
\ No newline at end of file
+        await db.close()
+
+
+async def get_read_db(request: Request):
+    """
+    Like `get_db`, but for read-only endpoints: the session is opened on a
+    read replica when one is configured and healthy, otherwise on the primary.
+
+    Clients that wrote within the last READ_YOUR_WRITES_SECONDS (see
+    `stick_to_primary`) keep reading from the primary, so they always see
+    their own posts even while replicas lag behind.
+    """
+    db = await open_read_session(use_primary=READ_PRIMARY_COOKIE in request.cookies)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def stick_to_primary(response: Response) -> Response:
+    """
+    Mark the client that receives `response` as having just written, so its
+    reads are served by the primary for the read-your-writes window.
+    """
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        "1",
+        max_age=config.READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax",
+    )
+    return response
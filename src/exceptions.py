@@ -116,3 +116,20 @@ class InternalServerErrorException(HTTPException):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,  # HTTP 500
             detail=detail if detail else "Internal server error",
         )
+
+
+class ServiceUnavailableException(HTTPException):
+    """
+    503 Service Unavailable Exception
+    Used when the server is temporarily overloaded and the client should retry.
+
+    Example usage:
+        if queue.full():
+            raise ServiceUnavailableException("Too many pending writes", retry_after=1)
+    """
+    def __init__(self, detail: Any = None, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,  # HTTP 503
+            detail=detail if detail else "Service temporarily unavailable. Try again later.",
+            headers={"Retry-After": str(retry_after)},  # Seconds the client should wait
+        )
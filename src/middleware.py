@@ -0,0 +1,246 @@
+import cProfile
+import logging
+import os
+import pstats
+import time
+
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core import config
+from src.core.admission import EXEMPT, admission, rate_limiter, retry_after
+from src.core.metrics import RequestStats, current_request, observe_request
+from src.utils import compression
+from src.utils.custom_utils import api_response
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionMiddleware:
+    """
+    Shed requests the server cannot serve in time, and rate limit clients.
+
+    The controller (src/core/admission.py) turns requests away with an
+    immediate 503 once too many are in flight or pool checkouts are waiting
+    too long, low-priority ones first. With RATE_LIMIT_ENABLED, a client
+    that has used up its token bucket gets a 429. Both carry Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, controller=admission, limiter=rate_limiter):
+        self.app = app
+        self.controller = controller
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        priority = self.controller.priority(scope)
+        if priority == EXEMPT:
+            return await self.app(scope, receive, send)
+
+        if self.limiter is not None:
+            client = scope.get("client")
+            wait = await self.limiter.acquire(client[0] if client else "unknown")
+            if wait:
+                response = api_response(
+                    status_code=429,
+                    response_message="Rate limit exceeded.",
+                    customer_message="Too many requests, please slow down.",
+                )
+                response.headers["Retry-After"] = str(retry_after(wait))
+                return await response(scope, receive, send)
+
+        if not self.controller.try_admit(priority):
+            response = api_response(
+                status_code=503,
+                response_message=f"Server overloaded, {priority}-priority request shed.",
+                customer_message="The service is busy, please retry shortly.",
+            )
+            response.headers["Retry-After"] = str(self.controller.retry_after)
+            return await response(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+
+class TimingMiddleware:
+    """
+    Record handler time, SQL statement count and SQL time for every request.
+
+    The numbers are returned in a `Server-Timing` header and fed into the
+    Prometheus histograms served at /metrics. When PROFILING_ENABLED is set,
+    sending `X-Profile: 1` also writes a cProfile report for that request to
+    PROFILE_DIR.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f"app;dur={stats.elapsed * 1000:.2f}, "
+                    f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries"',
+                )
+            await send(message)
+
+        profiler = self._profiler(scope)
+        try:
+            if profiler is None:
+                await self.app(scope, receive, send_with_timing)
+            else:
+                profiler.enable()
+                try:
+                    await self.app(scope, receive, send_with_timing)
+                finally:
+                    profiler.disable()
+                    self._dump_profile(scope, profiler)
+        finally:
+            current_request.reset(token)
+            route = scope.get("route")
+            observe_request(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+                stats,
+            )
+
+    @staticmethod
+    def _profiler(scope: Scope):
+        if not config.PROFILING_ENABLED:
+            return None
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and value == b"1":
+                return cProfile.Profile()
+        return None
+
+    @staticmethod
+    def _dump_profile(scope: Scope, profiler: cProfile.Profile):
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        path = os.path.join(
+            config.PROFILE_DIR,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}{scope['path'].replace('/', '_')}.prof",
+        )
+        pstats.Stats(profiler).dump_stats(path)
+        logger.info("Wrote request profile to %s", path)
+
+
+# Media types worth compressing. Server-Sent Events are left alone: every
+# event must reach the client immediately, and per-event flushes would undo
+# most of the gain.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/xml", "application/javascript")
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with the best encoding the client accepts
+    (COMPRESSION_ALGORITHMS, e.g. zstd, br, gzip).
+
+    Bodies are buffered until COMPRESSION_MIN_BYTES have been seen; smaller
+    responses go out untouched. Streaming responses are compressed chunk by
+    chunk, with a flush after each chunk so the client is never kept waiting.
+    Responses that already carry a Content-Encoding (precompressed payloads
+    such as /categories) are passed through.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = config.COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            return await self.app(scope, receive, send)
+        encoding = compression.negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await CompressedResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class CompressedResponder:
+    """Per-request state for `CompressionMiddleware`."""
+
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start: Optional[Message] = None
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor: Optional[compression.Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    @staticmethod
+    def _compressible(headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith(UNCOMPRESSED_TYPES)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if not self._compressible(headers):
+                self.passthrough = True
+                return await self.send(message)
+            MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+            content_length = headers.get("content-length")
+            if content_length is not None and int(content_length) < self.minimum_size:
+                self.passthrough = True
+                return await self.send(message)
+            self.start = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            return await self.send(message)
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is not None:
+            chunk = self.compressor.compress(body) if more_body else self.compressor.process(body) + self.compressor.finish()
+            return await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+        if self.buffered_size < self.minimum_size:
+            if more_body:
+                return
+            # Ended below the threshold: send it as it came
+            await self.send(self.start)
+            return await self.send({"type": "http.response.body", "body": b"".join(self.buffered)})
+
+        data = b"".join(self.buffered)
+        self.buffered = []
+        headers = MutableHeaders(scope=self.start)
+        headers["Content-Encoding"] = self.encoding
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = compression.compressor(self.encoding)
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": self.compressor.compress(data), "more_body": True})
+        else:
+            data = compression.compress(data, self.encoding)
+            headers["Content-Length"] = str(len(data))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": data})
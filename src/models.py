@@ -1,12 +1,29 @@
 # Standard library imports
 from typing import Optional  # For optional fields
 import uuid  # For generating unique IDs
-from datetime import datetime  # For timestamp fields
+from datetime import date, datetime  # For timestamp and day fields
 
 # SQLAlchemy imports
+from sqlalchemy import Computed, Index, Text  # For generated columns and composite indexes
+from sqlalchemy.dialects.postgresql import TSVECTOR  # Postgres full-text search type
+from sqlalchemy.ext.compiler import compiles  # For dialect-specific DDL
 from sqlalchemy.orm import Mapped, mapped_column  # For modern SQLAlchemy 2.0 style
 from src.database import Base  # Our base class that provides common functionality
-from src.utils.custom_utils import utcnow  # Custom utility for UTC timestamps
+from src.utils.uuid7 import created_at_default, uuid7  # Time-ordered ids and their timestamps
+
+class PostgresComputed(Computed):
+    """
+    A generated column whose expression only Postgres can evaluate. Other
+    dialects (the SQLite fallback) create a plain nullable column instead.
+    """
+
+    inherit_cache = True
+
+
+@compiles(PostgresComputed, "sqlite")
+def _sqlite_computed(element, compiler, **kw):
+    return ""
+
 
 class Post(Base):
     """
@@ -18,16 +35,21 @@ class Post(Base):
     
     # Name of the database table
     __tablename__ = "posts"
+
+    # The table is range-partitioned by month on created_at (see
+    # src/core/partitions.py). Postgres requires the partition key in the
+    # primary key, so it is (id, created_at), as in the migrations.
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
     
     # Primary key field using UUID
     # - Mapped[uuid.UUID]: Indicates this field will contain a UUID
-    # - primary_key=True: Makes this the primary key
-    # - index=True: Creates a database index for faster lookups
-    # - default=uuid.uuid4: Automatically generates a new UUID for new posts
+    # - primary_key=True: Leading primary key column (the key's index also
+    #   serves lookups by id, so there is no separate index on id)
+    # - default=uuid7: Time-ordered UUIDs, so new rows are appended to the
+    #   end of the primary key index instead of scattered across it
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True, 
-        index=True, 
-        default=uuid.uuid4
+        default=uuid7
     )
     
     # The main content of the post
@@ -42,8 +64,10 @@ class Post(Base):
     
     # Timestamp when the post was created
     # - Mapped[datetime]: Contains a timestamp
-    # - default=utcnow(): Automatically set to current UTC time when created
-    created_at: Mapped[datetime] = mapped_column(default=utcnow())
+    # - primary_key=True: Second primary key column, required by partitioning
+    # - default=created_at_default: The UTC time embedded in the post's id,
+    #   so posts sort the same by created_at as by id
+    created_at: Mapped[datetime] = mapped_column(primary_key=True, default=created_at_default)
     
     # Flag for moderation purposes
     # - Mapped[bool]: Boolean field
@@ -53,4 +77,69 @@ class Post(Base):
     # Optional reason for flagging
     # - Only used when post is flagged
     # - Can be NULL in database
-    flag_reason: Mapped[Optional[str]] = mapped_column(nullable=True)
\ No newline at end of file
+    flag_reason: Mapped[Optional[str]] = mapped_column(nullable=True)
+
+    # Full-text search document, generated by Postgres from content
+    # - PostgresComputed(..., persisted=True): a STORED generated column, never written by us
+    # - On SQLite it is an unused TEXT column; search there uses an in-memory index
+    # - deferred=True: not loaded with the post unless explicitly requested
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        PostgresComputed("to_tsvector('english', content)", persisted=True),
+        deferred=True,
+    )
+
+
+# Composite indexes backing the keyset-paginated feed
+# - Both match ORDER BY created_at DESC, id DESC so the cursor predicate
+#   (created_at, id) < (:created_at, :id) becomes an index seek, not a scan
+# - The category index serves filtered feeds, the second unfiltered ones
+Index(
+    "ix_posts_category_id_created_at_id",
+    Post.category_id,
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
+Index(
+    "ix_posts_created_at_id",
+    Post.created_at.desc(),
+    Post.id.desc(),
+)
+
+# GIN index backing `search_vector @@ tsquery` matches in post search
+Index(
+    "ix_posts_search_vector",
+    Post.search_vector,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+# Partial index backing the moderation queue (GET /posts/flagged)
+# - Only flagged posts (WHERE flagged) are indexed, so it stays small however large posts grows
+# - Same sort order as the feed indexes, for keyset pagination of the queue
+Index(
+    "ix_posts_flagged_created_at_id",
+    Post.created_at.desc(),
+    Post.id.desc(),
+    postgresql_where=Post.flagged,
+)
+
+
+class PostStat(Base):
+    """
+    Rollup of post counts per category per day, kept up to date in the same
+    transaction as every post write (see src/core/stats.py) so dashboards
+    never need a COUNT(*) over posts.
+    """
+
+    __tablename__ = "post_stats"
+
+    # Category of the counted posts; "" stands for posts without a category,
+    # since primary key columns cannot be NULL
+    category_id: Mapped[str] = mapped_column(primary_key=True)
+
+    # UTC day the counted posts were created on
+    day: Mapped[date] = mapped_column(primary_key=True)
+
+    # Number of posts created, and how many of those are currently flagged
+    posts: Mapped[int] = mapped_column(default=0)
+    flagged: Mapped[int] = mapped_column(default=0)
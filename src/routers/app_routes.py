@@ -1,38 +1,122 @@
-import os
-import json
-from typing import Optional
-from fastapi import APIRouter, Form, Depends
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Form, Depends, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import String, Uuid, case, column, insert, tuple_, update, values
 from sqlalchemy.future import select
-from src.dependencies import get_db
+from src.core import config
+from src.core.cache import feed_cache
+from src.core import stats
+from src.core.categories import CATEGORIES_RETRIEVED, categories
+from src.core.dedup import DUPLICATE_REASON, duplicates
+from src.core.events import POST_CREATED, POST_FLAGGED, POST_UNFLAGGED, feed_hub, post_events
+from src.core.moderation import moderator
+from src.core.write_behind import write_behind
+from src.database import open_read_session
+from src.dependencies import READ_PRIMARY_COOKIE, get_db, get_read_db, stick_to_primary
 from src import models, schemas
-from src.utils.custom_utils import generate_response
-from src.exceptions import BadRequestException, NotFoundException
+from src.utils.custom_utils import api_response, etag_matches, to_naive_utc
+from src.utils.compression import negotiate
+from src.utils.export import stream_csv, stream_ndjson
+from src.utils.serializers import serialize_post
+from src.utils.uuid7 import uuid7, uuid7_time
+from src.utils import search
+from src.utils.pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from src.exceptions import BadRequestException, ConflictException, NotFoundException
 
 POST_CREATED_SUCCESS = "Post created successfully."
+POST_ACCEPTED_SUCCESS = "Post accepted for creation."
 POST_FLAGGED_SUCCESS = "Post flagged successfully."
+POSTS_BULK_CREATED_SUCCESS = "Bulk post creation completed."
+POSTS_BULK_CREATED_FAILED = "No posts were created."
+POSTS_BULK_MODERATED_SUCCESS = "Bulk moderation completed."
+DUPLICATE_REJECTED = "A near-identical post was published recently."
 
 # Initialize router
 router = APIRouter()
 
-# Load categories from JSON
-current_dir = os.path.dirname(os.path.abspath(__file__))
-categories_path = os.path.join(current_dir, "categories.json")
-with open(categories_path, "r") as file:
-    CATEGORIES = json.load(file)
-
 ### --- CATEGORIES --- ###
 
 @router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request, counts: bool = False):
+    """
+    Fetch all categories from the catalog.
+
+    The response is built once per catalog version and compressed once per
+    encoding, header included: its `timestamp` is the catalog's last change
+    and its `requestRefId` is the same for every request until the catalog
+    changes. Clients that send the ETag back in If-None-Match get an empty
+    304 while it is unchanged. With `counts=true` each category also carries
+    its live post and flagged counts (that response is not cached).
     """
-    Fetch all categories from the JSON file.
+    snapshot = categories.snapshot
+    if counts:
+        db = await open_read_session(READ_PRIMARY_COOKIE in request.cookies)
+        try:
+            totals = {row["category_id"]: row for row in await stats.category_totals(db)}
+        finally:
+            await db.close()
+        return api_response(
+            status_code=200,
+            response_message=CATEGORIES_RETRIEVED,
+            customer_message="Successfully loaded categories.",
+            body=[
+                {
+                    **category,
+                    "posts": totals.get(category["id"], {}).get("posts", 0),
+                    "flagged": totals.get(category["id"], {}).get("flagged", 0),
+                }
+                for category in snapshot.categories
+            ],
+        )
+
+    encoding = negotiate(request.headers.get("accept-encoding")) if config.COMPRESSION_ENABLED else None
+    content_encoding, body, etag = snapshot.encoded(encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@router.get("/categories/stats")
+async def get_category_stats(
+    db: AsyncSession = Depends(get_read_db),
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    per_day: bool = False,
+):
     """
-    return generate_response(
+    Post and flagged counts per category, optionally per day, over the UTC
+    days in [since, until). Served from the post_stats rollup, never from a
+    COUNT(*) over posts.
+    """
+    totals = await stats.category_totals(db, since, until, per_day)
+    names = {category["id"]: category["name"] for category in categories.snapshot.categories}
+    body = [{**row, "name": names.get(row["category_id"])} for row in totals]
+    if not per_day:
+        # Catalog categories without posts in the window still get a row
+        seen = {row["category_id"] for row in totals}
+        body += [
+            {"category_id": category_id, "posts": 0, "flagged": 0, "name": name}
+            for category_id, name in names.items()
+            if category_id not in seen
+        ]
+
+    return api_response(
         status_code=200,
-        response_message="Categories retrieved successfully.",
-        customer_message="Successfully loaded categories.",
-        body=CATEGORIES,
+        response_message="Category statistics retrieved successfully.",
+        customer_message="Successfully loaded category statistics.",
+        body=body,
     )
 
 ### --- POSTS --- ###
@@ -44,111 +128,528 @@ async def create_post(
 ):
     """
     Create a new post.
+
+    Posts containing a banned term are flagged straight away, and so are
+    near-duplicates of recent posts (or they are rejected with a 409, see
+    DEDUP_ACTION). With WRITE_BEHIND_ENABLED the post is queued for a
+    batched insert and a 202 with its id is returned straight away.
     """
     # Validate category if provided
-    if post.category_id:
-        category = next((cat for cat in CATEGORIES if cat["id"] == post.category_id), None)
-        if not category:
-            raise NotFoundException(detail="Category not found.")
+    if post.category_id and not categories.get(post.category_id):
+        raise NotFoundException(detail="Category not found.")
+    (is_duplicate,), fingerprints = await duplicates.check([post.content])
+    if is_duplicate and duplicates.rejects:
+        raise ConflictException(detail=DUPLICATE_REJECTED)
+    flag_reason = await moderator.flag_reason(post.content)
+    if is_duplicate:
+        flag_reason = flag_reason or DUPLICATE_REASON
+
+    if config.WRITE_BEHIND_ENABLED:
+        # Generate id and timestamp here, since the row is written later
+        post_id = uuid7()
+        row = {
+            "id": post_id,
+            "content": post.content,
+            "category_id": post.category_id,
+            "created_at": uuid7_time(post_id),
+            "flagged": flag_reason is not None,
+            "flag_reason": flag_reason,
+        }
+        write_behind.submit(row)
+        await duplicates.remember(fingerprints)
+        response = api_response(
+            status_code=202,
+            response_message=POST_ACCEPTED_SUCCESS,
+            customer_message="Post received and will appear shortly.",
+            body=serialize_post(SimpleNamespace(**row)),
+        )
+        return stick_to_primary(response)
 
-    # Save the post to the database
-    new_post = models.Post(
-        content=post.content,
-        category_id=post.category_id,
+    # Save the post to the database, reading generated columns back via RETURNING
+    result = await db.execute(
+        insert(models.Post)
+        .values(
+            content=post.content,
+            category_id=post.category_id,
+            flagged=flag_reason is not None,
+            flag_reason=flag_reason,
+        )
+        .returning(models.Post)
     )
-    db.add(new_post)
+    new_post = result.scalars().one()
+    await stats.record_created(db, [(new_post.category_id, new_post.created_at, new_post.flagged)])
     await db.commit()
-    await db.refresh(new_post)
+    # Only posts that were written count as seen, so a failed write can be retried
+    await duplicates.remember(fingerprints)
+    await feed_cache.invalidate(new_post.category_id)
+    await post_events.publish(POST_CREATED, serialize_post(new_post))
 
-    # Construct and return the response
-    return generate_response(
+    # Construct and return the response; the HTTP status stays 200, which
+    # existing clients check for, while the envelope reports 201
+    response = api_response(
         status_code=201,
         response_message=POST_CREATED_SUCCESS,
         customer_message="Post created successfully.",
+        body=serialize_post(new_post),
+        http_status_code=200,
+    )
+    return stick_to_primary(response)
+
+@router.post("/posts/bulk")
+async def create_posts_bulk(
+    posts: List[schemas.PostCreate],
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create many posts in one request.
+
+    Categories are validated in a single pass and valid posts are written with
+    chunked multi-row INSERT ... RETURNING statements in one transaction.
+    Invalid posts, and near-duplicates when DEDUP_ACTION=reject, are
+    reported per item and do not block the rest. Content is scanned for
+    banned terms off the event loop.
+    """
+    if len(posts) > config.BULK_MAX_POSTS:
+        raise BadRequestException(
+            detail=f"A bulk request may contain at most {config.BULK_MAX_POSTS} posts."
+        )
+
+    known_categories = categories.snapshot.by_id
+    results: List[Optional[dict]] = [None] * len(posts)
+    rows = []
+    row_indexes = []
+    for index, post in enumerate(posts):
+        if post.category_id and post.category_id not in known_categories:
+            results[index] = {"index": index, "status": "failed", "error": "Category not found."}
+            continue
+        rows.append({
+            "id": uuid7(),
+            "content": post.content,
+            "category_id": post.category_id,
+        })
+        row_indexes.append(index)
+    is_duplicate, fingerprints = await duplicates.check([row["content"] for row in rows])
+    if duplicates.rejects:
+        for index in [index for index, duplicate in zip(row_indexes, is_duplicate) if duplicate]:
+            results[index] = {"index": index, "status": "failed", "error": DUPLICATE_REJECTED}
+        kept = [position for position, duplicate in enumerate(is_duplicate) if not duplicate]
+        rows = [rows[position] for position in kept]
+        row_indexes = [row_indexes[position] for position in kept]
+        fingerprints = [fingerprints[position] for position in kept]
+        is_duplicate = [False] * len(rows)
+    reasons = await moderator.scan([row["content"] for row in rows])
+    for row, reason, duplicate in zip(rows, reasons, is_duplicate):
+        row["flag_reason"] = reason or (DUPLICATE_REASON if duplicate else None)
+        row["flagged"] = row["flag_reason"] is not None
+
+    chunk_size = config.BULK_INSERT_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        result = await db.execute(
+            insert(models.Post).returning(
+                models.Post.id, models.Post.created_at, sort_by_parameter_order=True
+            ),
+            chunk,
+        )
+        for row, index, created in zip(chunk, row_indexes[start:start + chunk_size], result.all()):
+            results[index] = {
+                "index": index,
+                "status": "created",
+                "id": created.id,
+                "created_at": created.created_at,
+                "flagged": row["flagged"],
+            }
+    await stats.record_created(
+        db, [(row["category_id"], results[index]["created_at"], row["flagged"]) for row, index in zip(rows, row_indexes)]
+    )
+    await db.commit()
+    await duplicates.remember(fingerprints)
+
+    for category_id in {row["category_id"] for row in rows}:
+        await feed_cache.invalidate(category_id)
+    await post_events.publish(
+        POST_CREATED,
+        *(
+            {**row, "created_at": results[index]["created_at"]}
+            for row, index in zip(rows, row_indexes)
+        ),
+    )
+
+    response = api_response(
+        status_code=201 if rows else 400,
+        response_message=POSTS_BULK_CREATED_SUCCESS if rows else POSTS_BULK_CREATED_FAILED,
+        customer_message=f"{len(rows)} of {len(posts)} posts created.",
         body={
-            "id": str(new_post.id),
-            "content": new_post.content,
-            "category_id": new_post.category_id,
-            "created_at": new_post.created_at.isoformat(),
+            "created": len(rows),
+            "failed": len(posts) - len(rows),
+            "results": results,
         },
     )
+    return stick_to_primary(response)
 
 @router.get("/posts")
 async def get_posts(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    category_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Fetch posts, optionally filtered by category and creation time window.
+
+    Pass the `nextCursor` from a previous page as `cursor` to seek straight to
+    the next page. `offset` is still accepted for older clients but gets slower
+    the deeper it pages. `since`/`until` let Postgres skip monthly partitions
+    outside the window.
+
+    Identical concurrent requests share one cache lookup and at most one
+    query, and a database session is only opened when a query actually runs.
+    """
+    if cursor and offset:
+        raise BadRequestException(detail="Use either cursor or offset, not both.")
+    since, until = to_naive_utc(since), to_naive_utc(until)
+    cursor_values = decode_cursor(cursor) if cursor else None
+
+    async def query_page() -> dict:
+        # Fetch one extra row to know whether another page exists
+        query = (
+            select(models.Post)
+            .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+            .limit(limit + 1)
+        )
+
+        if category_id:
+            query = query.where(models.Post.category_id == category_id)
+
+        if since:
+            query = query.where(models.Post.created_at >= since)
+        if until:
+            query = query.where(models.Post.created_at < until)
+
+        if cursor_values:
+            cursor_created_at, cursor_id = cursor_values
+            query = query.where(
+                tuple_(models.Post.created_at, models.Post.id) < tuple_(cursor_created_at, cursor_id),
+                # Redundant with the row comparison, but lets the planner prune
+                # partitions newer than the cursor
+                models.Post.created_at <= cursor_created_at,
+            )
+        elif offset:
+            query = query.offset(offset)
+
+        db = await open_read_session(use_primary)
+        try:
+            result = await db.execute(query)
+            posts = result.scalars().all()
+        finally:
+            await db.close()
+
+        next_cursor = None
+        if len(posts) > limit:
+            posts = posts[:limit]
+            next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+        return {
+            "body": [serialize_post(post) for post in posts],
+            "pagination": {"limit": limit, "nextCursor": next_cursor},
+        }
+
+    # Clients that just wrote bypass the cache: it may hold a page filled from
+    # a replica that has not caught up with their write yet
+    use_primary = READ_PRIMARY_COOKIE in request.cookies
+    if use_primary:
+        page = await query_page()
+    else:
+        cache_key = await feed_cache.feed_key(category_id, limit, offset, cursor, since, until)
+        page = await feed_cache.load(cache_key, query_page)
+
+    # Format the response
+    return api_response(
+        status_code=200,
+        response_message="Posts retrieved successfully.",
+        customer_message="Successfully loaded posts.",
+        body=page["body"],
+        pagination=page["pagination"],
+    )
+
+@router.get("/posts/flagged")
+async def get_flagged_posts(
+    db: AsyncSession = Depends(get_read_db),
     category_id: Optional[str] = None,
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
 ):
     """
-    Fetch posts, optionally filtered by category.
+    Moderation queue: flagged posts, newest first, served from a partial
+    index that only covers flagged rows. Page with `nextCursor` as in GET /posts.
     """
     query = (
         select(models.Post)
-        .order_by(models.Post.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+        # Same predicate as the partial index, so the planner can use it
+        .where(models.Post.flagged)
+        .order_by(models.Post.created_at.desc(), models.Post.id.desc())
+        .limit(limit + 1)
     )
-    
     if category_id:
         query = query.where(models.Post.category_id == category_id)
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(models.Post.created_at, models.Post.id) < tuple_(cursor_created_at, cursor_id),
+            models.Post.created_at <= cursor_created_at,
+        )
 
-    result = await db.execute(query)
-    posts = result.scalars().all()
+    posts = (await db.execute(query)).scalars().all()
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
 
-    # Format the response
-    return generate_response(
+    return api_response(
+        status_code=200,
+        response_message="Flagged posts retrieved successfully.",
+        customer_message="Successfully loaded flagged posts.",
+        body=[serialize_post(post) for post in posts],
+        pagination={"limit": limit, "nextCursor": next_cursor},
+    )
+
+@router.get("/posts/search")
+async def search_posts(
+    q: str = Query(..., min_length=1, max_length=200),
+    db: AsyncSession = Depends(get_read_db),
+    category_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=config.PAGE_MAX_LIMIT),
+    cursor: Optional[str] = None,
+):
+    """
+    Search post content by keyword, best matches first, with highlighted snippets.
+    """
+    results = await search.search_posts(
+        db,
+        q,
+        category_id=category_id,
+        limit=limit + 1,
+        cursor=decode_search_cursor(cursor) if cursor else None,
+    )
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        last_post, last_rank, _ = results[-1]
+        next_cursor = encode_search_cursor(last_rank, last_post.created_at, last_post.id)
+
+    return api_response(
         status_code=200,
         response_message="Posts retrieved successfully.",
-        customer_message="Successfully loaded posts.",
+        customer_message="Successfully searched posts.",
         body=[
-            {
-                "id": str(post.id),
-                "content": post.content,
-                "category_id": post.category_id,
-                "created_at": post.created_at.isoformat(),
-                "flagged": post.flagged,
-                "flag_reason": post.flag_reason,
-            }
-            for post in posts
+            {**serialize_post(post), "rank": rank, "snippet": snippet}
+            for post, rank, snippet in results
         ],
+        pagination={"limit": limit, "nextCursor": next_cursor},
+    )
+
+@router.get("/posts/export")
+async def export_posts(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    category_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+):
+    """
+    Stream every post (optionally filtered by category and creation time) as
+    NDJSON or CSV. Rows are read through a server-side cursor, so memory use
+    does not grow with the size of the table.
+    """
+    since = to_naive_utc(since)
+    use_primary = READ_PRIMARY_COOKIE in request.cookies
+    if format == "csv":
+        return StreamingResponse(
+            stream_csv(category_id, since, use_primary),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="posts.csv"'},
+        )
+    return StreamingResponse(
+        stream_ndjson(category_id, since, use_primary),
+        media_type="application/x-ndjson",
+    )
+
+@router.get("/posts/stream")
+async def stream_posts(category_id: Optional[str] = None):
+    """
+    Push newly created and flagged posts as Server-Sent Events.
+
+    Clients that fall too far behind are disconnected and should reconnect;
+    a comment line is sent every STREAM_HEARTBEAT_SECONDS to keep idle
+    connections open.
+    """
+    async def events():
+        subscriber = feed_hub.subscribe(category_id)
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                event = await subscriber.queue.get()
+                if event is None:
+                    break
+                yield event.sse
+        finally:
+            feed_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+@router.websocket("/posts/stream")
+async def stream_posts_ws(websocket: WebSocket, category_id: Optional[str] = None):
+    """
+    Push newly created and flagged posts over a WebSocket, one JSON message per event.
+    """
+    await websocket.accept()
+    subscriber = feed_hub.subscribe(category_id)
+    try:
+        while True:
+            event = await subscriber.queue.get()
+            if event is None:
+                # Too slow to keep up: ask the client to reconnect
+                await websocket.close(code=1013)
+                break
+            await websocket.send_text(event.text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        feed_hub.unsubscribe(subscriber)
+
+@router.post("/posts/flag/bulk")
+async def flag_posts_bulk(
+    moderation: schemas.PostBulkFlagRequest,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Flag or unflag many posts in one transaction.
+
+    Posts listed in `items` are updated with a single
+    UPDATE ... FROM (VALUES ...) RETURNING; ids it did not touch are then
+    reported as already in the requested state or not found. A `filter`
+    updates up to BULK_MAX_POSTS matching posts with one UPDATE.
+    """
+    flag = moderation.action == "flag"
+    reasons = {}
+    if moderation.items is not None:
+        if len(moderation.items) > config.BULK_MAX_POSTS:
+            raise BadRequestException(
+                detail=f"A bulk request may contain at most {config.BULK_MAX_POSTS} posts."
+            )
+        # Keyed by id, so a post listed twice is updated once (last reason wins)
+        reasons = {item.id: item.reason if flag else None for item in moderation.items}
+        if db.bind.dialect.name == "postgresql":
+            targets = values(
+                column("id", Uuid), column("reason", String), name="targets"
+            ).data(list(reasons.items()))
+            statement = (
+                update(models.Post)
+                .where(models.Post.id == targets.c.id, models.Post.flagged.is_(not flag))
+                .values(flagged=flag, flag_reason=targets.c.reason)
+            )
+        else:
+            # SQLite cannot name the columns of a VALUES list; map ids to reasons with CASE
+            statement = (
+                update(models.Post)
+                .where(models.Post.id.in_(reasons), models.Post.flagged.is_(not flag))
+                .values(flagged=flag, flag_reason=case(reasons, value=models.Post.id) if flag else None)
+            )
+    else:
+        criteria = moderation.filter
+        candidates = (
+            select(models.Post.id)
+            .where(models.Post.flagged.is_(not flag))
+            .limit(config.BULK_MAX_POSTS)
+        )
+        if criteria.category_id:
+            candidates = candidates.where(models.Post.category_id == criteria.category_id)
+        if criteria.q:
+            candidates = candidates.where(await search.match_condition(db, criteria.q, criteria.category_id))
+        # The state check is repeated outside the subquery: under READ COMMITTED a
+        # candidate flagged concurrently would otherwise be updated and counted twice
+        statement = (
+            update(models.Post)
+            .where(models.Post.id.in_(candidates), models.Post.flagged.is_(not flag))
+            .values(flagged=flag, flag_reason=criteria.reason if flag else None)
+        )
+
+    result = await db.execute(
+        statement.returning(models.Post).execution_options(synchronize_session=False)
+    )
+    updated = result.scalars().all()
+
+    # Tell ids that were already in the requested state apart from unknown ones
+    unchanged, not_found = [], []
+    missing = set(reasons) - {post.id for post in updated}
+    if missing:
+        existing = set((await db.execute(
+            select(models.Post.id).where(models.Post.id.in_(missing))
+        )).scalars())
+        unchanged = [post_id for post_id in reasons if post_id in existing and post_id in missing]
+        not_found = [post_id for post_id in reasons if post_id not in existing and post_id in missing]
+
+    await stats.record_flagged(db, [(post.category_id, post.created_at) for post in updated], flagged=flag)
+    await db.commit()
+    for category_id in {post.category_id for post in updated}:
+        await feed_cache.invalidate(category_id)
+    body = [serialize_post(post) for post in updated]
+    await post_events.publish(POST_FLAGGED if flag else POST_UNFLAGGED, *body)
+
+    response = api_response(
+        status_code=200,
+        response_message=POSTS_BULK_MODERATED_SUCCESS,
+        customer_message=f"{len(updated)} posts {moderation.action}ged.",
+        body={
+            "action": moderation.action,
+            "updated": body,
+            "already_flagged" if flag else "already_unflagged": unchanged,
+            "not_found": not_found,
+        },
+    )
+    return stick_to_primary(response)
+
 @router.post("/posts/{post_id}/flag")
 async def flag_post(
-    post_id: str,
+    post_id: uuid.UUID,
     flag_data: schemas.PostFlagRequest,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Flag a post for moderation.
     """
-    query = await db.execute(
-        select(models.Post).where(models.Post.id == post_id)
+    # Flag atomically: only one of several concurrent requests can match NOT flagged
+    result = await db.execute(
+        update(models.Post)
+        .where(models.Post.id == post_id, models.Post.flagged.is_(False))
+        .values(flagged=True, flag_reason=flag_data.reason)
+        .returning(models.Post)
+        .execution_options(synchronize_session=False)
     )
-    post = query.scalars().first()
+    post = result.scalars().first()
 
     if not post:
-        raise NotFoundException(detail="Post not found.")
-
-    if post.flagged:
+        # Nothing matched: tell a missing post apart from an already flagged one
+        if not await models.Post.find_by_id(db, post_id):
+            raise NotFoundException(detail="Post not found.")
         raise BadRequestException(detail="Post is already flagged.")
 
-    post.flagged = True
-    post.flag_reason = flag_data.reason
+    await stats.record_flagged(db, [(post.category_id, post.created_at)], flagged=True)
     await db.commit()
-    await db.refresh(post)
+    await feed_cache.invalidate(post.category_id)
+    await post_events.publish(POST_FLAGGED, serialize_post(post))
 
-    return generate_response(
+    response = api_response(
         status_code=200,
         response_message=POST_FLAGGED_SUCCESS,
         customer_message="The post has been flagged for moderation.",
-        body={
-            "id": str(post.id),
-            "content": post.content,
-            "category_id": post.category_id,
-            "created_at": post.created_at.isoformat(),
-            "flagged": post.flagged,
-            "flag_reason": post.flag_reason,
-        },
-    )
\ No newline at end of file
+        body=serialize_post(post),
+    )
+    return stick_to_primary(response)
\ No newline at end of file
@@ -0,0 +1,126 @@
+from fastapi import APIRouter, Response
+from src.core.admission import admission, rate_limiter
+from src.core.cache import feed_cache
+from src.core.dedup import duplicates
+from src.core.events import feed_hub
+from src.core.metrics import METRICS_CONTENT_TYPE, render_metrics
+from src.core.write_behind import write_behind
+from src.database import pool_status, pool_warmup
+from src.utils.custom_utils import api_response
+
+# Initialize router
+router = APIRouter()
+
+### --- READINESS --- ###
+
+@router.get("/health/ready")
+async def get_readiness():
+    """
+    Readiness probe: 200 once this worker's connection pool holds its
+    DB_POOL_WARMUP_CONNECTIONS pre-opened connections, 503 until then.
+    """
+    ready = pool_warmup.ready
+    return api_response(
+        status_code=200 if ready else 503,
+        response_message="Service is ready." if ready else "Service is warming up.",
+        customer_message="Service is ready." if ready else "Service is starting, please retry shortly.",
+        body=pool_warmup.status(),
+    )
+
+### --- DATABASE POOL --- ###
+
+@router.get("/health/pool")
+async def get_pool_status():
+    """
+    Report connection pool usage: checked-out, idle and overflow connections,
+    plus how long requests have waited for a connection.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Pool status retrieved successfully.",
+        customer_message="Successfully loaded pool status.",
+        body=pool_status(),
+    )
+
+### --- FEED CACHE --- ###
+
+@router.get("/health/feed-cache")
+async def get_feed_cache_status():
+    """
+    Report GET /posts outcomes: cache hits, misses (queries run) and requests
+    coalesced onto an identical in-flight query.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Feed cache status retrieved successfully.",
+        customer_message="Successfully loaded feed cache status.",
+        body=feed_cache.status(),
+    )
+
+### --- WRITE-BEHIND QUEUE --- ###
+
+@router.get("/health/write-behind")
+async def get_write_behind_status():
+    """
+    Report the buffered post queue: depth, flush latency and dropped/rejected posts.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Write-behind status retrieved successfully.",
+        customer_message="Successfully loaded write-behind status.",
+        body=write_behind.status(),
+    )
+
+### --- POST STREAM --- ###
+
+@router.get("/health/stream")
+async def get_stream_status():
+    """
+    Report /posts/stream subscribers, events published and slow subscribers dropped.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Stream status retrieved successfully.",
+        customer_message="Successfully loaded stream status.",
+        body=feed_hub.status(),
+    )
+
+### --- NEAR-DUPLICATES --- ###
+
+@router.get("/health/dedup")
+async def get_dedup_status():
+    """
+    Report near-duplicate detection: posts checked, duplicates found and index size.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Duplicate detection status retrieved successfully.",
+        customer_message="Successfully loaded duplicate detection status.",
+        body=duplicates.status(),
+    )
+
+### --- ADMISSION CONTROL --- ###
+
+@router.get("/health/admission")
+async def get_admission_status():
+    """
+    Report requests in flight, recent pool wait, requests shed by priority and rate limiter state.
+    """
+    return api_response(
+        status_code=200,
+        response_message="Admission control status retrieved successfully.",
+        customer_message="Successfully loaded admission control status.",
+        body={
+            **admission.status(),
+            "rate_limit": rate_limiter.status() if rate_limiter is not None else {"enabled": False},
+        },
+    )
+
+### --- METRICS --- ###
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Prometheus metrics: per-route request latency, SQL statement counts and SQL time.
+    """
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,7 +1,8 @@
 # Import required types and utilities
-from typing import Optional  # For optional fields
+import uuid  # For post ids in moderation requests
+from typing import List, Literal, Optional  # For optional fields, lists and fixed choices
 from datetime import datetime  # For timestamp handling
-from pydantic import BaseModel, Field  # For data validation and field configuration
+from pydantic import BaseModel, Field, model_validator  # For data validation and field configuration
 
 # Base Post Schema
 # This defines the common fields shared by all post-related schemas
@@ -78,4 +79,56 @@ class PostFlagRequest(BaseModel):
         max_length=255,
         description="Reason for flagging the post",
         example="Inappropriate content"
-    )
\ No newline at end of file
+    )
+
+
+# Schemas for bulk moderation (POST /posts/flag/bulk)
+class PostFlagItem(BaseModel):
+    """One post to flag or unflag, by id"""
+    id: uuid.UUID
+    # Ignored when unflagging
+    reason: Optional[str] = Field(
+        None,
+        max_length=255,
+        description="Reason for flagging the post",
+        example="Inappropriate content"
+    )
+
+
+class PostFlagFilter(BaseModel):
+    """Select posts to flag or unflag by category and/or search query"""
+    category_id: Optional[str] = None
+    q: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=200,
+        description="Search query, same syntax as GET /posts/search",
+    )
+    reason: Optional[str] = Field(None, max_length=255)
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        # Never let an empty filter match every post in the table
+        if not self.category_id and not self.q:
+            raise ValueError("A filter needs a category_id, a q, or both.")
+        return self
+
+
+class PostBulkFlagRequest(BaseModel):
+    """
+    Flag or unflag many posts in one transaction, either listed by id
+    (`items`) or selected by a filter (`filter`) - exactly one of the two.
+    """
+    action: Literal["flag", "unflag"] = "flag"
+    items: Optional[List[PostFlagItem]] = Field(None, min_length=1)
+    filter: Optional[PostFlagFilter] = None
+
+    @model_validator(mode="after")
+    def require_one_form(self):
+        if (self.items is None) == (self.filter is None):
+            raise ValueError("Provide either items or filter.")
+        if self.action == "flag":
+            reasons = [item.reason for item in self.items] if self.items is not None else [self.filter.reason]
+            if not all(reasons):
+                raise ValueError("A reason is required when flagging.")
+        return self
@@ -0,0 +1,63 @@
+"""
+Production launcher: runs WEB_CONCURRENCY uvicorn workers behind one socket.
+
+    python -m src.server
+    python -m src.server --workers 8 --port 8000
+
+Workers use uvloop and httptools when they are installed (they are on
+Linux via requirements.txt). Each worker imports the app and creates its
+own database engines in the lifespan, so no pooled connection is ever
+shared between processes.
+
+Signals sent to the supervisor process:
+
+    SIGHUP    restart every worker gracefully (picks up new code and .env)
+    SIGTTIN   add a worker
+    SIGTTOU   remove a worker
+    SIGTERM   stop accepting connections, finish in-flight requests, exit
+"""
+import argparse
+import importlib.util
+import logging
+
+import uvicorn
+
+from src.core import config
+
+logger = logging.getLogger(__name__)
+
+
+def installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def run(workers: int, host: str, port: int) -> None:
+    loop = "uvloop" if installed("uvloop") else "asyncio"
+    http = "httptools" if installed("httptools") else "h11"
+    logger.info("Starting %s workers on %s:%s (loop=%s, http=%s)", workers, host, port, loop, http)
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=config.SERVER_BACKLOG,
+        timeout_keep_alive=config.SERVER_KEEP_ALIVE_SECONDS,
+        timeout_graceful_shutdown=config.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        # Take the client address from X-Forwarded-For, but only when the
+        # connection comes from a trusted proxy; anyone else could spoof it
+        proxy_headers=True,
+        forwarded_allow_ips=config.SERVER_FORWARDED_ALLOW_IPS,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=config.WEB_CONCURRENCY)
+    parser.add_argument("--host", default=config.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVER_PORT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    run(args.workers, args.host, args.port)
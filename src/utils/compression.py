@@ -0,0 +1,111 @@
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from src.core import config
+
+# brotli and zstandard are optional: encodings whose module is missing are
+# simply never negotiated
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Compressor:
+    """
+    Incremental compressor for one response body.
+
+    `compress` returns the compressed bytes for a chunk and flushes them, so
+    a streamed response reaches the client chunk by chunk; `finish` ends the
+    stream.
+    """
+
+    def __init__(self, process: Callable[[bytes], bytes], flush: Callable[[], bytes], finish: Callable[[], bytes]):
+        self.process = process
+        self.flush = flush
+        self.finish = finish
+
+    def compress(self, data: bytes) -> bytes:
+        return self.process(data) + self.flush()
+
+
+def _gzip(level: int) -> Compressor:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return Compressor(
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli(level: int) -> Compressor:
+    compressor = brotli.Compressor(quality=level)
+    return Compressor(compressor.process, compressor.flush, compressor.finish)
+
+
+def _zstd(level: int) -> Compressor:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return Compressor(
+        compressor.compress,
+        lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# Content-Encoding token -> compressor factory taking a level
+CODECS: Dict[str, Callable[[int], Compressor]] = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+# Levels used for payloads compressed once and cached (e.g. /categories)
+MAX_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+LEVELS = {
+    "gzip": config.COMPRESSION_GZIP_LEVEL,
+    "br": config.COMPRESSION_BROTLI_LEVEL,
+    "zstd": config.COMPRESSION_ZSTD_LEVEL,
+}
+
+# Server preference order, restricted to the encodings available here
+ENCODINGS: List[str] = [encoding for encoding in config.COMPRESSION_ALGORITHMS if encoding in CODECS]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the preferred server encoding that the Accept-Encoding header allows
+    (q > 0, explicitly or through "*"), or None to send the body as is.
+    """
+    if not accept_encoding or not ENCODINGS:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compressor(encoding: str, level: Optional[int] = None) -> Compressor:
+    return CODECS[encoding](LEVELS[encoding] if level is None else level)
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a complete body in one go."""
+    stream = compressor(encoding, level)
+    return stream.process(data) + stream.finish()
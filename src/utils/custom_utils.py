@@ -1,6 +1,7 @@
-from typing import Any, Callable, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Union
 from sqlalchemy.sql import expression
 import os
+import random
 import tempfile
 import logging
 from fastapi import Depends, HTTPException
@@ -9,7 +10,8 @@ from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.types import DateTime
 from sqlalchemy.orm import DeclarativeMeta
 from datetime import datetime, timezone
-import uuid
+
+from src.utils.serializers import APIResponse
 
 logger = logging.getLogger(__name__)
 
@@ -19,18 +21,25 @@ def generate_response(
     response_message: str,
     customer_message: str,
     body: Union[Dict[str, Any], List[Any], None] = None,
+    pagination: Optional[Dict[str, Any]] = None,
 ):
     """
     Generate a standard response format for API responses.
+
+    `pagination` is only included in the envelope when provided, so
+    non-paginated endpoints keep their existing shape.
     """
 
-    request_ref_id = str(uuid.uuid4().int)[:10]  # Generate a unique 10-digit request reference ID
-    timestamp = datetime.now(timezone.utc).isoformat()
+    request_ref_id = str(random.randrange(10**9, 10**10))  # Unique-enough 10-digit request reference ID
+    timestamp = datetime.now(timezone.utc)  # Encoded by orjson, no isoformat() needed
+
+    # Lazy %-formatting: the body is only stringified when debug logging is on
+    logger.debug(
+        "Generating response: status_code=%s, response_message=%s, customer_message=%s, body=%s",
+        status_code, response_message, customer_message, body,
+    )
 
-    logger.debug(f"Generating response: status_code={status_code}, "
-                 f"response_message={response_message}, customer_message={customer_message}, body={body}")
-    
-    return {
+    response = {
         "header": {
             "requestRefId": request_ref_id,
             "responseCode": status_code,
@@ -40,6 +49,48 @@ def generate_response(
         },
         "body": body,
     }
+    if pagination is not None:
+        response["pagination"] = pagination
+    return response
+
+
+def api_response(
+    status_code: int,
+    response_message: str,
+    customer_message: str,
+    body: Union[Dict[str, Any], List[Any], None] = None,
+    pagination: Optional[Dict[str, Any]] = None,
+    http_status_code: Optional[int] = None,
+) -> APIResponse:
+    """
+    Wrap `generate_response` in an `APIResponse` with a matching HTTP status
+    (or `http_status_code` when given), serialized straight to bytes by orjson.
+    """
+    return APIResponse(
+        generate_response(status_code, response_message, customer_message, body, pagination),
+        status_code=http_status_code or status_code,
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header (which may list several tags, or be "*")
+    against the current ETag.
+    """
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a timezone-aware datetime to naive UTC, matching how timestamps
+    are stored. Naive values are assumed to already be UTC.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class utcnow(expression.FunctionElement):
@@ -1,11 +1,11 @@
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
-from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, Request
 import logging
 
 from src.utils.custom_utils import generate_response
+from src.utils.serializers import APIResponse
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +25,10 @@ def sanitize_errors(errors):
 
 # HTTPException handler
 async def http_exception_handler(request: Request, exc: HTTPException):
-    logger.error(f"HTTPException: {exc.detail}")
-    return JSONResponse(
+    logger.error("HTTPException: %s", exc.detail)
+    return APIResponse(
         status_code=exc.status_code,
+        headers=getattr(exc, "headers", None),  # e.g. Retry-After on 503s
         content=generate_response(
             status_code=exc.status_code,
             response_message=str(exc.detail),
@@ -39,9 +40,9 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 # RequestValidationError handler
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-    logger.error(f"Request Validation Error: {exc.errors()}")
+    logger.error("Request Validation Error: %s", exc.errors())
     sanitized_errors = sanitize_errors(exc.errors())
-    return JSONResponse(
+    return APIResponse(
         status_code=422,
         content=generate_response(
             status_code=422,
@@ -54,9 +55,9 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 
 # Pydantic ValidationError handler
 async def pydantic_validation_error_handler(request: Request, exc: ValidationError):
-    logger.error(f"Pydantic Validation Error: {exc.errors()}")
+    logger.error("Pydantic Validation Error: %s", exc.errors())
     sanitized_errors = sanitize_errors(exc.errors())
-    return JSONResponse(
+    return APIResponse(
         status_code=422,
         content=generate_response(
             status_code=422,
@@ -69,8 +70,8 @@ async def pydantic_validation_error_handler(request: Request, exc: ValidationErr
 
 # SQLAlchemyError handler
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
-    logger.error(f"SQLAlchemyError: {str(exc)}")
-    return JSONResponse(
+    logger.error("SQLAlchemyError: %s", exc)
+    return APIResponse(
         status_code=500,
         content=generate_response(
             status_code=500,
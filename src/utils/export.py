@@ -0,0 +1,65 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+import orjson
+from sqlalchemy import select
+
+from src import models
+from src.core import config
+from src.database import open_read_session
+
+EXPORT_COLUMNS = ("id", "content", "category_id", "created_at", "flagged", "flag_reason")
+
+
+def export_query(category_id: Optional[str], since: Optional[datetime]):
+    columns = [getattr(models.Post, name) for name in EXPORT_COLUMNS]
+    query = select(*columns).order_by(models.Post.created_at, models.Post.id)
+    if category_id:
+        query = query.where(models.Post.category_id == category_id)
+    if since:
+        query = query.where(models.Post.created_at >= since)
+    return query.execution_options(yield_per=config.EXPORT_YIELD_PER)
+
+
+async def stream_rows(category_id: Optional[str], since: Optional[datetime], use_primary: bool):
+    """
+    Yield batches of export rows from a server-side cursor, on a read replica
+    when one is available.
+
+    The generator owns its session: StreamingResponse keeps iterating after
+    the request's dependency-managed sessions have been closed.
+    """
+    async with await open_read_session(use_primary) as db:
+        result = await db.stream(export_query(category_id, since))
+        async for batch in result.partitions():
+            yield batch
+
+
+async def stream_ndjson(
+    category_id: Optional[str], since: Optional[datetime], use_primary: bool = False
+) -> AsyncIterator[bytes]:
+    async for batch in stream_rows(category_id, since, use_primary):
+        yield b"".join(
+            orjson.dumps(dict(zip(EXPORT_COLUMNS, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in batch
+        )
+
+
+async def stream_csv(
+    category_id: Optional[str], since: Optional[datetime], use_primary: bool = False
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for batch in stream_rows(category_id, since, use_primary):
+        writer.writerows(
+            (row.id, row.content, row.category_id, row.created_at.isoformat(), row.flagged, row.flag_reason)
+            for row in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,82 @@
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+def normalize(text: str) -> str:
+    # Casefold so "BANNED", "Banned" and "banned" all match one term
+    return text.casefold()
+
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over a list of banned terms.
+
+    `find` scans a text once, in time linear in its length plus the number
+    of matches, however many terms there are; a loop of per-term regexes
+    rescans the text for every term. Matching is case-insensitive and only
+    whole words count, so the term "ass" does not match "class".
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = sorted({normalize(term.strip()) for term in terms if term.strip()})
+        # State 0 is the root. Per state: outgoing edges, failure link, and
+        # the (length, term index) of every term ending there, including
+        # those reached through failure links.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[int, int], ...]] = [()]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += ((len(term), index),)
+        self._link()
+
+    def _link(self):
+        # Breadth-first, so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, text: str) -> List[str]:
+        """Return the banned terms occurring in `text` as whole words, in order of first occurrence."""
+        goto, fail, output = self._goto, self._fail, self._output
+        text = normalize(text)
+        last = len(text) - 1
+        found: Dict[int, None] = {}
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            if position < last and is_word_char(text[position + 1]):
+                continue
+            for length, index in output[state]:
+                start = position - length + 1
+                if start == 0 or not is_word_char(text[start - 1]):
+                    found.setdefault(index)
+        return [self.terms[index] for index in found]
@@ -0,0 +1,74 @@
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, List, Tuple
+
+import orjson
+
+from src.exceptions import BadRequestException
+from src.utils.uuid7 import uuid7_time
+
+
+def _encode(values: List[Any]) -> str:
+    raw = orjson.dumps(values)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _decode(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return orjson.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(created_at: datetime, post_id: uuid.UUID) -> str:
+    """
+    Encode the (created_at, id) position of the last row on a page into an
+    opaque, URL-safe cursor string.
+
+    Posts with a UUIDv7 id carry their created_at inside the id, so their
+    cursor is the id alone; older posts (random v4 ids) keep both values.
+    """
+    if uuid7_time(post_id) == created_at:
+        return _encode([str(post_id)])
+    return _encode([created_at.isoformat(), str(post_id)])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by `encode_cursor` back into its (created_at, id) pair.
+
+    Raises:
+        BadRequestException: If the cursor is malformed or has been tampered with
+    """
+    try:
+        values = _decode(cursor)
+        if len(values) == 1:
+            post_id = uuid.UUID(values[0])
+            created_at = uuid7_time(post_id)
+            if created_at is None:
+                raise ValueError("Only UUIDv7 cursors can omit created_at")
+            return created_at, post_id
+        created_at, post_id = values
+        return datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (TypeError, ValueError) as ex:
+        raise BadRequestException(detail="Invalid cursor.") from ex
+
+
+def encode_search_cursor(rank: float, created_at: datetime, post_id: uuid.UUID) -> str:
+    """
+    Encode the (rank, created_at, id) position of the last search result on a page.
+    """
+    return _encode([rank, created_at.isoformat(), str(post_id)])
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, datetime, uuid.UUID]:
+    """
+    Decode a cursor produced by `encode_search_cursor`.
+
+    Raises:
+        BadRequestException: If the cursor is malformed or has been tampered with
+    """
+    try:
+        rank, created_at, post_id = _decode(cursor)
+        return float(rank), datetime.fromisoformat(created_at), uuid.UUID(post_id)
+    except (TypeError, ValueError) as ex:
+        raise BadRequestException(detail="Invalid cursor.") from ex
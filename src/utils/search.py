@@ -0,0 +1,147 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src import models
+
+# Mirrors the ts_headline options used on Postgres
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+HEADLINE_OPTIONS = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# (rank, created_at, id) of the last result on the previous page
+SearchCursor = Tuple[float, Any, Any]
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+async def search_postgres(
+    db: AsyncSession,
+    q: str,
+    category_id: Optional[str],
+    limit: int,
+    cursor: Optional[SearchCursor],
+) -> List[Tuple[Any, float, str]]:
+    """
+    Ranked full-text search over the GIN-indexed `search_vector` column.
+    Returns (post, rank, snippet) tuples, best match first.
+    """
+    tsquery = func.websearch_to_tsquery("english", q)
+    rank = func.ts_rank(models.Post.search_vector, tsquery)
+    query = (
+        select(
+            models.Post,
+            rank.label("rank"),
+            func.ts_headline("english", models.Post.content, tsquery, HEADLINE_OPTIONS).label("snippet"),
+        )
+        .where(models.Post.search_vector.op("@@")(tsquery))
+        .order_by(rank.desc(), models.Post.created_at.desc(), models.Post.id.desc())
+        .limit(limit)
+    )
+    if category_id:
+        query = query.where(models.Post.category_id == category_id)
+    if cursor:
+        query = query.where(tuple_(rank, models.Post.created_at, models.Post.id) < tuple_(*cursor))
+
+    result = await db.execute(query)
+    return [(row.Post, row.rank, row.snippet) for row in result]
+
+
+class InvertedIndex:
+    """
+    Pure-Python inverted index used in place of Postgres full-text search when
+    the backend is SQLite (e.g. tests). Scores are TF-IDF and every query term
+    must match, like `websearch_to_tsquery` for plain words.
+    """
+
+    def __init__(self, posts: Iterable[Any]):
+        self.posts: Dict[Any, Any] = {}
+        self.postings: Dict[str, Dict[Any, int]] = defaultdict(dict)
+        for post in posts:
+            self.posts[post.id] = post
+            for term, count in Counter(tokenize(post.content)).items():
+                self.postings[term][post.id] = count
+
+    def search(self, q: str) -> List[Tuple[Any, float]]:
+        terms = set(tokenize(q))
+        if not terms or any(term not in self.postings for term in terms):
+            return []
+        matches = set.intersection(*(set(self.postings[term]) for term in terms))
+        total = len(self.posts)
+        scored = []
+        for post_id in matches:
+            score = sum(
+                self.postings[term][post_id] * math.log(1 + total / len(self.postings[term]))
+                for term in terms
+            )
+            scored.append((self.posts[post_id], score))
+        return scored
+
+
+def highlight(content: str, q: str) -> str:
+    terms = set(tokenize(q))
+    return TOKEN_PATTERN.sub(
+        lambda match: f"{HIGHLIGHT_START}{match.group(0)}{HIGHLIGHT_STOP}"
+        if match.group(0).lower() in terms else match.group(0),
+        content,
+    )
+
+
+async def search_fallback(
+    db: AsyncSession,
+    q: str,
+    category_id: Optional[str],
+    limit: int,
+    cursor: Optional[SearchCursor],
+) -> List[Tuple[Any, float, str]]:
+    """
+    Same contract as `search_postgres`, answered from an `InvertedIndex` built
+    over the candidate posts. Only meant for small SQLite databases.
+    """
+    query = select(models.Post)
+    if category_id:
+        query = query.where(models.Post.category_id == category_id)
+    posts = (await db.execute(query)).scalars().all()
+
+    def sort_key(item):
+        post, score = item
+        return (score, post.created_at, post.id)
+
+    ranked = sorted(InvertedIndex(posts).search(q), key=sort_key, reverse=True)
+    if cursor:
+        ranked = [item for item in ranked if sort_key(item) < tuple(cursor)]
+    return [(post, score, highlight(post.content, q)) for post, score in ranked[:limit]]
+
+
+async def match_condition(db: AsyncSession, q: str, category_id: Optional[str]):
+    """
+    WHERE clause selecting the posts that match `q`, for set-based statements
+    such as bulk moderation. On SQLite the matching ids are resolved up front.
+    """
+    if db.bind.dialect.name == "postgresql":
+        return models.Post.search_vector.op("@@")(func.websearch_to_tsquery("english", q))
+    query = select(models.Post)
+    if category_id:
+        query = query.where(models.Post.category_id == category_id)
+    posts = (await db.execute(query)).scalars().all()
+    return models.Post.id.in_([post.id for post, _ in InvertedIndex(posts).search(q)])
+
+
+async def search_posts(
+    db: AsyncSession,
+    q: str,
+    category_id: Optional[str],
+    limit: int,
+    cursor: Optional[SearchCursor],
+) -> List[Tuple[Any, float, str]]:
+    if db.bind.dialect.name == "postgresql":
+        return await search_postgres(db, q, category_id, limit, cursor)
+    return await search_fallback(db, q, category_id, limit, cursor)
@@ -0,0 +1,35 @@
+from typing import Any, Dict
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+# Options are resolved once at import; UUID and datetime values are encoded
+# natively by orjson, so handlers never call str() or isoformat() per row
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class APIResponse(ORJSONResponse):
+    """
+    ORJSONResponse rendered with the precompiled options above.
+
+    Returning it from a handler skips FastAPI's `jsonable_encoder` pass over
+    the whole body, which otherwise dominates large feed responses.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str, option=ORJSON_OPTIONS)
+
+
+def serialize_post(post) -> Dict[str, Any]:
+    """
+    Map a `Post` (or a row with the same columns) to its response shape,
+    leaving UUID and datetime values for orjson to encode.
+    """
+    return {
+        "id": post.id,
+        "content": post.content,
+        "category_id": post.category_id,
+        "created_at": post.created_at,
+        "flagged": post.flagged,
+        "flag_reason": post.flag_reason,
+    }
@@ -0,0 +1,121 @@
+import hashlib
+import re
+from collections import deque
+from typing import Dict, List, Optional
+
+FINGERPRINT_BITS = 64
+
+_WORD = re.compile(r"\w+")
+
+# Column counts of the fingerprint bits are kept in 16-bit fields of one
+# integer per hash byte: _SPREAD[b] has bit i of b in the low bit of field i,
+# so adding _SPREAD[byte] counts all eight bits of a byte in one operation.
+_FIELD_BITS = 16
+_FIELD_MASK = (1 << _FIELD_BITS) - 1
+_SPREAD = [sum(((byte >> bit) & 1) << (bit * _FIELD_BITS) for bit in range(8)) for byte in range(256)]
+
+
+# Width of the fingerprint slice each index table is keyed on
+KEY_BITS = 16
+
+
+def features(text: str) -> List[str]:
+    # Casefolded words: swapping one word of a short post changes 1/n of
+    # them, where word pairs or character shingles change two to five times
+    # as many and push the fingerprints further apart
+    return _WORD.findall(text.casefold())
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    64-bit SimHash of `text`: near-identical texts get fingerprints that
+    differ in only a few bits. Returns None for text without any words.
+    """
+    tokens = features(text)
+    if not tokens:
+        return None
+    columns = [0] * 8
+    for token in tokens:
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        for position, byte in enumerate(digest):
+            columns[position] += _SPREAD[byte]
+    fingerprint = 0
+    half = len(tokens) / 2
+    for position, column in enumerate(columns):
+        for bit in range(8):
+            if (column >> (bit * _FIELD_BITS)) & _FIELD_MASK > half:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint
+
+
+def distance(first: int, second: int) -> int:
+    return bin(first ^ second).count("1")
+
+
+def table_keys(fingerprint: int, tables: int) -> List[int]:
+    """
+    Index keys of a fingerprint: for each of `tables` tables, the KEY_BITS
+    bits starting at an evenly spaced offset (wrapping around), tagged with
+    the table number. Two fingerprints become candidates if they agree on
+    all bits of any one slice. With 4 tables the slices partition the
+    fingerprint, so every pair within 3 bits is found; more tables overlap
+    and find most pairs a few bits further apart.
+    """
+    keys = []
+    for table in range(tables):
+        offset = FINGERPRINT_BITS * table // tables
+        rotated = (fingerprint >> offset) | (fingerprint << (FINGERPRINT_BITS - offset))
+        keys.append((table << KEY_BITS) | (rotated & ((1 << KEY_BITS) - 1)))
+    return keys
+
+
+class SimHashIndex:
+    """
+    Banded LSH index of recent fingerprints, bounded in time and size.
+
+    Each fingerprint is filed under one key per table (`table_keys`). A
+    lookup only compares against fingerprints sharing one of its keys,
+    about `tables * len(index) / 2**KEY_BITS` of them, instead of the whole
+    index.
+    Entries are kept in insertion order, so those older than `window`
+    seconds, or beyond `max_entries`, are evicted from the front.
+    """
+
+    def __init__(self, max_distance: int, tables: int, window: float, max_entries: int):
+        self.max_distance = max_distance
+        self.tables = tables
+        self.window = window
+        self.max_entries = max_entries
+        self._buckets: Dict[int, List[int]] = {}
+        self._times: deque = deque()
+        self._fingerprints: deque = deque()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _evict(self, now: float):
+        cutoff = now - self.window
+        while self._times and (self._times[0] <= cutoff or len(self._times) > self.max_entries):
+            self._times.popleft()
+            fingerprint = self._fingerprints.popleft()
+            for key in table_keys(fingerprint, self.tables):
+                bucket = self._buckets[key]
+                bucket.remove(fingerprint)
+                if not bucket:
+                    del self._buckets[key]
+
+    def match(self, fingerprint: int, now: float) -> Optional[int]:
+        """Return an indexed fingerprint within `max_distance` bits, or None."""
+        self._evict(now)
+        for key in table_keys(fingerprint, self.tables):
+            for candidate in self._buckets.get(key, ()):
+                if distance(candidate, fingerprint) <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, fingerprint: int, now: float):
+        self._times.append(now)
+        self._fingerprints.append(fingerprint)
+        for key in table_keys(fingerprint, self.tables):
+            self._buckets.setdefault(key, []).append(fingerprint)
+        self._evict(now)
@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+_EPOCH = datetime(1970, 1, 1)
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _initial_counter() -> int:
+    # Random start with the top bit clear, leaving room to count up within a millisecond
+    return int.from_bytes(os.urandom(2), "big") & 0x7FF
+
+
+def uuid7() -> uuid.UUID:
+    """
+    A time-ordered UUID (version 7, RFC 9562): 48 bits of Unix milliseconds,
+    a 12-bit counter, then 62 random bits.
+
+    Ids generated by one process are strictly increasing: the counter orders
+    ids within the same millisecond, and the timestamp never goes backwards
+    even if the clock does. Inserts therefore land at the right edge of the
+    primary key index instead of on random pages.
+    """
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms, _counter = now_ms, _initial_counter()
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Counter exhausted: borrow the next millisecond
+                _last_ms, _counter = _last_ms + 1, _initial_counter()
+        timestamp_ms, counter = _last_ms, _counter
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(int=(timestamp_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | random_bits)
+
+
+def uuid7_time(value: uuid.UUID) -> Optional[datetime]:
+    """The naive UTC time embedded in a version 7 UUID, or None for other versions."""
+    if value.version != 7:
+        return None
+    return _EPOCH + timedelta(milliseconds=value.int >> 80)
+
+
+def created_at_default(context) -> datetime:
+    """
+    Column default for `created_at` on tables keyed by `uuid7` ids: the time
+    embedded in the row's id, so ordering by (created_at, id) and ordering
+    by id agree and a cursor can carry the id alone.
+    """
+    post_id = context.get_current_parameters().get("id")
+    created_at = uuid7_time(post_id) if isinstance(post_id, uuid.UUID) else None
+    return created_at or datetime.now(timezone.utc).replace(tzinfo=None)
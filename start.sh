@@ -2,11 +2,13 @@
 
 # Apply database migrations
 alembic upgrade head
+# Make sure the next few monthly posts partitions exist
+python -m src.core.partitions create --months-ahead 3
 # fastapi run
 # Check the environment and run the appropriate server
 if [ "$ENVIRONMENT" = "production" ]; then
-    # Run the app in production mode
-    fastapi run
+    # Run the app in production mode: one uvicorn worker per CPU (see WEB_CONCURRENCY)
+    exec python -m src.server
 else
     # Run the app in development mode
     fastapi dev
@@ -0,0 +1,68 @@
+"""
+Shared fixtures.
+
+Tests run the app in-process against a throwaway SQLite database per test,
+which exercises the same SQLite fallbacks the app uses without Postgres.
+Settings are read from the environment when `src.core.config` is imported,
+so they are pinned here before anything imports the app.
+"""
+import os
+
+os.environ.update(
+    ENVIRONMENT="test",
+    DATABASE_URL="sqlite+aiosqlite://",  # Replaced per test by the `database` fixture
+    DATABASE_REPLICA_URLS="",
+    REDIS_URL="",
+    FEED_EVENTS_BACKEND="local",
+    MODERATION_TERMS_PATH="",
+    WRITE_BEHIND_ENABLED="False",
+    DEDUP_ENABLED="False",
+    ADMISSION_ENABLED="False",
+    RATE_LIMIT_ENABLED="False",
+)
+
+import httpx
+import pytest
+
+from src import database, models  # models registers the tables with Base.metadata
+from src.core import config
+from src.core.cache import LRUCacheBackend, feed_cache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def sqlite_url(path) -> str:
+    return f"sqlite+aiosqlite:///{path}"
+
+
+@pytest.fixture
+async def database_engine(tmp_path, monkeypatch):
+    """A fresh schema in its own SQLite file, bound to SessionFactory."""
+    monkeypatch.setattr(database, "PG_URL", sqlite_url(tmp_path / "test.db"))
+    engine = database.init_engines()
+    async with engine.begin() as conn:
+        await conn.run_sync(database.Base.metadata.create_all)
+    yield engine
+    await database.dispose_engines()
+
+
+@pytest.fixture
+async def client(database_engine, monkeypatch):
+    """An HTTP client for the app, with its lifespan running and an empty feed cache."""
+    from main import app
+
+    monkeypatch.setattr(feed_cache, "backend", LRUCacheBackend(config.FEED_CACHE_MAX_ENTRIES))
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+
+async def create_post(client: httpx.AsyncClient, content: str, category_id: str = "1") -> dict:
+    response = await client.post("/posts", json={"content": content, "category_id": category_id})
+    assert response.status_code == 200, response.text
+    assert response.json()["header"]["responseCode"] == 201
+    return response.json()["body"]
@@ -0,0 +1,43 @@
+import pytest
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_empty_items_list_is_rejected(client):
+    response = await client.post("/posts/flag/bulk", json={"action": "flag", "items": []})
+
+    assert response.status_code == 422
+
+
+async def test_bulk_flag_reports_unchanged_and_missing_ids(client):
+    posts = [await create_post(client, f"post {i}") for i in range(3)]
+    await client.post(f"/posts/{posts[0]['id']}/flag", json={"reason": "earlier report"})
+    missing = "01890000-0000-7000-8000-000000000000"
+
+    response = await client.post("/posts/flag/bulk", json={
+        "action": "flag",
+        "items": [{"id": post["id"], "reason": "spam"} for post in posts] + [{"id": missing, "reason": "spam"}],
+    })
+
+    assert response.status_code == 200, response.text
+    body = response.json()["body"]
+    assert sorted(post["id"] for post in body["updated"]) == sorted(post["id"] for post in posts[1:])
+    assert body["already_flagged"] == [posts[0]["id"]]
+    assert body["not_found"] == [missing]
+
+
+async def test_flagged_queue_pages_newest_first(client):
+    posts = [await create_post(client, f"post {i}") for i in range(5)]
+    await client.post("/posts/flag/bulk", json={
+        "action": "flag", "items": [{"id": post["id"], "reason": "spam"} for post in posts[:4]],
+    })
+
+    first = (await client.get("/posts/flagged", params={"limit": 3})).json()
+    cursor = first["pagination"]["nextCursor"]
+    second = (await client.get("/posts/flagged", params={"limit": 3, "cursor": cursor})).json()
+
+    assert [post["id"] for post in first["body"] + second["body"]] == [post["id"] for post in posts[:4]][::-1]
+    assert second["pagination"]["nextCursor"] is None
+    assert (await client.get("/posts/flagged", params={"limit": 0})).status_code == 422
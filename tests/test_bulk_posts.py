@@ -0,0 +1,26 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bulk_create_reports_each_item(client):
+    response = await client.post("/posts/bulk", json=[
+        {"content": "Fine", "category_id": "1"},
+        {"content": "Nowhere", "category_id": "unknown"},
+    ])
+
+    assert response.status_code == 201
+    header, body = response.json()["header"], response.json()["body"]
+    assert header["responseMessage"] == "Bulk post creation completed."
+    assert (body["created"], body["failed"]) == (1, 1)
+    assert [item["status"] for item in body["results"]] == ["created", "failed"]
+
+
+async def test_bulk_create_with_every_item_failing_is_an_error(client):
+    response = await client.post("/posts/bulk", json=[{"content": "Nowhere", "category_id": "unknown"}])
+
+    assert response.status_code == 400
+    header = response.json()["header"]
+    assert header["responseCode"] == 400
+    assert header["responseMessage"] == "No posts were created."
+    assert header["customerMessage"] == "0 of 1 posts created."
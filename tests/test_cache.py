@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from src.core import cache
+from src.core.cache import FeedCache, LRUCacheBackend, RedisCacheBackend, feed_cache
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock.monotonic)
+    return clock
+
+
+@pytest.fixture
+def fake_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeAsyncRedis()
+
+
+def redis_backend(client) -> RedisCacheBackend:
+    backend = RedisCacheBackend("redis://localhost:6379/0", fallback=LRUCacheBackend(max_entries=10))
+    backend._client = client
+    return backend
+
+
+class BrokenRedis:
+    """Fails every command the way an unreachable Redis does."""
+
+    def __getattr__(self, name):
+        from redis.exceptions import ConnectionError
+
+        async def fail(*args, **kwargs):
+            raise ConnectionError("Connection refused")
+
+        return fail
+
+
+async def test_lru_evicts_least_recently_used():
+    backend = LRUCacheBackend(max_entries=2)
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+    await backend.get("a")  # a is now more recent than b
+    await backend.set("c", b"3", ttl=60)
+
+    assert await backend.get("a") == b"1"
+    assert await backend.get("b") is None
+    assert await backend.get("c") == b"3"
+
+
+async def test_lru_entries_expire_after_ttl(clock):
+    backend = LRUCacheBackend(max_entries=10)
+    await backend.set("page", b"cached", ttl=30)
+
+    clock.now += 29
+    assert await backend.get("page") == b"cached"
+    clock.now += 2
+    assert await backend.get("page") is None
+
+
+async def test_lru_counters_are_never_evicted():
+    backend = LRUCacheBackend(max_entries=1)
+    await backend.incr("posts:gen:1")
+    await backend.set("a", b"1", ttl=60)
+    await backend.set("b", b"2", ttl=60)
+
+    assert await backend.get_counter("posts:gen:1") == 1
+
+
+async def test_invalidation_orphans_category_and_unfiltered_pages():
+    feed = FeedCache(LRUCacheBackend(max_entries=10), ttl=60)
+    category_key = await feed.feed_key("1", 10, 0)
+    other_key = await feed.feed_key("2", 10, 0)
+    unfiltered_key = await feed.feed_key(None, 10, 0)
+    for key in (category_key, other_key, unfiltered_key):
+        await feed.set(key, {"body": [key]})
+
+    await feed.invalidate("1")
+
+    assert await feed.feed_key("1", 10, 0) != category_key
+    assert await feed.feed_key(None, 10, 0) != unfiltered_key
+    assert await feed.feed_key("2", 10, 0) == other_key
+    assert await feed.get(other_key) == {"body": [other_key]}
+
+
+async def test_redis_backend_round_trip(fake_redis):
+    backend = redis_backend(fake_redis)
+    await backend.set("page", b"cached", ttl=30)
+
+    assert await backend.get("page") == b"cached"
+    assert await fake_redis.ttl("page") == 30
+    assert await backend.incr("posts:gen:1") == 1
+    assert await backend.get_counter("posts:gen:1") == 1
+    # The local counter is bumped too, for when Redis goes away
+    assert await backend.fallback.get_counter("posts:gen:1") == 1
+
+
+async def test_redis_errors_fall_back_to_local_cache():
+    backend = redis_backend(BrokenRedis())
+
+    await backend.set("page", b"cached", ttl=30)
+    assert await backend.get("page") == b"cached"
+    assert await backend.fallback.get("page") == b"cached"
+    assert await backend.incr("posts:gen:1") == 1
+    assert await backend.get_counter("posts:gen:1") == 1
+
+
+async def test_feed_survives_redis_outage():
+    feed = FeedCache(redis_backend(BrokenRedis()), ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"body": ["post"]}
+
+    key = await feed.feed_key("1", 10, 0)
+    assert await feed.load(key, loader) == {"body": ["post"]}
+    assert await feed.load(key, loader) == {"body": ["post"]}
+    assert len(calls) == 1
+
+
+async def test_concurrent_loads_share_one_loader_call():
+    feed = FeedCache(LRUCacheBackend(max_entries=10), ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"body": ["post"]}
+
+    pages = await asyncio.gather(*(feed.load("posts:feed:1", loader) for _ in range(500)))
+
+    assert len(calls) == 1
+    assert all(page == {"body": ["post"]} for page in pages)
+    assert feed.stats == {"hit": 0, "miss": 1, "coalesced": 499}
+    assert feed.flights.in_flight() == 0
+
+
+async def test_waiter_takes_over_when_leader_is_cancelled():
+    feed = FeedCache(LRUCacheBackend(max_entries=10), ttl=60)
+    calls = []
+    leader_started = asyncio.Event()
+
+    async def loader():
+        calls.append(1)
+        if len(calls) == 1:
+            leader_started.set()
+            await asyncio.Event().wait()  # The leader's client goes away mid-query
+        return {"body": ["post"]}
+
+    leader = asyncio.create_task(feed.load("posts:feed:1", loader))
+    await leader_started.wait()
+    waiters = [asyncio.create_task(feed.load("posts:feed:1", loader)) for _ in range(5)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    pages = await asyncio.gather(*waiters)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    assert len(calls) == 2  # One waiter reran the loader, the rest shared its result
+    assert all(page == {"body": ["post"]} for page in pages)
+    assert feed.flights.in_flight() == 0
+
+
+async def test_identical_feed_requests_run_one_query(client, database_engine):
+    await create_post(client, "Only post in the feed")
+    client.cookies.clear()  # Just-wrote clients bypass the cache
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    await feed_cache.invalidate(None)
+    event.listen(database_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        responses = await asyncio.gather(*(client.get("/posts", params={"limit": 10}) for _ in range(500)))
+    finally:
+        event.remove(database_engine.sync_engine, "before_cursor_execute", count)
+
+    assert {response.status_code for response in responses} == {200}
+    assert len(statements) == 1
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+
+from src.core import config
+from src.core.categories import CategoryRegistry, CategorySnapshot
+
+pytestmark = pytest.mark.anyio
+
+CATALOG = [{"id": "1", "name": "Gossip"}, {"id": "2", "name": "Expose"}]
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    path = tmp_path / "categories.json"
+    path.write_bytes(orjson.dumps(CATALOG))
+    return path
+
+
+def rewrite(path, categories, mtime: float):
+    path.write_bytes(orjson.dumps(categories))
+    os.utime(path, (mtime, mtime))
+
+
+def test_etag_depends_only_on_the_catalog():
+    # As built by two workers, or before and after a restart
+    first, second = CategorySnapshot(CATALOG, mtime=1000.0), CategorySnapshot(CATALOG, mtime=1000.0)
+    assert first.etag == second.etag
+    assert first.body == second.body
+    assert CategorySnapshot(CATALOG, mtime=2000.0).etag == first.etag
+    assert CategorySnapshot(CATALOG[:1], mtime=1000.0).etag != first.etag
+
+
+def test_registry_reloads_edited_catalog(catalog_file):
+    registry = CategoryRegistry(str(catalog_file), reload_interval=0)
+    etag = registry.snapshot.etag
+
+    rewrite(catalog_file, CATALOG, mtime=catalog_file.stat().st_mtime + 10)  # Touched, not changed
+    assert registry.snapshot.etag == etag
+
+    rewrite(catalog_file, CATALOG + [{"id": "3", "name": "Lost & found"}], mtime=catalog_file.stat().st_mtime + 10)
+    assert registry.snapshot.etag != etag
+    assert registry.get("3") == {"id": "3", "name": "Lost & found"}
+
+
+def test_registry_keeps_previous_catalog_when_reload_fails(catalog_file):
+    registry = CategoryRegistry(str(catalog_file), reload_interval=0)
+    snapshot = registry.snapshot
+
+    catalog_file.write_bytes(b"{not json")
+    os.utime(catalog_file, (snapshot.mtime + 10, snapshot.mtime + 10))
+
+    assert registry.snapshot is snapshot
+    assert registry.get("2") == CATALOG[1]
+
+
+async def test_categories_envelope_is_frozen_per_catalog_version(client):
+    first = await client.get("/categories")
+    second = await client.get("/categories")
+
+    assert first.status_code == 200
+    assert first.content == second.content
+    header = first.json()["header"]
+    assert header["requestRefId"] == second.json()["header"]["requestRefId"]
+    modified = datetime.fromtimestamp(os.stat(config.CATEGORIES_PATH).st_mtime, timezone.utc)
+    assert datetime.fromisoformat(header["timestamp"].replace("Z", "+00:00")) == modified
+
+
+async def test_categories_etag_revalidation(client):
+    first = await client.get("/categories")
+
+    cached = await client.get("/categories", headers={"If-None-Match": first.headers["etag"]})
+
+    assert cached.status_code == 304
+    assert cached.content == b""
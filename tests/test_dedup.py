@@ -0,0 +1,78 @@
+import pytest
+
+from src.core import config, dedup
+from src.core.dedup import DuplicateDetector, LocalDuplicateIndex, duplicates
+
+pytestmark = pytest.mark.anyio
+
+CONTENT = "The parking lot behind the library floods every time it rains"
+
+
+@pytest.fixture
+def rejecting(monkeypatch):
+    index = LocalDuplicateIndex(max_distance=3, tables=4, window=3600, max_entries=100)
+    monkeypatch.setattr(duplicates, "enabled", True)
+    monkeypatch.setattr(duplicates, "action", "reject")
+    monkeypatch.setattr(duplicates, "index", index)
+    return index
+
+
+async def test_check_does_not_index_until_remembered():
+    detector = DuplicateDetector(
+        True, action="flag", min_words=5, inline_max_chars=20000,
+        index=LocalDuplicateIndex(max_distance=3, tables=4, window=3600, max_entries=100),
+    )
+
+    assert (await detector.check([CONTENT]))[0] == [False]
+    duplicate, prints = await detector.check([CONTENT, CONTENT])
+    assert duplicate == [False, True]  # Earlier posts of the same batch count
+
+    await detector.remember(prints[:1])
+    assert (await detector.check([CONTENT]))[0] == [True]
+
+
+async def test_large_batches_are_fingerprinted_off_the_event_loop(monkeypatch):
+    detector = DuplicateDetector(
+        True, action="flag", min_words=5, inline_max_chars=len(CONTENT),
+        index=LocalDuplicateIndex(max_distance=3, tables=4, window=3600, max_entries=100),
+    )
+    offloaded = []
+    to_thread = dedup.asyncio.to_thread
+
+    async def record(function, *args):
+        offloaded.append(len(args[0]))
+        return await to_thread(function, *args)
+
+    monkeypatch.setattr(dedup.asyncio, "to_thread", record)
+    await detector.check([CONTENT])
+    duplicate, _ = await detector.check([CONTENT, CONTENT])
+
+    assert offloaded == [2]
+    assert duplicate == [False, True]
+
+
+async def test_failed_write_does_not_block_retry(client, rejecting, monkeypatch):
+    # The write-behind queue is not running, so submitting fails with a 503
+    monkeypatch.setattr(config, "WRITE_BEHIND_ENABLED", True)
+    response = await client.post("/posts", json={"content": CONTENT, "category_id": "1"})
+    assert response.status_code == 503
+    assert len(rejecting.index) == 0
+
+    monkeypatch.setattr(config, "WRITE_BEHIND_ENABLED", False)
+    retry = await client.post("/posts", json={"content": CONTENT, "category_id": "1"})
+    assert retry.status_code == 200, retry.text
+
+    again = await client.post("/posts", json={"content": CONTENT, "category_id": "1"})
+    assert again.status_code == 409
+
+
+async def test_bulk_indexes_only_written_posts(client, rejecting):
+    response = await client.post("/posts/bulk", json=[
+        {"content": CONTENT, "category_id": "unknown"},
+        {"content": CONTENT, "category_id": "1"},
+        {"content": CONTENT, "category_id": "2"},
+    ])
+
+    assert response.status_code == 201, response.text
+    assert [item["status"] for item in response.json()["body"]["results"]] == ["failed", "created", "failed"]
+    assert len(rejecting.index) == 1
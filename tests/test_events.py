@@ -0,0 +1,111 @@
+import orjson
+import pytest
+
+from src.core.events import HEARTBEAT, POST_CREATED, FeedEvent, FeedHub, PostEvents, feed_hub
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+SUBSCRIBERS = 5000
+
+
+def message(category_id, content="post") -> bytes:
+    return orjson.dumps({"type": POST_CREATED, "post": {"category_id": category_id, "content": content}})
+
+
+def event(category_id, content="post") -> FeedEvent:
+    return FeedEvent(POST_CREATED, category_id, message(category_id, content))
+
+
+def drain(subscriber) -> list:
+    events = []
+    while not subscriber.queue.empty():
+        events.append(subscriber.queue.get_nowait())
+    return events
+
+
+async def test_events_fan_out_to_every_matching_subscriber():
+    hub = FeedHub(queue_size=10, heartbeat_seconds=15)
+    everything = [hub.subscribe() for _ in range(SUBSCRIBERS // 2)]
+    gossip = [hub.subscribe("1") for _ in range(SUBSCRIBERS // 4)]
+    confessions = [hub.subscribe("5") for _ in range(SUBSCRIBERS // 4)]
+
+    published = event("1")
+    hub.publish(published)
+
+    assert all(drain(subscriber) == [published] for subscriber in everything + gossip)
+    assert all(drain(subscriber) == [] for subscriber in confessions)
+    assert hub.subscriber_count == SUBSCRIBERS
+    assert hub.dropped == 0
+
+
+async def test_category_filtering():
+    hub = FeedHub(queue_size=10, heartbeat_seconds=15)
+    everything, gossip, expose = hub.subscribe(), hub.subscribe("1"), hub.subscribe("2")
+
+    events = [event("1", "a"), event("2", "b"), event(None, "c"), event("1", "d")]
+    for published in events:
+        hub.publish(published)
+
+    assert drain(everything) == events
+    assert drain(gossip) == [events[0], events[3]]
+    assert drain(expose) == [events[1]]
+
+
+async def test_slow_subscriber_is_dropped_without_affecting_others():
+    hub = FeedHub(queue_size=3, heartbeat_seconds=15)
+    slow, fast = hub.subscribe("1"), hub.subscribe("1")
+
+    for i in range(4):
+        hub.publish(event("1", str(i)))
+        drain(fast)
+
+    # The backlog is discarded and None ends the slow subscriber's stream
+    assert slow.dropped
+    assert drain(slow) == [None]
+    assert not fast.dropped
+    assert hub.subscriber_count == 1
+    assert hub.dropped == 1
+
+    hub.publish(event("1", "after"))
+    assert [item.text for item in drain(fast)] == [event("1", "after").text]
+    assert drain(slow) == []
+
+
+async def test_heartbeat_reaches_and_drops_stalled_subscribers():
+    hub = FeedHub(queue_size=2, heartbeat_seconds=15)
+    stalled, live = hub.subscribe(), hub.subscribe("1")
+
+    hub.broadcast_heartbeat()
+    assert drain(live) == [HEARTBEAT]
+    hub.broadcast_heartbeat()
+    hub.broadcast_heartbeat()
+
+    assert stalled.dropped
+    assert hub.subscriber_count == 1
+
+
+async def test_malformed_messages_are_ignored():
+    hub = FeedHub(queue_size=10, heartbeat_seconds=15)
+    subscriber = hub.subscribe()
+    events = PostEvents(hub, backend="local")
+
+    events._receive(b"not json")
+    events._receive(b'{"type": "post.created"}')
+    events._receive(message("1"))
+
+    assert [item.category_id for item in drain(subscriber)] == ["1"]
+
+
+async def test_created_post_reaches_stream_subscribers(client):
+    subscriber = feed_hub.subscribe("1")
+    try:
+        post = await create_post(client, "Fresh off the press")
+        await create_post(client, "Somewhere else", category_id="2")
+    finally:
+        feed_hub.unsubscribe(subscriber)
+
+    received = drain(subscriber)
+    assert [item.type for item in received] == [POST_CREATED]
+    assert orjson.loads(received[0].text)["post"]["id"] == post["id"]
@@ -0,0 +1,75 @@
+import csv
+import io
+
+import orjson
+import pytest
+from sqlalchemy import event, select
+
+from src import models
+from src.core import config
+from src.database import SessionFactory
+from src.utils.export import EXPORT_COLUMNS, export_query, stream_ndjson
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def posts(client):
+    batch = [{"content": f"Export post {i}, with a comma", "category_id": "1" if i % 3 else "2"} for i in range(23)]
+    response = await client.post("/posts/bulk", json=batch)
+    assert response.status_code == 201, response.text
+    ids = [item["id"] for item in response.json()["body"]["results"]]
+    for post_id in ids[:3]:
+        await client.post(f"/posts/{post_id}/flag", json={"reason": "needs review"})
+    async with SessionFactory() as db:
+        rows = (await db.execute(
+            select(models.Post).order_by(models.Post.created_at, models.Post.id)
+        )).scalars().all()
+    return rows
+
+
+def as_text(post: models.Post) -> list:
+    return [str(post.id), post.content, post.category_id, post.created_at.isoformat(), str(post.flagged), post.flag_reason or ""]
+
+
+async def test_ndjson_export_matches_rows(client, posts):
+    response = await client.get("/posts/export")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    exported = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [list(item) for item in exported] == [list(EXPORT_COLUMNS)] * len(posts)
+    assert [
+        [item["id"], item["content"], item["category_id"], item["created_at"], str(item["flagged"]), item["flag_reason"] or ""]
+        for item in exported
+    ] == [as_text(post) for post in posts]
+
+
+async def test_csv_export_matches_rows(client, posts):
+    response = await client.get("/posts/export", params={"format": "csv", "category_id": "2"})
+
+    assert response.status_code == 200
+    header, *rows = list(csv.reader(io.StringIO(response.text)))
+    assert header == list(EXPORT_COLUMNS)
+    assert rows == [as_text(post) for post in posts if post.category_id == "2"]
+
+
+async def test_export_streams_in_yield_per_batches(client, posts, database_engine, monkeypatch):
+    monkeypatch.setattr(config, "EXPORT_YIELD_PER", 5)
+    assert export_query(None, None).get_execution_options()["yield_per"] == 5
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(context.execution_options)
+
+    event.listen(database_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        chunks = [chunk async for chunk in stream_ndjson(None, None)]
+    finally:
+        event.remove(database_engine.sync_engine, "before_cursor_execute", record)
+
+    # A server-side cursor, read one batch of rows per chunk rather than all at once
+    assert [options.get("stream_results") for options in executed] == [True]
+    assert [chunk.count(b"\n") for chunk in chunks] == [5, 5, 5, 5, 3]
+    assert b"".join(chunks).count(b"\n") == len(posts)
+
@@ -0,0 +1,45 @@
+import pytest
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+
+async def read_feed(client, **params) -> list:
+    """Follow `nextCursor` from the first page to the last, returning every page's ids."""
+    pages, cursor = [], None
+    while True:
+        response = await client.get("/posts", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        payload = response.json()
+        pages.append([post["id"] for post in payload["body"]])
+        cursor = payload["pagination"]["nextCursor"]
+        if cursor is None:
+            return pages
+
+
+async def test_cursor_pages_through_the_whole_feed(client):
+    created = [(await create_post(client, f"post {i}", category_id="1" if i % 2 else "2"))["id"] for i in range(7)]
+
+    pages = await read_feed(client, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [post_id for page in pages for post_id in page] == created[::-1]
+    category = await read_feed(client, limit=2, category_id="1")
+    assert [post_id for page in category for post_id in page] == created[1::2][::-1]
+
+
+async def test_last_page_that_fills_the_limit_has_no_cursor(client):
+    for i in range(4):
+        await create_post(client, f"post {i}")
+
+    assert [len(page) for page in await read_feed(client, limit=2)] == [2, 2]
+
+
+@pytest.mark.parametrize("limit", [0, -1, 101])
+async def test_limit_out_of_range_is_rejected(client, limit):
+    await create_post(client, "post")
+
+    response = await client.get("/posts", params={"limit": limit})
+
+    assert response.status_code == 422
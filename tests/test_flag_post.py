@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src import models
+from src.database import SessionFactory
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+PARALLEL_FLAGS = 20
+
+
+async def test_concurrent_flags_update_the_post_once(client):
+    post = await create_post(client, "Somebody parked on the quad again")
+
+    responses = await asyncio.gather(*(
+        client.post(f"/posts/{post['id']}/flag", json={"reason": f"report {i}"})
+        for i in range(PARALLEL_FLAGS)
+    ))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [400] * (PARALLEL_FLAGS - 1)
+    rejected = [response.json() for response in responses if response.status_code == 400]
+    assert all(body["header"]["responseMessage"] == "Post is already flagged." for body in rejected)
+
+    async with SessionFactory() as db:
+        stat = (await db.execute(select(models.PostStat))).scalars().one()
+    assert (stat.category_id, stat.posts, stat.flagged) == ("1", 1, 1)
+
+
+async def test_flag_unknown_post_is_not_found(client):
+    response = await client.post("/posts/00000000-0000-0000-0000-000000000000/flag", json={"reason": "spam"})
+
+    assert response.status_code == 404
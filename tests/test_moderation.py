@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event, select
+
+from src import models
+from src.core.moderation import Moderator, rescan
+from src.database import SessionFactory
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def scanner(tmp_path):
+    terms = tmp_path / "terms.txt"
+    terms.write_text("parking\nbudget cuts  # added after launch\n", encoding="utf-8")
+    moderator = Moderator(str(terms), executor="thread", workers=2, inline_max_chars=10**6, chunk_size=10)
+    yield moderator
+    moderator.close()
+
+
+async def test_rescan_flags_matches_with_one_update_per_batch(client, database_engine, scanner):
+    posts = [
+        await create_post(client, text)
+        for text in ["No parking anywhere", "Budget cuts again", "More parking woes", "Lovely weather", "Fines for parking", "Hello"]
+    ]
+    await client.post(f"/posts/{posts[2]['id']}/flag", json={"reason": "reported"})
+    updates = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE posts"):
+            updates.append(statement)
+
+    event.listen(database_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        result = await rescan(scanner, since=None, batch_size=3, dry_run=False)
+    finally:
+        event.remove(database_engine.sync_engine, "before_cursor_execute", record)
+
+    assert result == {"scanned": 5, "flagged": 3}
+    assert len(updates) == 2  # One per batch of 3 unflagged posts with a match
+    async with SessionFactory() as db:
+        stored = {post.content: post for post in (await db.execute(select(models.Post))).scalars()}
+        rollup = (await db.execute(select(models.PostStat))).scalars().all()
+    assert stored["No parking anywhere"].flag_reason == "Automatically flagged: contains banned term(s) parking."
+    assert stored["Budget cuts again"].flag_reason == "Automatically flagged: contains banned term(s) budget cuts."
+    assert stored["More parking woes"].flag_reason == "reported"
+    assert stored["Fines for parking"].flagged
+    assert not stored["Lovely weather"].flagged
+    assert sum(row.flagged for row in rollup) == 4
+
+
+async def test_rescan_dry_run_changes_nothing(client, scanner):
+    await create_post(client, "No parking anywhere")
+
+    assert await rescan(scanner, since=None, batch_size=3, dry_run=True) == {"scanned": 1, "flagged": 1}
+    async with SessionFactory() as db:
+        assert not (await db.execute(select(models.Post.flagged))).scalar_one()
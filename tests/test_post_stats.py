@@ -0,0 +1,75 @@
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import case, func, select
+
+from src import models
+from src.core import stats
+from src.database import SessionFactory
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+CATEGORY_IDS = ["1", "2", "5"]
+
+
+async def rollup() -> dict:
+    async with SessionFactory() as db:
+        rows = (await db.execute(select(models.PostStat))).scalars().all()
+    return {(row.category_id, row.day.isoformat()): (row.posts, row.flagged) for row in rows if row.posts}
+
+
+async def group_by_posts() -> dict:
+    """The same counts, computed from scratch over the posts table."""
+    day = func.date(models.Post.created_at)
+    async with SessionFactory() as db:
+        rows = await db.execute(
+            select(
+                func.coalesce(models.Post.category_id, stats.UNCATEGORIZED),
+                day,
+                func.count(),
+                func.sum(case((models.Post.flagged, 1), else_=0)),
+            ).group_by(models.Post.category_id, day)
+        )
+    return {(category_id, str(created)): (posts, flagged) for category_id, created, posts, flagged in rows}
+
+
+async def test_rollup_matches_posts_after_concurrent_writes(client):
+    rng = random.Random(7)
+    seeded = [await create_post(client, f"seed post {i} about parking", rng.choice(CATEGORY_IDS)) for i in range(30)]
+    ids = [post["id"] for post in seeded]
+
+    def bulk_moderation(action: str):
+        items = [{"id": post_id, "reason": "spam"} for post_id in rng.sample(ids, 8)]
+        return client.post("/posts/flag/bulk", json={"action": action, "items": items})
+
+    writes = []
+    for i in range(40):
+        kind = i % 6
+        if kind == 0:
+            writes.append(client.post("/posts", json={"content": f"new post {i}", "category_id": rng.choice(CATEGORY_IDS)}))
+        elif kind == 1:
+            writes.append(client.post("/posts/bulk", json=[
+                {"content": f"bulk post {i}-{j}", "category_id": rng.choice(CATEGORY_IDS + [None])} for j in range(5)
+            ]))
+        elif kind == 2:
+            writes.append(client.post(f"/posts/{rng.choice(ids)}/flag", json={"reason": "report"}))
+        elif kind == 3:
+            writes.append(bulk_moderation("flag"))
+        elif kind == 4:
+            writes.append(bulk_moderation("unflag"))
+        else:
+            action = rng.choice(["flag", "unflag"])
+            writes.append(client.post("/posts/flag/bulk", json={
+                "action": action,
+                "filter": {"category_id": rng.choice(CATEGORY_IDS), "q": "parking", "reason": "sweep"},
+            }))
+
+    responses = await asyncio.gather(*writes)
+
+    assert {response.status_code for response in responses} <= {200, 201, 400}
+    expected = await group_by_posts()
+    assert sum(flagged for _, flagged in expected.values()) > 0
+    assert await rollup() == expected
@@ -0,0 +1,66 @@
+import itertools
+
+import pytest
+from sqlalchemy import insert
+
+from src import database, models
+from src.database import open_read_session, replicas
+
+from .conftest import create_post, sqlite_url
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def replica_urls(tmp_path, monkeypatch):
+    """A working replica in its own SQLite file, after one that cannot be reached."""
+    urls = [sqlite_url(tmp_path / "missing" / "down.db"), sqlite_url(tmp_path / "replica.db")]
+    monkeypatch.setattr(replicas, "urls", urls)
+    monkeypatch.setattr(replicas, "strategy", "round_robin")
+    monkeypatch.setattr(replicas, "_turn", itertools.count())  # The unreachable one is tried first
+    return urls
+
+
+@pytest.fixture
+async def database_engine(replica_urls, database_engine):
+    replica = replicas.engines[1]
+    async with replica.begin() as conn:
+        await conn.run_sync(database.Base.metadata.create_all)
+        await conn.execute(insert(models.Post).values(content="Only on the replica", category_id="1"))
+    yield database_engine
+
+
+async def test_reads_fail_over_to_next_replica_then_primary(database_engine):
+    db = await open_read_session()
+    try:
+        assert db.bind is replicas.engines[1]
+    finally:
+        await db.close()
+    assert not replicas.is_healthy(0)
+
+    replicas.mark_down(1)
+    db = await open_read_session()
+    try:
+        assert db.bind is database.engine
+    finally:
+        await db.close()
+
+
+async def test_use_primary_skips_replicas(database_engine):
+    db = await open_read_session(use_primary=True)
+    try:
+        assert db.bind is database.engine
+    finally:
+        await db.close()
+    assert replicas.is_healthy(0)  # Never even tried
+
+
+async def test_clients_that_just_wrote_read_from_primary(client):
+    feed = await client.get("/posts")
+    assert [post["content"] for post in feed.json()["body"]] == ["Only on the replica"]
+
+    await create_post(client, "Only on the primary")
+    assert "read_primary" in client.cookies
+
+    feed = await client.get("/posts")
+    assert [post["content"] for post in feed.json()["body"]] == ["Only on the primary"]
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.search import InvertedIndex, highlight
+
+from .conftest import create_post
+
+pytestmark = pytest.mark.anyio
+
+
+def indexed(*contents) -> InvertedIndex:
+    return InvertedIndex(SimpleNamespace(id=index, content=content) for index, content in enumerate(contents))
+
+
+def test_inverted_index_requires_every_term():
+    index = indexed("Parking on campus", "Campus parking permits", "Parking garage closed")
+
+    assert sorted(post.id for post, _ in index.search("campus parking")) == [0, 1]
+    assert index.search("parking unicorns") == []
+    assert index.search("!!!") == []
+
+
+def test_inverted_index_ranks_by_term_frequency_and_rarity():
+    index = indexed("parking parking parking", "parking lot", "lot lot", "quiet library")
+
+    scores = dict((post.id, score) for post, score in index.search("parking"))
+    assert scores[0] > scores[1]
+    # "library" appears in fewer posts than "lot", so one occurrence weighs more
+    assert index.search("library")[0][1] > dict((post.id, score) for post, score in index.search("lot"))[1]
+
+
+def test_highlight_marks_matching_words_case_insensitively():
+    assert highlight("Parking is a mess, parking!", "parking") == "<mark>Parking</mark> is a mess, <mark>parking</mark>!"
+
+
+async def test_search_ranks_best_match_first(client):
+    once = await create_post(client, "The parking lot is full")
+    twice = await create_post(client, "Parking, parking everywhere and no parking spot")
+    await create_post(client, "The library is quiet")
+
+    response = await client.get("/posts/search", params={"q": "parking"})
+
+    assert response.status_code == 200
+    results = response.json()["body"]
+    assert [post["id"] for post in results] == [twice["id"], once["id"]]
+    assert results[0]["rank"] > results[1]["rank"]
+    assert results[1]["snippet"] == "The <mark>parking</mark> lot is full"
+
+
+async def test_search_filters_by_category(client):
+    await create_post(client, "Parking in category one", category_id="1")
+    other = await create_post(client, "Parking in category two", category_id="2")
+
+    response = await client.get("/posts/search", params={"q": "parking", "category_id": "2"})
+
+    assert [post["id"] for post in response.json()["body"]] == [other["id"]]
+
+
+async def test_search_cursor_pages_through_tied_results(client):
+    created = [(await create_post(client, "Same parking complaint"))["id"] for _ in range(5)]
+    seen, cursor = [], None
+    while True:
+        params = {"q": "parking", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        payload = (await client.get("/posts/search", params=params)).json()
+        seen.append([post["id"] for post in payload["body"]])
+        cursor = payload["pagination"]["nextCursor"]
+        if cursor is None:
+            break
+
+    # Equal ranks fall back to newest first, without repeating or skipping a post
+    assert [len(page) for page in seen] == [2, 2, 1]
+    assert [post_id for page in seen for post_id in page] == created[::-1]
+
+
+@pytest.mark.parametrize("limit", [0, -3, 101])
+async def test_search_limit_out_of_range_is_rejected(client, limit):
+    await create_post(client, "Parking")
+
+    response = await client.get("/posts/search", params={"q": "parking", "limit": limit})
+
+    assert response.status_code == 422
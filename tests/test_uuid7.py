@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import insert
+
+from src import models
+from src.database import SessionFactory
+from src.utils import uuid7 as uuid7_module
+from src.utils.uuid7 import uuid7, uuid7_time
+
+from .test_feed import read_feed
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Every id is generated in the same millisecond, as in a burst of inserts."""
+    now_ns = 1_760_000_000_123_456_789
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: now_ns)
+    monkeypatch.setattr(uuid7_module, "_last_ms", 0)  # Forget ids made earlier with the real clock
+    return now_ns // 1_000_000
+
+
+def test_ids_sort_in_creation_order():
+    ids = [uuid7() for _ in range(10000)]
+
+    assert sorted(ids) == ids
+    assert len(set(ids)) == len(ids)
+    assert len({uuid7_time(value) for value in ids}) < len(ids)  # Several ids per millisecond
+
+
+def test_ids_within_one_millisecond_sort_in_creation_order(frozen_clock):
+    # More than the 12-bit counter holds, so some borrow the next millisecond
+    ids = [uuid7() for _ in range(5000)]
+
+    assert sorted(ids) == ids
+    assert all(value.version == 7 for value in ids)
+    assert ids[0].int >> 80 == frozen_clock
+    assert ids[-1].int >> 80 > frozen_clock
+
+
+def test_ids_keep_increasing_when_the_clock_goes_back(frozen_clock, monkeypatch):
+    first = uuid7()
+    monkeypatch.setattr(uuid7_module.time, "time_ns", lambda: (frozen_clock - 1000) * 1_000_000)
+
+    assert uuid7() > first
+
+
+async def test_feed_pages_same_millisecond_posts_in_creation_order(client, frozen_clock):
+    ids = [uuid7() for _ in range(10)]
+    async with SessionFactory() as db:
+        await db.execute(insert(models.Post), [
+            {"id": post_id, "created_at": uuid7_time(post_id), "content": f"burst {i}", "category_id": "1"}
+            for i, post_id in enumerate(ids)
+        ])
+        await db.commit()
+
+    pages = await read_feed(client, limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [post_id for page in pages for post_id in page] == [str(post_id) for post_id in ids[::-1]]
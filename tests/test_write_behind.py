@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from src import models
+from src.core import write_behind as write_behind_module
+from src.core.events import post_events
+from src.core.write_behind import WriteBehindQueue
+from src.database import SessionFactory
+from src.exceptions import ServiceUnavailableException
+from src.utils.uuid7 import uuid7, uuid7_time
+
+pytestmark = pytest.mark.anyio
+
+
+def row(content: str, post_id=None) -> dict:
+    post_id = post_id or uuid7()
+    return {
+        "id": post_id,
+        "content": content,
+        "category_id": "1",
+        "created_at": uuid7_time(post_id),
+        "flagged": False,
+        "flag_reason": None,
+    }
+
+
+async def stored_ids() -> set:
+    async with SessionFactory() as db:
+        return set((await db.execute(select(models.Post.id))).scalars())
+
+
+async def test_failing_row_does_not_drop_its_batch(database_engine, monkeypatch):
+    monkeypatch.setattr(write_behind_module, "MAX_FLUSH_ATTEMPTS", 1)
+    queue = WriteBehindQueue(max_depth=100, batch_size=10, flush_interval=60)
+    queue.start()
+    existing = row("already written")
+    queue.submit(existing)
+    await queue.stop()
+
+    queue.start()
+    batch = [row(f"post {i}") for i in range(9)]
+    # Conflicts with the row above, so it fails however it is written
+    batch.insert(4, row("conflicting", post_id=existing["id"]))
+    for item in batch:
+        queue.submit(item)
+    await queue.stop()
+
+    assert await stored_ids() == {item["id"] for item in batch}
+    assert queue.flushed == 10
+    assert queue.dropped == 1
+
+
+async def test_dead_flusher_is_restarted(database_engine, monkeypatch):
+    queue = WriteBehindQueue(max_depth=100, batch_size=1, flush_interval=60)
+    publish = post_events.publish
+    failures = []
+
+    async def publish_once_failing(*args, **kwargs):
+        if not failures:
+            failures.append(1)
+            raise RuntimeError("broker went away")
+        await publish(*args, **kwargs)
+
+    monkeypatch.setattr(post_events, "publish", publish_once_failing)
+    queue.start()
+    first, second = row("first"), row("second")
+    queue.submit(first)
+    while not failures or queue.restarts == 0:
+        await asyncio.sleep(0.01)
+    assert queue.status()["running"]
+
+    queue.submit(second)
+    await queue.stop()
+
+    assert await stored_ids() == {first["id"], second["id"]}
+    assert queue.restarts == 1
+
+
+async def test_submit_refuses_posts_once_flusher_is_gone(database_engine):
+    queue = WriteBehindQueue(max_depth=100, batch_size=1, flush_interval=60)
+    queue.start()
+    queue._task.cancel()
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableException):
+        queue.submit(row("lost"))
+    assert not queue.status()["running"]